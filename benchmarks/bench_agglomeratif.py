@@ -0,0 +1,131 @@
+"""
+Benchmark : clustering hiérarchique dense contre approché sur matrice creuse.
+
+Génère N offres synthétiques (titres tirés du vocabulaire de leur domaine,
+plus du bruit), construit la même matrice que clustering.py (TF-IDF + one-hot
+du domaine), puis compare pour chaque taille :
+  - dense : AgglomerativeClustering(ward) sur X.toarray() (chemin historique) ;
+  - creux : agglomeratif_creux (SVD tronquée, micro-centroïdes, ward pondéré).
+Chaque cas tourne dans un processus neuf pour mesurer son pic de mémoire
+(VmHWM, remis à zéro juste avant le clustering). Le chemin dense n'est lancé
+que jusqu'à --dense-max offres ; au-delà, sa mémoire est estimée (matrice
+dense + distances condensées).
+Qualité : silhouette (échantillon de 5000 offres) et accord avec le dense
+(indice de Rand ajusté).
+
+Usage : python benchmarks/bench_agglomeratif.py [--tailles 2000,5000,10000,50000] [--dense-max 10000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import adjusted_rand_score, silhouette_score
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.ml.hierarchique import agglomeratif_creux  # noqa: E402
+
+N_CLUSTERS = 8
+DOMAINES = {
+    "Informatique": "développeur data logiciel informatique python java cloud devops système réseau",
+    "Commerce": "commercial vente vendeur magasin conseiller client boutique caisse",
+    "Logistique": "chauffeur livreur logistique magasinier cariste entrepôt transport quai",
+    "BTP": "chantier travaux bâtiment maçon conducteur géotechnique coffreur grutier",
+    "Restauration": "cuisinier serveur restaurant hôtel plonge commis barman",
+    "Santé": "infirmier aide soignant médical pharmacie kiné clinique",
+    "Finance": "comptable audit assurance contrôle gestion paie trésorerie",
+    "Administration": "assistant administratif secrétaire accueil gestionnaire back office",
+}
+BRUIT = "senior junior confirmé responsable chef manager technicien alternance stage nuit week-end équipe".split()
+
+
+def textes_offres(n, rng):
+    """Titres de 8 mots : 5 du domaine (200 mots propres à chacun), 3 d'un bruit commun de 1000 mots."""
+    domaines = rng.choice(list(DOMAINES), n)
+    mots = {d: v.split() + [f"{d[:4].lower()}{i}" for i in range(200)] for d, v in DOMAINES.items()}
+    bruit = np.array(BRUIT + [f"mot{i}" for i in range(1000)])
+    textes = [" ".join(rng.choice(mots[d], 5).tolist() + rng.choice(bruit, 3).tolist()) for d in domaines]
+    return pd.Series(textes), pd.Series(domaines)
+
+
+def matrice(n, rng):
+    textes, domaines = textes_offres(n, rng)
+    X_text = TfidfVectorizer(max_features=1000, min_df=2, max_df=0.7).fit_transform(textes)
+    return hstack([X_text, pd.get_dummies(domaines, sparse=True).values]).tocsr()
+
+
+def pic_mo():
+    """Pic de mémoire résidente (VmHWM) depuis la dernière remise à zéro."""
+    with open("/proc/self/status") as f:
+        return next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024
+
+
+def remettre_pic():
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def cas(chemin, n, methode):
+    """Un clustering dans ce processus : durée, pic de mémoire, labels dans `chemin`."""
+    X = matrice(n, np.random.default_rng(42))
+    remettre_pic()
+    avant = pic_mo()
+    debut = time.perf_counter()
+    if methode == "dense":
+        from sklearn.cluster import AgglomerativeClustering
+        labels = AgglomerativeClustering(n_clusters=N_CLUSTERS).fit_predict(X.toarray())
+    else:
+        labels = agglomeratif_creux(X, N_CLUSTERS)
+    duree = time.perf_counter() - debut
+    pic = pic_mo() - avant
+    np.save(chemin, labels)
+    print(json.dumps({"duree": duree, "pic": pic}))
+
+
+def mesurer(dossier, n, methode):
+    chemin = os.path.join(dossier, f"{methode}_{n}.npy")
+    sortie = subprocess.run([sys.executable, __file__, "--cas", methode, "--n", str(n), "--sortie", chemin],
+                            capture_output=True, text=True, check=True)
+    return json.loads(sortie.stdout.strip().splitlines()[-1]), np.load(chemin)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tailles", default="2000,5000,10000,50000")
+    parser.add_argument("--dense-max", type=int, default=10_000)
+    parser.add_argument("--cas", choices=["dense", "creux"], help=argparse.SUPPRESS)
+    parser.add_argument("--n", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--sortie", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.cas:
+        cas(args.sortie, args.n, args.cas)
+        return
+
+    dossier = tempfile.mkdtemp()
+    for n in [int(t) for t in args.tailles.split(",")]:
+        X = matrice(n, np.random.default_rng(42))
+        creux, labels_creux = mesurer(dossier, n, "creux")
+        ligne = (f"{n:7,d} offres x {X.shape[1]} features | creux {creux['duree']:6.2f} s, pic +{creux['pic']:6.0f} Mo, "
+                 f"silhouette {silhouette_score(X, labels_creux, sample_size=min(n, 5000), random_state=0):.3f}")
+        if n <= args.dense_max:
+            dense, labels_dense = mesurer(dossier, n, "dense")
+            ligne += (f" | dense {dense['duree']:6.2f} s, pic +{dense['pic']:6.0f} Mo, "
+                      f"silhouette {silhouette_score(X, labels_dense, sample_size=min(n, 5000), random_state=0):.3f}"
+                      f" | accord (ARI) {adjusted_rand_score(labels_dense, labels_creux):.3f}")
+        else:
+            estimation = (n * X.shape[1] + n * (n - 1) / 2) * 8 / 2**20
+            ligne += f" | dense non lancé (≥ {estimation:,.0f} Mo)"
+        print(ligne)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark : balayage de la grille de clustering, en série contre en parallèle.
+
+Sur N offres synthétiques (même matrice que bench_agglomeratif.py), mesure :
+  - le chemin historique de clustering.py : KMeans k=8, Agglomerative k=8,
+    DBSCAN eps=0.5, l'un après l'autre, chacun suivi de sa silhouette exacte ;
+  - le balayage de la grille de balayage.py (30 candidats) avec 1 worker puis
+    --workers workers : durée totale, somme des ajustements, pic de mémoire
+    du candidat le plus gourmand, gagnant.
+La matrice partagée en mmap n'est pas comptée dans les pics : elle est
+relue depuis le cache de pages, commune à tous les workers.
+
+Usage : python benchmarks/bench_balayage.py [--lignes 10000] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.cluster import DBSCAN, KMeans
+from sklearn.metrics import silhouette_score
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_agglomeratif import N_CLUSTERS, matrice  # noqa: E402
+from src.ml.balayage import GRILLE, balayer, choisir, nom_candidat  # noqa: E402
+from src.ml.hierarchique import agglomeratif  # noqa: E402
+
+
+def historique(X):
+    for labels in (KMeans(n_clusters=N_CLUSTERS, random_state=42, n_init=10, max_iter=300).fit_predict(X),
+                   agglomeratif(X, N_CLUSTERS),
+                   DBSCAN(eps=0.5, min_samples=5, n_jobs=-1).fit_predict(X)):
+        if len(set(labels)) > 1:
+            silhouette_score(X, labels)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    X = matrice(args.lignes, np.random.default_rng(42))
+    taille = (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 2**20
+    print(f"{args.lignes:,} offres x {X.shape[1]} features (matrice creuse {taille:.1f} Mo), "
+          f"{sum(len(c) for c in GRILLE.values())} candidats, {os.cpu_count()} CPU")
+
+    debut = time.perf_counter()
+    historique(X)
+    print(f"   historique (3 algorithmes, silhouettes exactes) : {time.perf_counter() - debut:.1f} s")
+
+    for n_workers in sorted({1, args.workers}):
+        debut = time.perf_counter()
+        resultats = balayer(X, n_workers=n_workers)
+        duree = time.perf_counter() - debut
+        gagnant = resultats[choisir(resultats)]
+        pics = [r["pic_mo"] for r in resultats if r["pic_mo"] is not None]
+        print(f"   balayage, {n_workers} worker(s) : {duree:.1f} s (ajustements {sum(r['ajustement_s'] for r in resultats):.1f} s, "
+              f"évaluations {sum(sum(r['mesures']['durees'].values()) for r in resultats):.1f} s) | "
+              f"pic max +{max(pics, default=0):.0f} Mo | gagnant {nom_candidat(gagnant)} "
+              f"(silhouette {gagnant['mesures']['silhouette']['score']:.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark : octets envoyés et temps serveur par interaction du dashboard.
+
+Rejoue une suite d'interactions sur les filtres contre le serveur Dash (client
+de test Flask, sans navigateur), comme le ferait le navigateur : le callback
+de sélection d'abord, puis les callbacks des graphiques seulement si la
+sélection publiée a changé. Les données sont N offres synthétiques ; le
+cache des rendus est désactivé pour mesurer le calcul lui-même.
+
+Avec --navigateur, le dashboard tourne en mode navigateur : seul le
+chargement de la page passe par le serveur, puis les mêmes interactions sont
+rejouées avec node sur les callbacks clientside (assets/filtres_client.js).
+
+Usage : python benchmarks/bench_callbacks.py [--lignes 200000] [--avec-cache] [--navigateur]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+INTERACTIONS = [
+    ("chargement", {}),
+    ("1 ville", {"filter-ville": ["Ville 1"]}),
+    ("+ contrat", {"filter-ville": ["Ville 1"], "filter-contrat": ["CDI"]}),
+    ("+ très demandés", {"filter-ville": ["Ville 1"], "filter-contrat": ["CDI"], "filter-tres-demande": [1]}),
+    ("même sélection", {"filter-contrat": ["CDI"], "filter-ville": ["Ville 1"], "filter-tres-demande": [1]}),
+    ("1 domaine", {"filter-domaine": ["BTP"]}),
+]
+
+
+def offres(n, rng):
+    villes = np.array([f"Ville {i}" for i in range(300)], dtype=object)
+    poids = 1 / np.arange(1, 301) ** 1.2
+    return pd.DataFrame({
+        "Titre": "Offre",
+        "Ville": rng.choice(villes, n, p=poids / poids.sum()),
+        "Contrat": rng.choice(["CDI", "CDD", "INTERIM", "STAGE"], n),
+        "Date": rng.choice([f"il y a {i} jours" for i in range(1, 31)], n),
+        "cluster_category": rng.choice(["Informatique", "Commerce", "BTP", "Autre"], n),
+        "salary_level": rng.choice(["Très_Faible", "Faible", "Moyen", "Élevé", "Très_Élevé"], n),
+        "confidence_score": rng.random(n),
+        "salary_score": rng.integers(0, 100, n),
+        "experience_level": rng.choice(["Junior", "Confirmé", "Senior"], n),
+    })
+
+
+def valeur_defaut(composant):
+    return {"filter-tres-demande": [], "btn-reset": 0}.get(composant)
+
+
+def corps_callback(dependance, valeurs, etat=None):
+    """Corps JSON d'un appel de callback, comme l'envoie le navigateur."""
+    sorties = dependance["output"].strip(".").split("...")
+    return {
+        "output": dependance["output"],
+        "outputs": [{"id": o.rsplit(".", 1)[0], "property": o.rsplit(".", 1)[1]} for o in sorties][0]
+        if len(sorties) == 1 else
+        [{"id": o.rsplit(".", 1)[0], "property": o.rsplit(".", 1)[1]} for o in sorties],
+        "inputs": [{**i, "value": valeurs.get(i["id"], valeur_defaut(i["id"]))} for i in dependance["inputs"]],
+        "state": [{**e, "value": etat} for e in dependance["state"]],
+        "changedPropIds": [],
+    }
+
+
+def appeler(client, dependance, valeurs, etat=None):
+    corps = corps_callback(dependance, valeurs, etat)
+    debut = time.perf_counter()
+    reponse = client.post("/_dash-update-component", json=corps)
+    return reponse, time.perf_counter() - debut
+
+
+# Rejoue les interactions sur les fonctions clientside, comme le navigateur
+SCRIPT_NODE = """
+const fs = require("fs");
+global.window = {dash_clientside: {no_update: null}};
+require(process.argv[1]);
+const entree = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+const offres = window.dash_clientside.offres;
+let publiee;
+entree.interactions.forEach(function (valeurs) {
+    const debut = process.hrtime.bigint();
+    const selection = offres.selection(...valeurs, publiee);
+    let n = 1;
+    if (selection !== null) {
+        publiee = selection;
+        entree.composants.forEach(function (c) { offres[c](publiee, entree.donnees); n += 1; });
+    }
+    console.log(n + " " + Number(process.hrtime.bigint() - debut) / 1e6);
+});
+"""
+
+
+def rejouer_navigateur(app_dash, client, dependances, dossier):
+    envoi = next(d for d in dependances if d["output"] == "offres-client.data")
+    reponse, duree = appeler(client, envoi, {"page": "/"})
+    donnees = reponse.json["response"]["offres-client"]["data"]
+    print(f"{'chargement page':16s}:  1 callback  | {len(reponse.data) / 1024:9.1f} Ko | {duree * 1000:7.1f} ms (serveur)")
+
+    ordre = ["filter-ville", "filter-contrat", "filter-domaine",
+             "filter-pays" if app_dash.HAS_PAYS else "filter-contrat",
+             "filter-salaire", "filter-tres-demande", "btn-reset"]
+    entree = {
+        "donnees": donnees,
+        "composants": [c for c in app_dash.GRAPHIQUES
+                       if (app_dash.HAS_PAYS or c not in app_dash.GRAPHIQUES_PAYS)
+                       and (app_dash.HAS_EXPERIENCE or c not in app_dash.GRAPHIQUES_EXPERIENCE)],
+        "interactions": [[valeurs.get(c, valeur_defaut(c)) for c in ordre] for _, valeurs in INTERACTIONS],
+    }
+    with open(os.path.join(dossier, "entree.json"), "w", encoding="utf-8") as f:
+        json.dump(entree, f)
+    asset = os.path.join(os.path.dirname(app_dash.__file__), "assets", "filtres_client.js")
+    sortie = subprocess.run(["node", "-e", SCRIPT_NODE, asset, os.path.join(dossier, "entree.json")],
+                            capture_output=True, text=True, check=True).stdout.split("\n")
+    for (nom, _), ligne in zip(INTERACTIONS, sortie):
+        n_fonctions, duree = ligne.split()
+        print(f"{nom:16s}: {int(n_fonctions):2d} fonctions | {0:9.1f} Ko | {float(duree):7.1f} ms (navigateur)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=200_000)
+    parser.add_argument("--avec-cache", action="store_true")
+    parser.add_argument("--navigateur", action="store_true")
+    args = parser.parse_args()
+    if args.navigateur and shutil.which("node") is None:
+        parser.error("--navigateur demande node")
+
+    dossier = tempfile.mkdtemp()
+    offres(args.lignes, np.random.default_rng(42)).to_csv(os.path.join(dossier, "offres_ml.csv"), index=False)
+    os.environ["OFFRES_ML"] = os.path.join(dossier, "offres_ml")
+    os.environ["OFFRES_FORMAT"] = "csv"
+    os.environ["DASHBOARD_CACHE"] = os.path.join(dossier, "cache") if args.avec_cache else ""
+    if not args.avec_cache:
+        os.environ["DASHBOARD_CACHE_TAILLE"] = "0"
+    os.environ["DASHBOARD_CLIENT_MAX"] = str(args.lignes) if args.navigateur else "0"
+    from src.dashboard import app_dash  # noqa: E402
+
+    client = app_dash.server.test_client()
+    dependances = client.get("/_dash-dependencies").json
+    if args.navigateur:
+        rejouer_navigateur(app_dash, client, dependances, dossier)
+        return
+    selection = next(d for d in dependances if d["output"] == "selection-filtres.data")
+    graphiques = [d for d in dependances if d is not selection]
+    print(f"{args.lignes:,} offres | {len(graphiques)} callbacks de graphiques")
+
+    publiee = None
+    for nom, valeurs in INTERACTIONS:
+        reponse, duree = appeler(client, selection, valeurs, publiee)
+        octets, n_callbacks = len(reponse.data), 1
+        # no_update : la réponse ne contient pas le Store, aucun graphique ne se met à jour
+        sortie = reponse.json.get("response", {}) if reponse.status_code == 200 else {}
+        if "selection-filtres" in sortie:
+            publiee = sortie["selection-filtres"]["data"]
+            for dependance in graphiques:
+                reponse, d = appeler(client, dependance, {"selection-filtres": publiee})
+                assert reponse.status_code == 200, reponse.data[:200]
+                octets += len(reponse.data)
+                duree += d
+                n_callbacks += 1
+        print(f"{nom:16s}: {n_callbacks:2d} callbacks | {octets / 1024:9.1f} Ko | {duree * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Test de charge : requêtes par seconde et latences du dashboard sous gunicorn.
+
+Des clients HTTP locaux (un thread chacun) rejouent des changements de
+filtres comme le navigateur : le callback de sélection, puis chaque
+callback de graphique si la sélection publiée a changé. Les filtres sont
+tirés parmi un nombre fixe de combinaisons (--combinaisons) : peu de
+combinaisons = surtout des rendus en cache, beaucoup = surtout du calcul.
+
+Sans --url, le dashboard est lancé sous gunicorn (config/gunicorn.conf.py)
+sur N offres synthétiques, avec --workers et --threads ; la mémoire des
+processus est relevée après la charge (RSS et PSS, les pages partagées
+n'étant comptées qu'une fois en PSS).
+
+Usage : python benchmarks/bench_charge.py [--lignes 200000] [--workers 4] [--threads 1]
+        [--clients 8] [--duree 20] [--combinaisons 50] [--url http://127.0.0.1:8050]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_callbacks import corps_callback, offres  # noqa: E402
+
+FILTRES = {
+    "filter-ville": [f"Ville {i}" for i in range(30)],
+    "filter-contrat": ["CDI", "CDD", "INTERIM", "STAGE"],
+    "filter-domaine": ["Informatique", "Commerce", "BTP", "Autre"],
+    "filter-salaire": ["Très_Faible", "Faible", "Moyen", "Élevé", "Très_Élevé"],
+    "filter-tres-demande": [1],
+}
+
+
+def combinaisons(n, rng):
+    """n jeux de filtres distincts (le premier sans filtre : chargement de la page)."""
+    tirees = [{}]
+    while len(tirees) < n:
+        valeurs = {}
+        for composant, choix in FILTRES.items():
+            if rng.random() < 0.4:
+                valeurs[composant] = sorted(rng.choice(choix, rng.integers(1, min(3, len(choix)) + 1),
+                                                       replace=False).tolist())
+        if valeurs not in tirees:
+            tirees.append(valeurs)
+    return tirees
+
+
+def poster(url, corps):
+    requete = urllib.request.Request(url + "/_dash-update-component", data=json.dumps(corps).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    debut = time.perf_counter()
+    try:
+        with urllib.request.urlopen(requete, timeout=120) as reponse:
+            contenu = reponse.read()
+            statut = reponse.status
+    except urllib.error.HTTPError as e:
+        contenu, statut = e.read(), e.code
+    return statut, contenu, time.perf_counter() - debut
+
+
+def client(url, selection, graphiques, jeux, fin, graine, mesures):
+    """Enchaîne les changements de filtres jusqu'à `fin` ; ajoute ses mesures à `mesures`."""
+    rng = np.random.default_rng(graine)
+    latences, interactions, erreurs = [], [], 0
+    publiee = None
+    while time.perf_counter() < fin:
+        valeurs = jeux[rng.integers(len(jeux))]
+        statut, contenu, duree = poster(url, corps_callback(selection, valeurs, publiee))
+        latences.append(duree)
+        interaction = duree
+        if statut == 200:
+            sortie = json.loads(contenu).get("response", {})
+            if "selection-filtres" in sortie:
+                publiee = sortie["selection-filtres"]["data"]
+                for dependance in graphiques:
+                    statut, _, duree = poster(url, corps_callback(dependance, {"selection-filtres": publiee}))
+                    latences.append(duree)
+                    interaction += duree
+                    erreurs += statut != 200
+        elif statut != 204:  # 204 : no_update, sélection inchangée
+            erreurs += 1
+        interactions.append(interaction)
+    mesures.append((latences, interactions, erreurs))
+
+
+def memoire_processus(pid):
+    """(RSS, PSS) en Mo du processus et de ses enfants directs (workers gunicorn)."""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+        rss = pss = 0
+        for p in pids:
+            with open(f"/proc/{p}/smaps_rollup") as f:
+                champs = {l.split(":")[0]: int(l.split()[1]) for l in f if l.split(":")[0] in ("Rss", "Pss")}
+            rss += champs["Rss"]
+            pss += champs["Pss"]
+    except OSError:
+        return None
+    return len(pids) - 1, rss / 1024, pss / 1024
+
+
+def lancer_gunicorn(args, dossier):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    offres(args.lignes, np.random.default_rng(42)).to_csv(os.path.join(dossier, "offres_ml.csv"), index=False)
+    env = {
+        **os.environ,
+        "OFFRES_ML": os.path.join(dossier, "offres_ml"), "OFFRES_FORMAT": "csv",
+        "DASHBOARD_CACHE": os.path.join(dossier, "cache"), "DASHBOARD_CLIENT_MAX": "0",
+        "DASHBOARD_BIND": f"127.0.0.1:{port}",
+        "DASHBOARD_WORKERS": str(args.workers), "DASHBOARD_THREADS": str(args.threads),
+    }
+    journal = open(os.path.join(dossier, "gunicorn.log"), "w")
+    processus = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", os.path.join(BASE_DIR, "config", "gunicorn.conf.py")],
+                                 cwd=BASE_DIR, env=env, stdout=journal, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    debut = time.perf_counter()
+    while True:
+        if processus.poll() is not None:
+            raise SystemExit(f"gunicorn arrêté, voir {journal.name}")
+        try:
+            with urllib.request.urlopen(url + "/_dash-dependencies", timeout=5):
+                break
+        except OSError:
+            time.sleep(0.2)
+    print(f"gunicorn : {args.workers} workers x {args.threads} threads, prêt en "
+          f"{time.perf_counter() - debut:.1f} s ({args.lignes:,} offres, journal {journal.name})")
+    return processus, url
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="dashboard déjà lancé (sinon : gunicorn lancé ici)")
+    parser.add_argument("--lignes", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duree", type=float, default=20)
+    parser.add_argument("--combinaisons", type=int, default=50)
+    args = parser.parse_args()
+
+    processus, url = None, args.url
+    if url is None:
+        processus, url = lancer_gunicorn(args, tempfile.mkdtemp())
+    try:
+        with urllib.request.urlopen(url + "/_dash-dependencies") as reponse:
+            dependances = json.loads(reponse.read())
+        selection = next((d for d in dependances if d["output"] == "selection-filtres.data"), None)
+        if selection is None:
+            raise SystemExit("Pas de callback de sélection côté serveur (dashboard en mode navigateur ?)")
+        graphiques = [d for d in dependances if any(i["id"] == "selection-filtres" for i in d["inputs"])]
+        jeux = combinaisons(args.combinaisons, np.random.default_rng(7))
+
+        mesures = []
+        fin = time.perf_counter() + args.duree
+        clients = [threading.Thread(target=client, args=(url, selection, graphiques, jeux, fin, k, mesures))
+                   for k in range(args.clients)]
+        debut = time.perf_counter()
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        ecoule = time.perf_counter() - debut
+
+        latences = np.concatenate([np.array(m[0]) for m in mesures]) * 1000
+        interactions = np.concatenate([np.array(m[1]) for m in mesures]) * 1000
+        erreurs = sum(m[2] for m in mesures)
+        p50, p95, p99 = np.percentile(latences, [50, 95, 99])
+        print(f"{args.clients} clients, {args.duree:.0f} s, {len(jeux)} combinaisons de filtres, "
+              f"{len(graphiques)} callbacks de graphiques")
+        print(f"requêtes      : {len(latences):,} ({len(latences) / ecoule:.1f} req/s), erreurs {erreurs}")
+        print(f"latence       : p50 {p50:.1f} ms | p95 {p95:.1f} ms | p99 {p99:.1f} ms | max {latences.max():.1f} ms")
+        i50, i95, i99 = np.percentile(interactions, [50, 95, 99])
+        print(f"interaction   : {len(interactions):,} ({len(interactions) / ecoule:.1f}/s) | "
+              f"p50 {i50:.1f} ms | p95 {i95:.1f} ms | p99 {i99:.1f} ms")
+        if processus is not None:
+            memoire = memoire_processus(processus.pid)
+            if memoire is not None:
+                n, rss, pss = memoire
+                print(f"mémoire       : maître + {n} workers, RSS {rss:.0f} Mo, PSS {pss:.0f} Mo")
+    finally:
+        if processus is not None:
+            processus.terminate()
+            processus.wait()
+
+
+if __name__ == "__main__":
+    main()
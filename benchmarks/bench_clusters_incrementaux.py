@@ -0,0 +1,105 @@
+"""
+Benchmark : clustering complet contre incrémental sur un corpus qui grandit.
+
+Sur N offres synthétiques (mêmes titres que bench_agglomeratif.py), mesure :
+  - la part KMeans du mode complet (TF-IDF + KMeans n_init=10, max_iter=300
+    sur toutes les offres, puis sa silhouette ; Agglomerative et DBSCAN,
+    aussi lancés par le mode complet, ne sont pas comptés) ;
+  - l'entraînement du mode incrémental (MiniBatchKMeans) et sa sauvegarde ;
+  - un run quotidien : chargement du modèle, dérive et predict sur les N
+    offres plus --nouvelles offres arrivées depuis ;
+  - un réentraînement après dérive (nouveau vocabulaire) : part des
+    anciennes offres qui gardent leur cluster_id, avec et sans reprise des
+    numéros du modèle précédent.
+
+Usage : python benchmarks/bench_clusters_incrementaux.py [--lignes 50000] [--nouvelles 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import hstack
+from sklearn.cluster import KMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import silhouette_score
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_agglomeratif import N_CLUSTERS, textes_offres  # noqa: E402
+from src.ml.clusters_incrementaux import ModeleClusters  # noqa: E402
+
+
+def vectoriseur():
+    return TfidfVectorizer(max_features=1000, min_df=2, max_df=0.7)
+
+
+def chrono(fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    return resultat, time.perf_counter() - debut
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=50_000)
+    parser.add_argument("--nouvelles", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    textes, domaines = textes_offres(args.lignes, rng)
+    cles = [f"offre {k}" for k in range(args.lignes)]
+    modele_path = os.path.join(tempfile.mkdtemp(), "clusters.joblib")
+
+    def complet():
+        X_text = vectoriseur().fit_transform(textes)
+        X = hstack([X_text, pd.get_dummies(domaines, sparse=True).values])
+        labels = KMeans(n_clusters=N_CLUSTERS, random_state=42, n_init=10, max_iter=300).fit_predict(X)
+        return silhouette_score(X, labels)
+
+    _, t_complet = chrono(complet)
+    modele = ModeleClusters(vectoriseur(), N_CLUSTERS)
+    labels, t_ajuster = chrono(lambda: modele.ajuster(textes, domaines, cles))
+    _, t_sauver = chrono(lambda: modele.sauver(modele_path))
+    print(f"{args.lignes:,} offres | KMeans + silhouette (mode complet) {t_complet:.2f} s | "
+          f"MiniBatchKMeans {t_ajuster:.2f} s (+ sauvegarde {t_sauver * 1000:.0f} ms, "
+          f"{os.path.getsize(modele_path) / 1e6:.1f} Mo)")
+
+    # Run quotidien : quelques centaines d'offres de plus, même vocabulaire
+    nouveaux_textes, nouveaux_domaines = textes_offres(args.nouvelles, rng)
+    tous_textes = pd.concat([textes, nouveaux_textes], ignore_index=True)
+    tous_domaines = pd.concat([domaines, nouveaux_domaines], ignore_index=True)
+    toutes_cles = cles + [f"nouvelle {k}" for k in range(args.nouvelles)]
+
+    def quotidien():
+        charge = ModeleClusters.charger(modele_path)
+        derive = charge.derive(tous_textes, tous_domaines, toutes_cles)
+        return derive, charge.predire(tous_textes, tous_domaines)[0]
+
+    (derive, affectes), t_quotidien = chrono(quotidien)
+    print(f"run quotidien (+{args.nouvelles} offres) : {t_quotidien:.2f} s | dérive inertie x{derive['inertie']:.2f}, "
+          f"hors vocabulaire {derive['hors_vocabulaire']:+.1%} -> refit {derive['refit']} | "
+          f"anciennes offres inchangées {np.mean(affectes[:args.lignes] == labels):.1%}")
+
+    # Dérive : 20 % d'offres au vocabulaire nouveau, réentraînement
+    derivees, derives_domaines = textes_offres(args.lignes // 5, rng)
+    derivees = derivees.str.replace(r"(\w+)", r"x\1", regex=True)
+    tous_textes = pd.concat([textes, derivees], ignore_index=True)
+    tous_domaines = pd.concat([domaines, derives_domaines], ignore_index=True)
+    toutes_cles = cles + [f"dérivée {k}" for k in range(len(derivees))]
+    derive = modele.derive(tous_textes, tous_domaines, toutes_cles)
+    print(f"dérive (+{len(derivees):,} offres au vocabulaire nouveau) : inertie x{derive['inertie']:.2f}, "
+          f"hors vocabulaire {derive['hors_vocabulaire']:+.1%} -> refit {derive['refit']}")
+    for nom, precedent in [("sans reprise des numéros", None), ("avec reprise des numéros", modele)]:
+        nouveaux, duree = chrono(lambda: ModeleClusters(vectoriseur(), N_CLUSTERS).ajuster(
+            tous_textes, tous_domaines, toutes_cles, precedent=precedent))
+        print(f"   réentraînement {nom} : {duree:.2f} s | anciennes offres gardant leur cluster_id "
+              f"{np.mean(nouveaux[:args.lignes] == labels):.1%}")
+
+
+if __name__ == "__main__":
+    main()
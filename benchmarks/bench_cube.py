@@ -0,0 +1,101 @@
+"""
+Benchmark : agrégats des graphiques du dashboard, parcours des lignes vs cube.
+
+Sur N offres synthétiques (table compacte du dashboard), calcule pour
+quelques combinaisons de filtres les comptages des graphiques (domaines,
+salaires, pays, villes, contrats, expérience, salaire x pays, série
+temporelle) en parcourant les lignes filtrées, puis avec CubeOffres, et
+vérifie que les réponses sont identiques.
+
+Usage : python benchmarks/bench_cube.py [--lignes 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from src.dashboard import cube  # noqa: E402
+from src.dashboard.index_filtres import IndexFiltres  # noqa: E402
+from src.dashboard.table_offres import compter, construire_table  # noqa: E402
+
+DIMENSIONS_COMPTEES = ["Domaine_metier", "niveau_salaire", "Pays", "Ville_propre", "Contrat_propre",
+                       "experience_level"]
+
+
+def offres(n, rng):
+    # Villes très inégalement représentées (loi de Zipf), comme dans les offres scrapées
+    villes = np.array([f"Ville {i}" for i in range(300)], dtype=object)
+    poids_villes = 1 / np.arange(1, 301) ** 1.2
+    jours = np.array([f"il y a {i} jours" for i in range(1, 31)] + ["il y a 5 heures"], dtype=object)
+    return pd.DataFrame({
+        "Titre": "Offre",
+        "Ville": rng.choice(villes, n, p=poids_villes / poids_villes.sum()),
+        "Contrat": rng.choice(["CDI", "CDD", "INTERIM", "STAGE"], n),
+        "Date": rng.choice(jours, n),
+        "Pays": rng.choice(["France", "Belgique", "Suisse"], n),
+        "cluster_category": rng.choice(["Informatique", "Commerce", "BTP", "Autre"], n),
+        "salary_level": rng.choice(["Très_Faible", "Faible", "Moyen", "Élevé", "Très_Élevé"], n),
+        "confidence_score": rng.random(n),
+        "salary_score": rng.integers(0, 100, n),
+        "experience_level": rng.choice(["Junior", "Confirmé", "Senior"], n),
+    })
+
+
+def par_lignes(dff):
+    reponses = {dim: compter(dff[dim]) for dim in DIMENSIONS_COMPTEES}
+    reponses["temps"] = dff.groupby("jours_depuis").size()
+    reponses["salaire_pays"] = dff.groupby("Pays", observed=True)["salary_score"].mean()
+    reponses["pays_salaire"] = dff.groupby(["Pays", "niveau_salaire"], observed=True).size()
+    return reponses
+
+
+def par_cube(cubes, filtres):
+    sel = cubes["filtres"].selection(filtres)
+    reponses = {dim: cube.compter(sel, dim) for dim in DIMENSIONS_COMPTEES if dim != "experience_level"}
+    reponses["experience_level"] = cube.compter(cubes["experience"].selection(filtres), "experience_level")
+    reponses["temps"] = cube.taille_par(cubes["temps"].selection(filtres), "jours_depuis")
+    reponses["salaire_pays"] = cube.moyenne_par(sel, "Pays")
+    reponses["pays_salaire"] = cube.taille_par(sel, ["Pays", "niveau_salaire"])
+    return reponses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    table = construire_table(offres(args.lignes, np.random.default_rng(42)))
+    index = IndexFiltres(table)
+    debut = time.perf_counter()
+    cubes = {nom: cube.CubeOffres(table, dims) for nom, dims in cube.CUBES_DASHBOARD.items()}
+    print(f"{len(table):,} offres | cubes construits en {time.perf_counter() - debut:.2f} s : "
+          + ", ".join(f"{nom} {len(c):,} cellules" for nom, c in cubes.items()))
+
+    combinaisons = {
+        "aucun filtre": {},
+        "1 domaine": {"Domaine_metier": ["Informatique"]},
+        "contrat + pays": {"Contrat_propre": ["CDI", "CDD"], "Pays": ["France"]},
+    }
+    for nom, filtres in combinaisons.items():
+        debut = time.perf_counter()
+        lignes = index.lignes(filtres)
+        attendu = par_lignes(table if lignes is None else table.take(lignes))
+        t_lignes = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        obtenu = par_cube(cubes, filtres)
+        t_cube = time.perf_counter() - debut
+
+        for cle, serie in attendu.items():
+            assert np.array_equal(serie.to_numpy(), obtenu[cle].to_numpy()), cle
+            assert serie.index.equals(obtenu[cle].index), cle
+        print(f"{nom:15s}: lignes {t_lignes * 1000:7.1f} ms | cube {t_cube * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
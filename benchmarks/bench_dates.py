@@ -0,0 +1,78 @@
+"""
+Benchmark : analyse des dates de publication.
+
+Compare l'ancienne analyse ligne à ligne (`Date.apply(extraire_jours)`) et
+l'analyse vectorisée (`analyser_dates` : une regex, str.extract sur les
+dates distinctes) sur N dates, dans deux cas :
+  - dates relatives seulement (quelques dizaines de valeurs distinctes) ;
+  - dates absolues en plus (des milliers de valeurs distinctes).
+Mesure aussi la préparation de la table du dashboard selon que la colonne
+jours_depuis vient de l'ETL ou que la colonne Date doit être analysée.
+
+Usage : python benchmarks/bench_dates.py [--lignes 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.dashboard.table_offres import jours_depuis  # noqa: E402
+from src.etl.dates import analyser_dates, extraire_jours  # noqa: E402
+
+REFERENCE = pd.Timestamp("2025-12-17 16:52:00")
+
+
+def dates_relatives(n, rng):
+    valeurs = ([f"il y a {h} heures" for h in range(1, 24)] + [f"il y a {j} jours" for j in range(1, 31)]
+               + ["il y a 1 jour", "Date inconnue"])
+    return pd.Series(rng.choice(np.array(valeurs, dtype=object), n))
+
+
+def dates_mixtes(n, rng):
+    dates = dates_relatives(n, rng)
+    absolues = pd.date_range("2020-01-01", periods=2000).strftime("Publiée le %d/%m/%Y").to_numpy(dtype=object)
+    tirees = rng.random(n) < 0.3
+    dates[tirees] = rng.choice(absolues, tirees.sum())
+    return dates
+
+
+def chrono(fonction, repetitions=3):
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return resultat, meilleur
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(42)
+
+    for nom, dates in [("relatives", dates_relatives(args.lignes, rng)), ("mixtes", dates_mixtes(args.lignes, rng))]:
+        ancien, t_ancien = chrono(lambda: pd.to_numeric(dates.apply(extraire_jours), errors="coerce"), 1)
+        nouveau, t_nouveau = chrono(lambda: analyser_dates(dates, REFERENCE))
+        reconnues = ancien.notna()
+        assert nouveau["jours_depuis"][reconnues].equals(ancien[reconnues])
+        print(f"{nom:10s}: {dates.nunique():5d} distinctes | apply {t_ancien * 1000:8.1f} ms | "
+              f"vectorisé {t_nouveau * 1000:7.1f} ms (x{t_ancien / t_nouveau:.0f}) | "
+              f"reconnues {reconnues.mean():.0%} -> {nouveau['jours_depuis'].notna().mean():.0%}")
+
+    # Démarrage du dashboard : colonne calculée par l'ETL ou analyse de Date
+    dates = dates_mixtes(args.lignes, rng)
+    etl = analyser_dates(dates, REFERENCE)
+    _, t_date = chrono(lambda: jours_depuis(pd.DataFrame({"Date": dates})))
+    _, t_etl = chrono(lambda: jours_depuis(etl[["jours_depuis"]]))
+    print(f"dashboard : jours_depuis depuis Date {t_date * 1000:.1f} ms, depuis l'ETL {t_etl * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
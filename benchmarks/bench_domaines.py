@@ -0,0 +1,58 @@
+"""
+Benchmark : classification des domaines métiers.
+
+Compare `Titre.apply(extraire_domaine)` (ligne à ligne) à `classer_domaines`
+(regex précompilées, vectorisé) sur N titres tirés des offres nettoyées,
+et vérifie que les deux donnent exactement les mêmes labels.
+
+Avec --distincts, un numéro est ajouté à chaque titre pour que tous soient
+différents (pire cas : aucune répétition à exploiter).
+
+Usage : python benchmarks/bench_domaines.py [--lignes 1000000] [--distincts]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from src.etl.domaines import classer_domaines, extraire_domaine  # noqa: E402
+
+INTERIM_PATH = os.path.join(BASE_DIR, "data", "interim", "offres_hellowork_clean.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    parser.add_argument("--distincts", action="store_true")
+    args = parser.parse_args()
+
+    titres_source = pd.read_csv(INTERIM_PATH, encoding="utf-8")["Titre"].to_numpy()
+    rng = np.random.default_rng(42)
+    titres = pd.Series(rng.choice(titres_source, size=args.lignes))
+    if args.distincts:
+        titres = titres + " " + pd.Series(np.arange(len(titres))).astype(str)
+    print(f"{len(titres):,} titres ({titres.nunique():,} distincts)")
+
+    debut = time.perf_counter()
+    reference = titres.apply(extraire_domaine)
+    t_apply = time.perf_counter() - debut
+    print(f"apply(extraire_domaine) : {t_apply:7.2f} s")
+
+    debut = time.perf_counter()
+    vectorise = classer_domaines(titres)
+    t_vect = time.perf_counter() - debut
+    print(f"classer_domaines        : {t_vect:7.2f} s  (x{t_apply / t_vect:.1f})")
+
+    identiques = (reference == vectorise).all()
+    print(f"labels identiques       : {identiques}")
+    if not identiques:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark : évaluation d'un clustering, silhouette exacte contre estimée.
+
+Sur N offres synthétiques (même matrice que bench_agglomeratif.py, labels
+MiniBatchKMeans), mesure :
+  - la silhouette exacte (silhouette_score sur toutes les offres, chemin
+    historique de clustering.py, lancé jusqu'à --exacte-max offres) ;
+  - la silhouette échantillonnée (5 échantillons stratifiés) et son IC95 ;
+  - les mesures par centroïdes (silhouette simplifiée, Calinski-Harabasz,
+    Davies-Bouldin).
+
+Usage : python benchmarks/bench_evaluation.py [--tailles 2000,10000,50000] [--exacte-max 50000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_agglomeratif import N_CLUSTERS, matrice  # noqa: E402
+from src.ml.evaluation import evaluer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tailles", default="2000,10000,50000")
+    parser.add_argument("--exacte-max", type=int, default=50_000)
+    args = parser.parse_args()
+
+    for n in [int(t) for t in args.tailles.split(",")]:
+        X = matrice(n, np.random.default_rng(42))
+        labels = MiniBatchKMeans(n_clusters=N_CLUSTERS, random_state=42, n_init=3).fit_predict(X)
+        # Échantillon plus petit que le jeu, même sur les petites tailles
+        mesures = evaluer(X, labels, taille=min(2000, n // 4))
+        s, d = mesures["silhouette"], mesures["durees"]
+        ligne = (f"{n:7,d} offres | échantillonnée {s['score']:.3f} [{s['bas']:.3f} ; {s['haut']:.3f}] "
+                 f"en {d['silhouette']:.2f} s | centroïdes en {d['centroides'] * 1000:.0f} ms "
+                 f"(simplifiée {mesures['silhouette_centroides']:.3f}, CH {mesures['calinski_harabasz']:.0f}, "
+                 f"DB {mesures['davies_bouldin']:.3f})")
+        if n <= args.exacte_max:
+            debut = time.perf_counter()
+            exacte = silhouette_score(X, labels)
+            ligne += f" | exacte {exacte:.3f} en {time.perf_counter() - debut:.2f} s"
+        else:
+            ligne += " | exacte non lancée"
+        print(ligne)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark : features TF-IDF recalculées par chaque étape contre cache partagé.
+
+Sur N offres synthétiques (titres de bench_agglomeratif.py, suivis de
+mentions « H/F », « CDI »...), mesure :
+  - le chemin historique : nettoyer_texte ligne à ligne puis TF-IDF ajusté
+    dans clustering.py, et la même chose dans classification.py (ajusté sur
+    80 % des offres, puis transform du test et de toutes les offres) ;
+  - features.py, premier run : nettoyage vectorisé, empreinte, ajustement
+    et sauvegarde (.npz), puis chaque étape suivante, qui recharge la
+    matrice depuis le cache ;
+  - un run sur données inchangées : nettoyage, empreinte et chargement.
+
+Usage : python benchmarks/bench_features.py [--lignes 50000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_agglomeratif import textes_offres  # noqa: E402
+from src.ml.features import PARAMS_TFIDF, REMPLACEMENTS, chemin_features, features_tfidf, nettoyer_textes  # noqa: E402
+
+MENTIONS = ["(H/F)", "H/F CDI", "CDD", "Stage", "Alternance France", ""]
+
+
+def nettoyer_texte(texte: str) -> str:
+    t = str(texte).lower()
+    for r in REMPLACEMENTS:
+        t = t.replace(r, " ")
+    return t
+
+
+def chrono(fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    return resultat, time.perf_counter() - debut
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    textes, _ = textes_offres(args.lignes, rng)
+    textes = textes + " " + rng.choice(MENTIONS, args.lignes) + " Paris"
+    dossier = tempfile.mkdtemp()
+
+    def historique():
+        # clustering.py
+        TfidfVectorizer(**PARAMS_TFIDF).fit_transform(textes.fillna("").apply(nettoyer_texte))
+        # classification.py
+        X = textes.fillna("").apply(nettoyer_texte)
+        X_train, X_test = train_test_split(X, test_size=0.2, random_state=42)
+        vectoriseur = TfidfVectorizer(max_features=1000, min_df=2)
+        vectoriseur.fit_transform(X_train)
+        vectoriseur.transform(X_test)
+        vectoriseur.transform(X)
+
+    _, t_historique = chrono(historique)
+    _, t_apply = chrono(lambda: textes.fillna("").apply(nettoyer_texte))
+    _, t_vectorise = chrono(lambda: nettoyer_textes(textes))
+    premier, t_premier = chrono(lambda: features_tfidf(nettoyer_textes(textes), dossier=dossier))
+    relu, t_relu = chrono(lambda: features_tfidf(nettoyer_textes(textes), dossier=dossier))
+    taille = os.path.getsize(chemin_features(premier["cle"], dossier)) / 1e6
+
+    print(f"{args.lignes:,} offres | nettoyage ligne à ligne {t_apply:.2f} s, vectorisé {t_vectorise:.2f} s")
+    print(f"   historique (clustering + classification) : {t_historique:.2f} s")
+    print(f"   features.py, 1er run (calcul + sauvegarde {taille:.1f} Mo) : {t_premier:.2f} s, "
+          f"puis étape suivante (cache) : {t_relu:.2f} s -> pipeline {t_premier + t_relu:.2f} s")
+    print(f"   run sur données inchangées : 2 x {t_relu:.2f} s = {2 * t_relu:.2f} s "
+          f"(empreinte + chargement {relu['duree']:.2f} s, cache {relu['depuis_cache']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark : résolution des filtres du dashboard.
+
+Compare l'ancienne méthode (df.copy() puis isin chaînés, une nouvelle table
+à chaque filtre) à l'index inversé (IndexFiltres) sur N offres
+synthétiques, pour quelques combinaisons de filtres, et vérifie que les
+lignes retenues sont identiques.
+
+Usage : python benchmarks/bench_filtres.py [--lignes 2000000] [--colonnes-en-plus 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from src.dashboard.index_filtres import IndexFiltres  # noqa: E402
+
+
+def offres(n, colonnes_en_plus, rng):
+    villes = np.array([f"Ville {i}" for i in range(300)], dtype=object)
+    df = pd.DataFrame({
+        "Ville_propre": pd.Categorical(rng.choice(villes, n)),
+        "Contrat_propre": pd.Categorical(rng.choice(["CDI", "CDD", "INTERIM", "STAGE"], n)),
+        "Domaine_metier": pd.Categorical(rng.choice(["Informatique", "Commerce", "BTP", "Autre"], n)),
+        "Pays": pd.Categorical(rng.choice(["France", "Belgique", "Suisse"], n)),
+        "niveau_salaire": pd.Categorical(rng.choice(["Faible", "Moyen", "Élevé"], n)),
+        "pred_tres_demande": rng.integers(0, 2, n).astype("int8"),
+    })
+    for i in range(colonnes_en_plus):
+        df[f"mesure_{i}"] = rng.random(n)
+    return df
+
+
+def filtrer_isin(df, filtres):
+    dff = df.copy()
+    for dim, valeurs in filtres.items():
+        if valeurs:
+            dff = dff[dff[dim].isin(valeurs)]
+    return dff
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=2_000_000)
+    parser.add_argument("--colonnes-en-plus", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    df = offres(args.lignes, args.colonnes_en_plus, rng)
+    debut = time.perf_counter()
+    index = IndexFiltres(df)
+    print(f"{len(df):,} offres, {df.shape[1]} colonnes | index construit en "
+          f"{time.perf_counter() - debut:.2f} s ({index.nbytes() / 1e6:.1f} Mo)")
+
+    combinaisons = {
+        "1 ville": {"Ville_propre": ["Ville 7"]},
+        "contrat + domaine": {"Contrat_propre": ["CDI", "CDD"], "Domaine_metier": ["Informatique"]},
+        "6 filtres": {"Ville_propre": [f"Ville {i}" for i in range(50)], "Contrat_propre": ["CDI"],
+                      "Domaine_metier": ["Commerce", "BTP"], "Pays": ["France"],
+                      "niveau_salaire": ["Moyen", "Élevé"], "pred_tres_demande": [1]},
+    }
+    for nom, filtres in combinaisons.items():
+        debut = time.perf_counter()
+        attendu = filtrer_isin(df, filtres)
+        t_isin = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        lignes = index.lignes(filtres)
+        t_masque = time.perf_counter() - debut
+        dff = df.take(lignes)
+        t_total = time.perf_counter() - debut
+
+        assert dff.index.equals(attendu.index)
+        print(f"{nom:18s}: copy+isin {t_isin * 1000:8.1f} ms | index {t_masque * 1000:9.1f} ms "
+              f"(+ take {t_total * 1000:7.1f} ms) | {len(dff):,} offres")
+
+
+if __name__ == "__main__":
+    main()
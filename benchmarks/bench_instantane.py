@@ -0,0 +1,79 @@
+"""
+Benchmark : démarrage d'un worker du dashboard avec et sans instantané.
+
+Génère N offres synthétiques, puis importe app_dash dans un processus neuf
+(comme un worker gunicorn) dans trois cas :
+  - sans instantané (DASHBOARD_INSTANTANE="") : lecture + dérivations ;
+  - premier démarrage : construction puis écriture de l'instantané ;
+  - démarrages suivants : projection de l'instantané en mémoire.
+Pour chacun : durée de l'import complet, détail chargement / dérivation, et
+mémoire résidente du processus, privée (RssAnon) ou adossée à un fichier
+partageable entre workers (RssFile).
+
+Usage : python benchmarks/bench_instantane.py [--lignes 1000000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_callbacks import offres  # noqa: E402
+
+# Import du dashboard dans un processus neuf : durées et mémoire en JSON sur la dernière ligne
+SCRIPT_WORKER = """
+import json, time
+debut = time.perf_counter()
+from src.dashboard import app_dash
+duree = time.perf_counter() - debut
+memoire = dict(l.split(":") for l in open("/proc/self/status") if l.startswith(("RssAnon", "RssFile")))
+print(json.dumps({
+    "import": duree,
+    "etapes": app_dash.donnees["demarrage"],
+    "memoire": {k: int(v.split()[0]) / 1024 for k, v in memoire.items()},
+}))
+"""
+
+
+def worker(env):
+    sortie = subprocess.run([sys.executable, "-c", SCRIPT_WORKER], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    dossier = tempfile.mkdtemp()
+    offres(args.lignes, np.random.default_rng(42)).to_csv(os.path.join(dossier, "offres_ml.csv"), index=False)
+    instantane = os.path.join(dossier, "offres_ml.instantane")
+    env = {**os.environ, "OFFRES_ML": os.path.join(dossier, "offres_ml"), "OFFRES_FORMAT": "csv",
+           "DASHBOARD_CACHE": "", "DASHBOARD_CLIENT_MAX": "0"}
+
+    cas = [
+        ("sans instantané", {"DASHBOARD_INSTANTANE": ""}),
+        ("1er démarrage", {"DASHBOARD_INSTANTANE": instantane}),
+        ("avec instantané", {"DASHBOARD_INSTANTANE": instantane}),
+    ]
+    print(f"{args.lignes:,} offres")
+    for nom, variables in cas:
+        mesure = worker({**env, **variables})
+        natures = {}
+        for nature, _, secondes in mesure["etapes"]:
+            natures[nature] = natures.get(nature, 0) + secondes
+        detail = ", ".join(f"{nature} {s * 1000:.0f} ms" for nature, s in natures.items())
+        print(f"{nom:16s}: import {mesure['import'] * 1000:6.0f} ms | données : {detail} | "
+              f"RssAnon {mesure['memoire']['RssAnon']:.0f} Mo, RssFile {mesure['memoire']['RssFile']:.0f} Mo")
+    print(f"Instantané : {os.path.getsize(instantane) / 1e6:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
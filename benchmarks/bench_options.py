@@ -0,0 +1,91 @@
+"""
+Benchmark : taille de la page et recherche dans les options des filtres.
+
+Génère N offres réparties sur V villes distinctes (noms synthétiques,
+fréquences de Zipf), puis mesure :
+  - la taille du layout envoyé au chargement, comparée à la liste complète
+    des villes que la page contenait auparavant ;
+  - le temps de construction de l'index de préfixes ;
+  - le temps d'une recherche, directe et via le callback Dash.
+
+Usage : python benchmarks/bench_options.py [--lignes 200000] [--villes 50000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_callbacks import appeler, offres  # noqa: E402
+
+SYLLABES = ["ba", "bel", "bour", "cha", "mont", "ville", "neuve", "lan", "ré", "san", "tou", "ver",
+            "é", "gny", "court", "mar", "roc", "sur", "ais", "lieu"]
+PREFIXES = ["", "", "", "Saint-", "Sainte-", "Le ", "La ", "Villeneuve-", "Mont-"]
+RECHERCHES = ["s", "sa", "saint", "saint-e", "ville", "mar", "é", "zzz"]
+
+
+def noms_villes(n, rng):
+    noms = set()
+    while len(noms) < n:
+        mot = "".join(rng.choice(SYLLABES, rng.integers(2, 5)))
+        noms.add(rng.choice(PREFIXES) + mot.capitalize())
+    return np.array(sorted(noms), dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=200_000)
+    parser.add_argument("--villes", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    df = offres(args.lignes, rng)
+    villes = noms_villes(args.villes, rng)
+    poids = 1 / np.arange(1, len(villes) + 1) ** 0.8
+    df["Ville"] = rng.choice(villes, args.lignes, p=poids / poids.sum())
+
+    dossier = tempfile.mkdtemp()
+    df.to_csv(os.path.join(dossier, "offres_ml.csv"), index=False)
+    os.environ["OFFRES_ML"] = os.path.join(dossier, "offres_ml")
+    os.environ["OFFRES_FORMAT"] = "csv"
+    os.environ["DASHBOARD_CACHE"] = ""
+    os.environ["DASHBOARD_CLIENT_MAX"] = "0"
+    from src.dashboard import app_dash  # noqa: E402
+    from src.dashboard.options_filtres import IndexPrefixes, options  # noqa: E402
+
+    table = app_dash.donnees["df"]
+    villes_options = app_dash.donnees["options_initiales"]["Ville_propre"]
+    distinctes = sorted(table["Ville_propre"].dropna().unique())
+    print(f"{len(table):,} offres | {len(distinctes):,} villes distinctes")
+
+    client = app_dash.server.test_client()
+    layout = len(client.get("/_dash-layout").data)
+    complete = len(json.dumps(options(distinctes), ensure_ascii=False).encode("utf-8"))
+    page = len(json.dumps(villes_options, ensure_ascii=False).encode("utf-8"))
+    print(f"Layout : {layout / 1024:.1f} Ko avec {len(villes_options)} villes "
+          f"(toutes les villes : {(layout - page + complete) / 1024:.1f} Ko)")
+
+    debut = time.perf_counter()
+    index = IndexPrefixes(table["Ville_propre"])
+    print(f"Index de préfixes : {(time.perf_counter() - debut) * 1000:.0f} ms, {len(index._cles):,} clés")
+
+    dependance = next(d for d in client.get("/_dash-dependencies").json if d["output"] == "filter-ville.options")
+    for texte in RECHERCHES:
+        debut = time.perf_counter()
+        for _ in range(20):
+            trouvees = index.chercher(texte)
+        directe = (time.perf_counter() - debut) / 20
+        reponse, duree = appeler(client, dependance, {"filter-ville": texte}, etat=["Saint-Bachamont"])
+        assert reponse.status_code == 200, reponse.data[:200]
+        print(f"{texte!r:10s}: {len(trouvees):3d} options | index {directe * 1000:6.2f} ms | "
+              f"callback {duree * 1000:6.1f} ms ({len(reponse.data) / 1024:.1f} Ko)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark : extraction des cartes de page_source.txt (30 cartes).
+
+- parseur HTML en une passe (src/scraping/parse_cards.py)
+- ancien chemin Selenium : 5 find_element par carte (si Chrome est disponible)
+- nouveau chemin Selenium : une lecture de page_source + parseur
+
+Usage : python benchmarks/bench_parse_cards.py [--repetitions 50]
+"""
+import argparse
+import os
+import pathlib
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from src.scraping.parse_cards import extraire_offres_html  # noqa: E402
+
+PAGE_SOURCE = os.path.join(BASE_DIR, "page_source.txt")
+SELECTEURS = [
+    "[data-cy='offerTitle']",
+    "[data-cy='offerTitle'] p.tw-typo-s",
+    "[data-cy='localisationCard']",
+    "[data-cy='contractCard']",
+    "div.tw-typo-s.tw-text-grey-500",
+]
+
+
+def extraire_offres_find_element(driver):
+    """Ancien chemin : un aller-retour WebDriver par champ et par carte."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
+    offres = []
+    for card in driver.find_elements(By.CSS_SELECTOR, "div[data-cy='serpCard']"):
+        valeurs = []
+        for selecteur in SELECTEURS:
+            try:
+                valeurs.append(card.find_element(By.CSS_SELECTOR, selecteur).text.strip())
+            except NoSuchElementException:
+                valeurs.append(None)
+        if valeurs[0] is None:
+            continue
+        valeurs = [v or "" for v in valeurs]
+        if any(valeurs):
+            offres.append(valeurs)
+    return offres
+
+
+def chronometrer(fonction, repetitions):
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        resultat = fonction()
+    return (time.perf_counter() - debut) / repetitions, resultat
+
+
+def afficher(nom, duree, n_cartes):
+    print(f"{nom:<38} {duree * 1000:9.2f} ms/page  {n_cartes / duree:10.0f} cartes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repetitions", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(PAGE_SOURCE, encoding="utf-8") as f:
+        html = f.read()
+
+    duree, offres = chronometrer(lambda: extraire_offres_html(html), args.repetitions)
+    afficher("parseur HTML (page_source.txt)", duree, len(offres))
+
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:  # pas de Chrome sur cette machine
+        print(f"(chemin Selenium ignoré : {type(e).__name__})")
+        return
+
+    try:
+        driver.get(pathlib.Path(PAGE_SOURCE).as_uri())
+        repetitions = max(1, args.repetitions // 10)
+        duree, offres = chronometrer(lambda: extraire_offres_find_element(driver), repetitions)
+        afficher("Selenium find_element × 5 / carte", duree, len(offres))
+        duree, offres = chronometrer(lambda: extraire_offres_html(driver.page_source), repetitions)
+        afficher("Selenium page_source + parseur", duree, len(offres))
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
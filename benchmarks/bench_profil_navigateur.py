@@ -0,0 +1,105 @@
+"""
+Benchmark : profil navigateur "complet" vs "leger" sur un serveur local.
+
+Le serveur renvoie page_source.txt pour la page de résultats ; toutes les
+URLs absolues de la page sont réécrites vers lui, et il répond à chaque
+image, police ou script avec un contenu factice de taille fixe. On mesure
+les octets transférés et la durée de chaque page pour les deux profils.
+
+Usage : python benchmarks/bench_profil_navigateur.py [--pages 5]
+"""
+import argparse
+import http.server
+import mimetypes
+import os
+import re
+import sys
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from src.scraping.driver_pool import PROFILS, PoolNavigateurs, octets_transferes  # noqa: E402
+from src.scraping.parse_cards import extraire_offres_html  # noqa: E402
+
+PAGE_SOURCE = os.path.join(BASE_DIR, "page_source.txt")
+TAILLE_RESSOURCE = 40 * 1024
+
+
+def demarrer_serveur():
+    with open(PAGE_SOURCE, encoding="utf-8") as f:
+        html = f.read()
+    ressource = b"\0" * TAILLE_RESSOURCE
+    RE_ABSOLUE = re.compile(r"https?://")
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/recherche"):
+                corps = RE_ABSOLUE.sub(self.server.base + "/", html).encode("utf-8")
+                type_mime = "text/html; charset=utf-8"
+            else:
+                corps = ressource
+                type_mime = mimetypes.guess_type(self.path.split("?")[0])[0] or "application/javascript"
+            self.send_response(200)
+            self.send_header("Content-Type", type_mime)
+            self.send_header("Content-Length", str(len(corps)))
+            self.end_headers()
+            self.wfile.write(corps)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def mesurer_profil(profil, url, pages):
+    from selenium.webdriver.support.ui import WebDriverWait
+    from src.scraping.scrape_hellowork import extraire_offres_selenium
+
+    pool = PoolNavigateurs(taille=1, profil=profil, mesures=True)
+    try:
+        # Démarrage du navigateur hors mesure
+        with pool.navigateur() as driver:
+            octets_transferes(driver)
+        resultats = []
+        for page in range(1, pages + 1):
+            with pool.navigateur() as driver:
+                debut = time.perf_counter()
+                driver.get(url + str(page))
+                offres = extraire_offres_selenium(driver, WebDriverWait(driver, 10))
+                if profil == "leger":
+                    driver.execute_script("window.stop();")
+                resultats.append((time.perf_counter() - debut, octets_transferes(driver), len(offres)))
+    finally:
+        pool.fermer()
+    return resultats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=5)
+    args = parser.parse_args()
+
+    httpd = demarrer_serveur()
+    url = httpd.base + "/recherche.html?page="
+    with open(PAGE_SOURCE, encoding="utf-8") as f:
+        attendues = len(extraire_offres_html(f.read()))
+
+    try:
+        for profil in PROFILS:
+            resultats = mesurer_profil(profil, url, args.pages)
+            for page, (duree, octets, n_cartes) in enumerate(resultats, start=1):
+                statut = "" if n_cartes == attendues else f"  ⚠️ {n_cartes}/{attendues} cartes"
+                print(f"{profil:<8} page {page} : {octets / 1024:8.0f} Ko  {duree * 1000:8.0f} ms{statut}")
+            octets_moy = sum(r[1] for r in resultats) / len(resultats)
+            duree_moy = sum(r[0] for r in resultats) / len(resultats)
+            print(f"{profil:<8} moyenne : {octets_moy / 1024:8.0f} Ko  {duree_moy * 1000:8.0f} ms\n")
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
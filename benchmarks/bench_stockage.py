@@ -0,0 +1,66 @@
+"""
+Benchmark : stockage CSV vs Parquet des offres enrichies (offres_ml).
+
+Réplique les offres jusqu'à N lignes, écrit les deux formats puis compare
+la taille sur disque, le temps de lecture complète et le temps de lecture
+des seules colonnes du dashboard (projection). Vérifie aussi que les deux
+formats relisent exactement les mêmes données.
+
+Usage : python benchmarks/bench_stockage.py [--lignes 500000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from src.etl.stockage import chemin, ecrire_offres, lire_offres  # noqa: E402
+
+ML_BASE = os.path.join(BASE_DIR, "data", "processed", "offres_ml")
+COLONNES_DASHBOARD = ["Titre", "Ville_propre", "Contrat_propre", "Domaine_metier", "Date",
+                      "niveau_salaire", "pred_tres_demande", "score_popularite"]
+
+
+def chronometrer(fonction, repetitions=3):
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur, resultat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lignes", type=int, default=500_000)
+    args = parser.parse_args()
+
+    source = lire_offres(ML_BASE, fmt="csv")
+    rng = np.random.default_rng(42)
+    df = source.iloc[rng.integers(0, len(source), size=args.lignes)].reset_index(drop=True)
+    print(f"{len(df):,} offres, {df.shape[1]} colonnes")
+
+    with tempfile.TemporaryDirectory() as dossier:
+        base = os.path.join(dossier, "offres_ml")
+        resultats = {}
+        for fmt in ("csv", "parquet"):
+            t_ecriture, _ = chronometrer(lambda: ecrire_offres(df, base, fmt), repetitions=1)
+            taille = os.path.getsize(chemin(base, fmt))
+            t_complet, complet = chronometrer(lambda: lire_offres(base, fmt=fmt))
+            t_projete, _ = chronometrer(lambda: lire_offres(base, colonnes=COLONNES_DASHBOARD, fmt=fmt))
+            resultats[fmt] = complet
+            print(f"{fmt:8s}: {taille / 1e6:7.1f} Mo | écriture {t_ecriture:6.2f} s | "
+                  f"lecture complète {t_complet:6.2f} s | colonnes dashboard {t_projete:6.2f} s")
+
+        identiques = resultats["csv"].astype(str).equals(resultats["parquet"].astype(str))
+        print(f"données identiques : {identiques}")
+        if not identiques:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import gc
+import os
+
+# ========================================
+# GUNICORN : DASHBOARD EN PRODUCTION
+#   gunicorn -c config/gunicorn.conf.py
+# Les données sont chargées une fois dans le maître (preload_app), puis
+# partagées par les workers forkés. Réglages surchargeables par variables
+# d'environnement :
+#   DASHBOARD_BIND     adresse d'écoute (0.0.0.0:8050)
+#   DASHBOARD_WORKERS  processus (un par cœur : les callbacks calculent en Python)
+#   DASHBOARD_THREADS  threads par processus (> 1 : worker gthread, utile quand
+#                      les rendus viennent surtout du cache)
+#   DASHBOARD_TIMEOUT  secondes avant de relancer un worker bloqué
+# ========================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+wsgi_app = "src.dashboard.wsgi:creer_serveur()"
+chdir = BASE_DIR
+preload_app = True
+
+bind = os.environ.get("DASHBOARD_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("DASHBOARD_WORKERS", os.cpu_count() or 1))
+threads = int(os.environ.get("DASHBOARD_THREADS", "1"))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.environ.get("DASHBOARD_TIMEOUT", "60"))
+
+
+def when_ready(server):
+    # Objets chargés par le maître sortis du ramasse-miettes : ses passages
+    # dans les workers ne réécrivent pas leurs en-têtes, les pages restent partagées
+    gc.collect()
+    gc.freeze()
@@ -1,20 +1,35 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+import os
+import sys
 import time
 
-driver = webdriver.Chrome()
+from src.scraping.driver_pool import pool_partage
+from src.scraping.parse_cards import extraire_offres_html, offre_vers_ligne
 
-url = "https://www.hellowork.com/fr-fr/emploi/recherche.html?k=python"
-driver.get(url)
+HTML_PATH = sys.argv[1] if len(sys.argv) > 1 else "page_source.txt"
 
-print("⏳ Chargement...")
-time.sleep(5)
+# Sans fichier HTML sauvegardé, on le récupère avec Chrome
+if not os.path.exists(HTML_PATH):
+    pool = pool_partage()
 
-html = driver.page_source
+    with pool.navigateur() as driver:
+        url = "https://www.hellowork.com/fr-fr/emploi/recherche.html?k=python"
+        driver.get(url)
 
-with open("page_source.txt", "w", encoding="utf-8") as f:
-    f.write(html)
+        print("⏳ Chargement...")
+        time.sleep(5)
 
-print("✅ Fichier enregistré sous : page_source.txt")
+        html = driver.page_source
 
-driver.quit()
+    with open(HTML_PATH, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    print(f"✅ Fichier enregistré sous : {HTML_PATH}")
+    print(pool.rapport())
+
+with open(HTML_PATH, encoding="utf-8") as f:
+    html = f.read()
+
+offres = extraire_offres_html(html)
+for i, offre in enumerate(offres):
+    print(f"OFFRE {i}:", " | ".join(offre_vers_ligne(offre)))
+print(f"✅ {len(offres)} offres extraites de '{HTML_PATH}'")
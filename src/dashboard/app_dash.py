@@ -1,53 +1,153 @@
 import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
-from dash import Dash, dcc, html, Input, Output
+from dash import ClientsideFunction, Dash, dcc, html, Input, Output, State, no_update
+from flask import jsonify
 import plotly.graph_objects as go
 
 # ========================================
 # CONFIGURATION & CHARGEMENT
 # ========================================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-ML_PATH = os.path.join(BASE_DIR, "data", "processed", "offres_ml.csv")
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# .csv ou .parquet ; OFFRES_ML permet de pointer vers un autre jeu d'offres
+ML_BASE = os.environ.get("OFFRES_ML", os.path.join(BASE_DIR, "data", "processed", "offres_ml"))
 
-df = pd.read_csv(ML_PATH, encoding="utf-8")
+sys.path.insert(0, BASE_DIR)
+from src.dashboard import cube  # noqa: E402
+from src.dashboard.cache_rendus import CacheRendus, cle_filtres, empreinte_fichier  # noqa: E402
+from src.dashboard.instantane import (  # noqa: E402
+    chemin_instantane, construire_donnees, ecrire_instantane, lire_instantane, rapport_demarrage,
+)
+from src.dashboard.mode_client import colonnes_client, gabarits  # noqa: E402
+from src.dashboard.options_filtres import LIMITE_OPTIONS, options  # noqa: E402
+from src.etl.regles import charger_regles  # noqa: E402
+from src.etl.stockage import chemin  # noqa: E402
+
+# Rendus mémorisés, partagés entre workers via ce répertoire ("" = mémoire seule)
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE", os.path.join(BASE_DIR, "data", "cache", "dashboard"))
+CACHE_TAILLE = int(os.environ.get("DASHBOARD_CACHE_TAILLE", "128"))
+# Jusqu'à ce nombre d'offres, filtres et graphiques sont calculés dans le navigateur
+# (0 = jamais, par défaut : le mode navigateur s'active explicitement, ex. 10000)
+CLIENT_MAX = int(os.environ.get("DASHBOARD_CLIENT_MAX", "0"))
+# Données dérivées projetées en mémoire au démarrage ("" = toujours recalculées)
+INSTANTANE = os.environ.get("DASHBOARD_INSTANTANE", chemin_instantane(ML_BASE))
 
-# Colonnes : Titre, Entreprise, Ville, Contrat, Date, Pays,
-# cluster_id, cluster_category, cluster_keywords,
-# confidence_score, experience_level, experience_confidence,
-# salary_level, salary_score, salary_confidence [file:3]
 
-# Harmonisation
-df["Ville_propre"] = df["Ville"]
-df["Contrat_propre"] = df["Contrat"]
-df["Domaine_metier"] = df["cluster_category"]
-df["niveau_salaire"] = df["salary_level"]
+# Dropdown -> dimension dont il liste les valeurs
+FILTRES_OPTIONS = {
+    "filter-pays": "Pays",
+    "filter-ville": "Ville_propre",
+    "filter-contrat": "Contrat_propre",
+    "filter-domaine": "Domaine_metier",
+    "filter-salaire": "niveau_salaire",
+}
 
-df["pred_tres_demande"] = (df["confidence_score"] > 0.6).astype(int)
-df["score_popularite"] = df["salary_score"]
 
-HAS_PAYS = "Pays" in df.columns
+def charger_donnees(structure: dict = None) -> dict:
+    """
+    Table compacte, index des filtres, cubes et index d'options : projetés
+    depuis l'instantané s'il correspond au fichier d'offres, sinon construits
+    depuis ce fichier puis écrits dans l'instantané (pour les autres workers
+    et le prochain démarrage). Rappelé par le callback dès que le fichier de
+    données change : des offres d'une autre `structure`, que le dashboard ne
+    chargera pas, ne remplacent pas l'instantané.
+    """
+    path = chemin(ML_BASE)
+    empreinte = empreinte_fichier(path)
 
-# Nettoyage pour l’axe temps (nombre de jours depuis la publication)
-def extraire_jours(s):
-    if isinstance(s, str):
-        s = s.strip().lower()
-        if "jour" in s:
-            try:
-                return float(s.split("il y a")[1].split("jour")[0].strip())
-            except Exception:
-                return None
-        if "heure" in s:
+    etat = lire_instantane(INSTANTANE, empreinte) if INSTANTANE else None
+    if etat is not None:
+        source = os.path.basename(INSTANTANE)
+        etat = deriver({**etat, "path": path, "empreinte": empreinte})
+    else:
+        # Colonnes de classification.py (Ville_propre, Contrat_propre,
+        # Domaine_metier, niveau_salaire, pred_tres_demande, score_salaire...)
+        # ou de l'ancien format [file:3] : voir table_offres.py
+        etat = construire_donnees(ML_BASE)
+        source = os.path.basename(path)
+        etat = deriver({**etat, "path": path, "empreinte": empreinte})
+        if INSTANTANE and structure in (None, etat["structure"]):
+            debut = time.perf_counter()
             try:
-                h = float(s.split("il y a")[1].split("heure")[0].strip())
-                return h / 24.0
-            except Exception:
-                return None
-    return None
+                ecrire_instantane(etat, INSTANTANE, empreinte)
+                etat["demarrage"].append(("écriture", "instantané", time.perf_counter() - debut))
+            except OSError as e:
+                print(f"⚠️ Instantané du dashboard non écrit : {e}")
+    print(rapport_demarrage(etat["demarrage"], source, etat.get("construction")))
+
+    return etat
+
+
+# ========================================
+# DONNÉES DÉRIVÉES ET RECHARGEMENT
+# Tout ce qui se déduit des offres est recalculé ici, à chaque chargement.
+# La structure (colonnes Pays et experience_level, filtres avec recherche,
+# mode navigateur selon CLIENT_MAX) fixe les callbacks enregistrés au
+# démarrage : un rechargement qui la changerait est refusé, il faut alors
+# redémarrer le dashboard.
+# ========================================
+def options_initiales(etat: dict, dim: str) -> list:
+    """
+    La page ne contient que les LIMITE_OPTIONS valeurs les plus fréquentes de
+    chaque filtre (toutes s'il y en a moins) ; au-delà, les options suivent la
+    saisie grâce à l'index de préfixes (voir RECHERCHE DANS LES FILTRES).
+    """
+    index = etat["options"].get(dim)
+    return options(index.chercher()) if index is not None else []
+
+
+def deriver(etat: dict) -> dict:
+    has_pays = "Pays" in etat["df"].columns
+    has_experience = "experience_level" in etat["df"].columns
+    recherche = tuple(dim for dim in FILTRES_OPTIONS.values()
+                      if len(etat["options"].get(dim, [])) > LIMITE_OPTIONS)
+    return {
+        **etat,
+        "structure": {"has_pays": has_pays, "has_experience": has_experience, "recherche": recherche,
+                      "mode_client": 0 < len(etat["df"]) <= CLIENT_MAX},
+        "niveaux_salaire": frozenset(etat["df"]["niveau_salaire"].dropna().unique().tolist()),
+        "options_initiales": {dim: options_initiales(etat, dim) for dim in FILTRES_OPTIONS.values()},
+    }
+
+
+donnees = charger_donnees()
+_verrou_donnees = threading.Lock()
+_empreinte_refusee = None
 
-df["jours_depuis"] = df["Date"].apply(extraire_jours)
-df["jours_depuis"] = pd.to_numeric(df["jours_depuis"], errors="coerce")
-max_jours = df["jours_depuis"].max() if pd.notnull(df["jours_depuis"].max()) else 0.0
-df["jours_depuis"] = df["jours_depuis"].fillna(max_jours)
+cache_rendus = CacheRendus(taille=CACHE_TAILLE, dossier=CACHE_DIR)
+cache_rendus.lier(donnees["empreinte"])
+
+# Fixés au démarrage : les callbacks enregistrés ne changent plus ensuite
+STRUCTURE = donnees["structure"]
+HAS_PAYS = STRUCTURE["has_pays"]
+HAS_EXPERIENCE = STRUCTURE["has_experience"]
+MODE_CLIENT = STRUCTURE["mode_client"]
+
+
+def donnees_a_jour() -> dict:
+    """
+    Données courantes, rechargées si le fichier a changé depuis la lecture,
+    sauf si les nouvelles offres changent la structure du dashboard.
+    """
+    global donnees, _empreinte_refusee
+    try:
+        empreinte = empreinte_fichier(donnees["path"])
+    except OSError:
+        return donnees
+    if empreinte not in (donnees["empreinte"], _empreinte_refusee):
+        with _verrou_donnees:
+            if empreinte not in (donnees["empreinte"], _empreinte_refusee):
+                nouvelles = charger_donnees(STRUCTURE)
+                if nouvelles["structure"] == STRUCTURE:
+                    donnees = nouvelles
+                else:
+                    _empreinte_refusee = nouvelles["empreinte"]
+                    print(f"⚠️ Données non rechargées : structure {nouvelles['structure']} "
+                          f"au lieu de {STRUCTURE}, redémarrer le dashboard")
+    return donnees
 
 # ========================================
 # PALETTE & STYLES
@@ -104,21 +204,17 @@ SIDEBAR_CARD = {
     'padding': '16px',
 }
 
-# ========================================
-# OPTIONS FILTRES
-# ========================================
-pays_options = [{"label": p, "value": p} for p in sorted(df["Pays"].dropna().unique())] if HAS_PAYS else []
-villes_options = [{"label": v, "value": v} for v in sorted(df["Ville_propre"].dropna().unique())]
-contrats_options = [{"label": c, "value": c} for c in sorted(df["Contrat_propre"].dropna().unique())]
-domaines_options = [{"label": d, "value": d} for d in sorted(df["Domaine_metier"].dropna().unique())]
-salaire_options = [{"label": s, "value": s} for s in sorted(df["niveau_salaire"].dropna().unique())]
-
 # ========================================
 # APP
 # ========================================
 app = Dash(__name__)
 server = app.server   # juste après la création de app
 
+
+@server.route("/cache/stats")
+def stats_cache():
+    return jsonify(cache_rendus.stats())
+
 def create_filter_section(title, filter_id, options, placeholder, multi=True):
     return html.Div([
         html.Label(
@@ -143,371 +239,402 @@ def create_filter_section(title, filter_id, options, placeholder, multi=True):
         ),
     ])
 
-sidebar = html.Div(
-    style=SIDEBAR_WRAPPER,
-    children=[
+def creer_sidebar(etat: dict) -> html.Div:
+    """Barre latérale ; options des filtres tirées des données courantes."""
+    options_filtres = etat["options_initiales"]
+    return html.Div(
+        style=SIDEBAR_WRAPPER,
+        children=[
+            html.Div(
+                style=SIDEBAR_CARD,
+                children=[
+                    html.H2(
+                        "BI Jobs Dashboard",
+                        style={
+                            'color': COLORS['primary'],
+                            'fontSize': '18px',
+                            'fontWeight': '700',
+                            'marginBottom': '4px',
+                        }
+                    ),
+                    html.P(
+                        "Vue globale des offres Hellowork.",
+                        style={
+                            'color': COLORS['gray_600'],
+                            'fontSize': '12px',
+                            'marginBottom': '14px',
+                        }
+                    ),
+                    html.H3(
+                        "Géographie",
+                        style={'fontSize': '13px', 'fontWeight': '600',
+                               'color': COLORS['gray_900'], 'marginBottom': '6px'}
+                    ),
+                    create_filter_section("Pays", "filter-pays", options_filtres["Pays"], "Tous les pays") if HAS_PAYS else html.Div(),
+                    create_filter_section("Ville", "filter-ville", options_filtres["Ville_propre"], "Toutes les villes"),
+
+                    html.H3(
+                        "Profil d’emploi",
+                        style={'fontSize': '13px', 'fontWeight': '600',
+                               'color': COLORS['gray_900'], 'marginBottom': '6px', 'marginTop': '4px'}
+                    ),
+                    create_filter_section("Type de contrat", "filter-contrat", options_filtres["Contrat_propre"], "Tous les contrats"),
+                    create_filter_section("Domaine métier", "filter-domaine", options_filtres["Domaine_metier"], "Tous les domaines"),
+                    create_filter_section("Niveau de salaire", "filter-salaire", options_filtres["niveau_salaire"], "Tous les niveaux"),
+
+                    html.H3(
+                        "Options",
+                        style={'fontSize': '13px', 'fontWeight': '600',
+                               'color': COLORS['gray_900'], 'marginBottom': '6px', 'marginTop': '4px'}
+                    ),
+                    dcc.Checklist(
+                        id="filter-tres-demande",
+                        options=[{"label": "Métiers très demandés uniquement", "value": 1}],
+                        value=[],
+                        style={'fontSize': '12px', 'color': COLORS['gray_700']},
+                        inputStyle={'marginRight': '6px'},
+                    ),
+
+                    html.Button(
+                        "Réinitialiser les filtres",
+                        id="btn-reset",
+                        n_clicks=0,
+                        style={
+                            'width': '100%',
+                            'padding': '9px 12px',
+                            'backgroundColor': COLORS['primary'],
+                            'color': 'white',
+                            'border': 'none',
+                            'borderRadius': '999px',
+                            'fontSize': '13px',
+                            'fontWeight': '600',
+                            'cursor': 'pointer',
+                            'marginTop': '10px',
+                            'boxShadow': '0 4px 8px rgba(30,64,175,0.35)',
+                        }
+                    ),
+                ]
+            )
+        ]
+    )
+
+
+def creer_layout() -> html.Div:
+    """Page construite à chaque chargement, sur les données courantes."""
+    etat = donnees_a_jour()
+    return html.Div([
+        # Forme canonique des filtres actifs, lue par tous les graphiques
+        dcc.Store(id="selection-filtres"),
+        # Mode navigateur : colonnes compactes envoyées une fois, au chargement de la page
+        *([dcc.Location(id="page"), dcc.Store(id="offres-client")] if MODE_CLIENT else []),
+        creer_sidebar(etat),
         html.Div(
-            style=SIDEBAR_CARD,
+            style={
+                'marginLeft': '352px',
+                'padding': '20px',
+                'backgroundColor': COLORS['gray_50'],
+                'minHeight': '100vh',
+            },
             children=[
-                html.H2(
-                    "BI Jobs Dashboard",
+                # HEADER
+                html.Div(
+                    style={**CARD_STYLE, 'marginBottom': '20px'},
+                    children=[
+                        html.Div(
+                            "Tableau de bord – Offres d’emploi",
+                            style={
+                                'fontSize': '12px',
+                                'letterSpacing': '0.08em',
+                                'textTransform': 'uppercase',
+                                'color': COLORS['gray_600'],
+                                'marginBottom': '4px',
+                            }
+                        ),
+                        html.H1(
+                            "Analyse intelligente du marché Hellowork",
+                            style={
+                                'color': COLORS['primary'],
+                                'fontSize': '24px',
+                                'fontWeight': '700',
+                                'marginBottom': '4px',
+                            }
+                        ),
+                        html.P(
+                            "Visualisation des offres par pays, domaines, salaires, expérience et types de contrat.",
+                            style={'color': COLORS['gray_600'], 'fontSize': '13px', 'margin': '0'}
+                        ),
+                    ]
+                ),
+
+                # KPI CARDS
+                html.Div(
+                    id="kpi-cards",
                     style={
-                        'color': COLORS['primary'],
-                        'fontSize': '18px',
-                        'fontWeight': '700',
-                        'marginBottom': '4px',
+                        'display': 'grid',
+                        'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))',
+                        'gap': '14px',
+                        'marginBottom': '18px',
                     }
                 ),
-                html.P(
-                    "Vue globale des offres Hellowork.",
+
+                # LIGNES GRAPHIQUES (même structure que ton code précédent)
+                html.Div(
                     style={
-                        'color': COLORS['gray_600'],
-                        'fontSize': '12px',
-                        'marginBottom': '14px',
-                    }
+                        'display': 'grid',
+                        'gridTemplateColumns': '2fr 1fr',
+                        'gap': '16px',
+                        'marginBottom': '16px',
+                    },
+                    children=[
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Top 10 domaines de métiers",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                html.P(
+                                    "Part relative des principaux domaines dans le volume total d’offres.",
+                                    style={'fontSize': '12px', 'color': COLORS['gray_600'],
+                                           'marginBottom': '10px'}
+                                ),
+                                dcc.Graph(id="graph-top-domaines", style={'height': '360px'}),
+                            ]
+                        ),
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Répartition des niveaux de salaire",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-salaire-funnel", style={'height': '360px'}),
+                            ]
+                        ),
+                    ]
                 ),
-                html.H3(
-                    "Géographie",
-                    style={'fontSize': '13px', 'fontWeight': '600',
-                           'color': COLORS['gray_900'], 'marginBottom': '6px'}
+
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': '2fr 1fr',
+                        'gap': '16px',
+                        'marginBottom': '16px',
+                    },
+                    children=[
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Offres par pays",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-offres-pays", style={'height': '340px'}),
+                            ]
+                        ),
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Répartition des catégories de métiers",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-categories-pie", style={'height': '340px'}),
+                            ]
+                        ),
+                    ]
                 ),
-                create_filter_section("Pays", "filter-pays", pays_options, "Tous les pays") if HAS_PAYS else html.Div(),
-                create_filter_section("Ville", "filter-ville", villes_options, "Toutes les villes"),
 
-                html.H3(
-                    "Profil d’emploi",
-                    style={'fontSize': '13px', 'fontWeight': '600',
-                           'color': COLORS['gray_900'], 'marginBottom': '6px', 'marginTop': '4px'}
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': '1fr 1fr',
+                        'gap': '16px',
+                        'marginBottom': '16px',
+                    },
+                    children=[
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Salaire moyen par pays",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-salaire-pays", style={'height': '320px'}),
+                            ]
+                        ),
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Offres publiées dans le temps",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-offres-temps", style={'height': '320px'}),
+                            ]
+                        ),
+                    ]
                 ),
-                create_filter_section("Type de contrat", "filter-contrat", contrats_options, "Tous les contrats"),
-                create_filter_section("Domaine métier", "filter-domaine", domaines_options, "Tous les domaines"),
-                create_filter_section("Niveau de salaire", "filter-salaire", salaire_options, "Tous les niveaux"),
-
-                html.H3(
-                    "Options",
-                    style={'fontSize': '13px', 'fontWeight': '600',
-                           'color': COLORS['gray_900'], 'marginBottom': '6px', 'marginTop': '4px'}
+
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': '1fr 1fr',
+                        'gap': '16px',
+                        'marginBottom': '16px',
+                    },
+                    children=[
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Répartition des niveaux d’expérience",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-experience-donut", style={'height': '320px'}),
+                            ]
+                        ),
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Salaire selon l’expérience",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-salaire-experience", style={'height': '320px'}),
+                            ]
+                        ),
+                    ]
                 ),
-                dcc.Checklist(
-                    id="filter-tres-demande",
-                    options=[{"label": "Métiers très demandés uniquement", "value": 1}],
-                    value=[],
-                    style={'fontSize': '12px', 'color': COLORS['gray_700']},
-                    inputStyle={'marginRight': '6px'},
+
+                html.Div(
+                    style={
+                        'display': 'grid',
+                        'gridTemplateColumns': '1fr 1fr',
+                        'gap': '16px',
+                        'marginBottom': '16px',
+                    },
+                    children=[
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Top 10 villes en nombre d’offres",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-villes", style={'height': '320px'}),
+                            ]
+                        ),
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Répartition des types de contrat",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-contrats-pie", style={'height': '320px'}),
+                            ]
+                        ),
+                    ]
                 ),
 
-                html.Button(
-                    "Réinitialiser les filtres",
-                    id="btn-reset",
-                    n_clicks=0,
+                html.Div(
                     style={
-                        'width': '100%',
-                        'padding': '9px 12px',
-                        'backgroundColor': COLORS['primary'],
-                        'color': 'white',
-                        'border': 'none',
-                        'borderRadius': '999px',
-                        'fontSize': '13px',
-                        'fontWeight': '600',
-                        'cursor': 'pointer',
-                        'marginTop': '10px',
-                        'boxShadow': '0 4px 8px rgba(30,64,175,0.35)',
-                    }
+                        'display': 'grid',
+                        'gridTemplateColumns': '1.4fr 0.8fr',
+                        'gap': '16px',
+                    },
+                    children=[
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Niveaux de salaire par pays",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-salaire-pays-stacked", style={'height': '320px'}),
+                            ]
+                        ),
+                        html.Div(
+                            style=CARD_STYLE,
+                            children=[
+                                html.H3(
+                                    "Part des métiers très demandés",
+                                    style={'fontSize': '14px', 'fontWeight': '600',
+                                           'marginBottom': '6px', 'color': COLORS['gray_900']}
+                                ),
+                                dcc.Graph(id="graph-gauge-demande", style={'height': '320px'}),
+                            ]
+                        ),
+                    ]
                 ),
             ]
         )
-    ]
-)
+    ])
 
-app.layout = html.Div([
-    sidebar,
-    html.Div(
-        style={
-            'marginLeft': '352px',
-            'padding': '20px',
-            'backgroundColor': COLORS['gray_50'],
-            'minHeight': '100vh',
-        },
-        children=[
-            # HEADER
-            html.Div(
-                style={**CARD_STYLE, 'marginBottom': '20px'},
-                children=[
-                    html.Div(
-                        "Tableau de bord – Offres d’emploi",
-                        style={
-                            'fontSize': '12px',
-                            'letterSpacing': '0.08em',
-                            'textTransform': 'uppercase',
-                            'color': COLORS['gray_600'],
-                            'marginBottom': '4px',
-                        }
-                    ),
-                    html.H1(
-                        "Analyse intelligente du marché Hellowork",
-                        style={
-                            'color': COLORS['primary'],
-                            'fontSize': '24px',
-                            'fontWeight': '700',
-                            'marginBottom': '4px',
-                        }
-                    ),
-                    html.P(
-                        "Visualisation des offres par pays, domaines, salaires, expérience et types de contrat.",
-                        style={'color': COLORS['gray_600'], 'fontSize': '13px', 'margin': '0'}
-                    ),
-                ]
-            ),
 
-            # KPI CARDS
-            html.Div(
-                id="kpi-cards",
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': 'repeat(auto-fit, minmax(200px, 1fr))',
-                    'gap': '14px',
-                    'marginBottom': '18px',
-                }
-            ),
-
-            # LIGNES GRAPHIQUES (même structure que ton code précédent)
-            html.Div(
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': '2fr 1fr',
-                    'gap': '16px',
-                    'marginBottom': '16px',
-                },
-                children=[
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Top 10 domaines de métiers",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            html.P(
-                                "Part relative des principaux domaines dans le volume total d’offres.",
-                                style={'fontSize': '12px', 'color': COLORS['gray_600'],
-                                       'marginBottom': '10px'}
-                            ),
-                            dcc.Graph(id="graph-top-domaines", style={'height': '360px'}),
-                        ]
-                    ),
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Répartition des niveaux de salaire",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-salaire-funnel", style={'height': '360px'}),
-                        ]
-                    ),
-                ]
-            ),
+app.layout = creer_layout
 
-            html.Div(
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': '2fr 1fr',
-                    'gap': '16px',
-                    'marginBottom': '16px',
-                },
-                children=[
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Offres par pays",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-offres-pays", style={'height': '340px'}),
-                        ]
-                    ),
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Répartition des catégories de métiers",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-categories-pie", style={'height': '340px'}),
-                        ]
-                    ),
-                ]
-            ),
 
-            html.Div(
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': '1fr 1fr',
-                    'gap': '16px',
-                    'marginBottom': '16px',
-                },
-                children=[
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Salaire moyen par pays",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-salaire-pays", style={'height': '320px'}),
-                        ]
-                    ),
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Offres publiées dans le temps",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-offres-temps", style={'height': '320px'}),
-                        ]
-                    ),
-                ]
-            ),
+# ========================================
+# RECHERCHE DANS LES FILTRES
+# Seulement pour les dropdowns qui ont plus de LIMITE_OPTIONS valeurs : les
+# autres ont déjà toutes leurs options dans la page.
+# ========================================
+def enregistrer_recherche(composant: str, dim: str):
+    @app.callback(Output(composant, "options"), Input(composant, "search_value"),
+                  State(composant, "value"), prevent_initial_call=True)
+    def chercher_options(recherche, choisies):
+        index = donnees_a_jour()["options"].get(dim)
+        valeurs = index.chercher(recherche) if index is not None else []
+        # Les valeurs déjà choisies restent dans les options, sinon le dropdown les retire
+        valeurs += [v for v in choisies or [] if v not in valeurs]
+        return options(valeurs)
 
-            html.Div(
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': '1fr 1fr',
-                    'gap': '16px',
-                    'marginBottom': '16px',
-                },
-                children=[
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Répartition des niveaux d’expérience",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-experience-donut", style={'height': '320px'}),
-                        ]
-                    ),
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Salaire selon l’expérience",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-salaire-experience", style={'height': '320px'}),
-                        ]
-                    ),
-                ]
-            ),
 
-            html.Div(
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': '1fr 1fr',
-                    'gap': '16px',
-                    'marginBottom': '16px',
-                },
-                children=[
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Top 10 villes en nombre d’offres",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-villes", style={'height': '320px'}),
-                        ]
-                    ),
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Répartition des types de contrat",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-contrats-pie", style={'height': '320px'}),
-                        ]
-                    ),
-                ]
-            ),
+for _composant, _dim in FILTRES_OPTIONS.items():
+    if _dim in STRUCTURE["recherche"]:
+        enregistrer_recherche(_composant, _dim)
 
-            html.Div(
-                style={
-                    'display': 'grid',
-                    'gridTemplateColumns': '1.4fr 0.8fr',
-                    'gap': '16px',
-                },
-                children=[
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Niveaux de salaire par pays",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-salaire-pays-stacked", style={'height': '320px'}),
-                        ]
-                    ),
-                    html.Div(
-                        style=CARD_STYLE,
-                        children=[
-                            html.H3(
-                                "Part des métiers très demandés",
-                                style={'fontSize': '14px', 'fontWeight': '600',
-                                       'marginBottom': '6px', 'color': COLORS['gray_900']}
-                            ),
-                            dcc.Graph(id="graph-gauge-demande", style={'height': '320px'}),
-                        ]
-                    ),
-                ]
-            ),
-        ]
-    )
-])
 
 # ========================================
-# CALLBACK
+# SÉLECTION PARTAGÉE
+# Un seul callback lit les filtres et publie leur forme canonique dans le
+# Store "selection-filtres" ; rien n'est publié si elle n'a pas changé.
+# Chaque graphique a ensuite son propre callback sur ce Store : les
+# cellules du cube retenues sont calculées une fois par interaction et
+# partagées entre les graphiques.
 # ========================================
-@app.callback(
-    [
-        Output("kpi-cards", "children"),
-        Output("graph-top-domaines", "figure"),
-        Output("graph-salaire-funnel", "figure"),
-        Output("graph-offres-pays", "figure"),
-        Output("graph-categories-pie", "figure"),
-        Output("graph-salaire-pays", "figure"),
-        Output("graph-offres-temps", "figure"),
-        Output("graph-experience-donut", "figure"),
-        Output("graph-salaire-experience", "figure"),
-        Output("graph-villes", "figure"),
-        Output("graph-contrats-pie", "figure"),
-        Output("graph-salaire-pays-stacked", "figure"),
-        Output("graph-gauge-demande", "figure"),
-    ],
-    [
-        Input("filter-ville", "value"),
-        Input("filter-contrat", "value"),
-        Input("filter-domaine", "value"),
-        Input("filter-pays", "value") if HAS_PAYS else Input("filter-contrat", "value"),
-        Input("filter-salaire", "value"),
-        Input("filter-tres-demande", "value"),
-        Input("btn-reset", "n_clicks"),
-    ]
-)
-def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_demande, n_reset):
-    pays = pays_or_dummy if HAS_PAYS else None
+# Niveaux de salaire de l'ancien format [file:3] ; ceux de classification.py
+# viennent des règles (config/settings.yaml, voir ordre_salaires)
+ORDRE_SALAIRES_ANCIEN = ["Très_Faible", "Faible", "Moyen", "Élevé", "Très_Élevé"]
+COULEURS_SALAIRES = ['#F97373', '#FDBA74', '#60A5FA', '#4F46E5', '#22C55E']
 
+
+def ordre_salaires(etat: dict) -> list:
+    """
+    Niveaux de salaire présents dans les offres, dans l'ordre des labels des
+    règles (relues à chaud : les renommer ne demande pas de redémarrer) ou
+    dans celui de l'ancien format, selon celui qui en couvre le plus ; les
+    niveaux inconnus viennent ensuite.
+    """
+    presents = etat["niveaux_salaire"]
+    ordre = max([charger_regles().niveaux_labels, ORDRE_SALAIRES_ANCIEN], key=lambda o: len(presents & set(o)))
+    return [n for n in ordre if n in presents] + sorted(presents - set(ordre))
+
+
+def filtres_actifs(villes, contrats, domaines, pays, salaires, tres_demande, n_reset) -> dict:
     # Reset : on ignore les filtres quand on clique
     if n_reset:
         villes = None
@@ -515,31 +642,104 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         domaines = None
         salaires = None
         tres_demande = []
-        if HAS_PAYS:
-            pays = None
-
-    dff = df.copy()
-    if villes:
-        dff = dff[dff["Ville_propre"].isin(villes)]
-    if contrats:
-        dff = dff[dff["Contrat_propre"].isin(contrats)]
-    if domaines:
-        dff = dff[dff["Domaine_metier"].isin(domaines)]
-    if HAS_PAYS and pays:
-        dff = dff[dff["Pays"].isin(pays)]
-    if salaires:
-        dff = dff[dff["niveau_salaire"].isin(salaires)]
-    if tres_demande and 1 in tres_demande:
-        dff = dff[dff["pred_tres_demande"] == 1]
+        pays = None
+
+    return {
+        "Ville_propre": villes,
+        "Contrat_propre": contrats,
+        "Domaine_metier": domaines,
+        "Pays": pays if HAS_PAYS else None,
+        "niveau_salaire": salaires,
+        "pred_tres_demande": [1] if tres_demande and 1 in tres_demande else None,
+    }
+
+
+class Selection:
+    """Filtres actifs et cellules du cube retenues, communs à tous les graphiques."""
+
+    def __init__(self, filtres: dict, etat: dict):
+        self.filtres = filtres
+        self.etat = etat
+        self.cellules = etat["cubes"]["filtres"].selection(filtres)
+        self._cubes = {}
+
+    def cube(self, nom: str):
+        if nom not in self._cubes:
+            self._cubes[nom] = self.etat["cubes"][nom].selection(self.filtres)
+        return self._cubes[nom]
+
+    def lignes(self, colonnes: list) -> pd.DataFrame:
+        lignes = self.etat["index_filtres"].lignes(self.filtres)
+        dff = self.etat["df"][colonnes]
+        return dff if lignes is None else dff.take(lignes)
+
+    def taux_demande(self) -> float:
+        return cube.part(self.cellules, "pred_tres_demande", 1) * 100 if cube.total(self.cellules) > 0 else 0.0
+
+    def domaines_hors_autre(self) -> pd.Series:
+        # Comptage sur les codes, puis filtrage des libellés "Autre" (domaine manquant -> "")
+        domaines_count = cube.compter(self.cellules, "Domaine_metier", dropna=False)
+        domaines_count.index = pd.Index(domaines_count.index.astype(object)).fillna("")
+        return domaines_count[~domaines_count.index.str.lower().str.contains("autre", na=False)]
+
+
+_selections = OrderedDict()  # (empreinte, clé) -> Selection
+_verrou_selections = threading.Lock()
+
+
+def selection_partagee(cle: tuple, etat: dict) -> Selection:
+    with _verrou_selections:
+        s = _selections.get((etat["empreinte"], cle))
+        if s is None:
+            s = Selection(dict(cle), etat)
+            _selections[(etat["empreinte"], cle)] = s
+            while len(_selections) > 32:
+                _selections.popitem(last=False)
+        return s
+
+
+ENTREES_FILTRES = [
+    Input("filter-ville", "value"),
+    Input("filter-contrat", "value"),
+    Input("filter-domaine", "value"),
+    Input("filter-pays", "value") if HAS_PAYS else Input("filter-contrat", "value"),
+    Input("filter-salaire", "value"),
+    Input("filter-tres-demande", "value"),
+    Input("btn-reset", "n_clicks"),
+]
+
+
+def maj_selection(villes, contrats, domaines, pays_or_dummy, salaires, tres_demande, n_reset, precedente):
+    pays = pays_or_dummy if HAS_PAYS else None
+    cle = cle_filtres(filtres_actifs(villes, contrats, domaines, pays, salaires, tres_demande, n_reset))
+    selection = {dim: list(valeurs) for dim, valeurs in cle}
+    return no_update if selection == precedente else selection
 
+
+if MODE_CLIENT:
+    # Même forme canonique calculée par assets/filtres_client.js (sans la
+    # colonne Pays, le filtre factice est ignoré par le navigateur)
+    app.clientside_callback(ClientsideFunction("offres", "selection"),
+                            Output("selection-filtres", "data"), ENTREES_FILTRES,
+                            State("selection-filtres", "data"))
+else:
+    app.callback(Output("selection-filtres", "data"), ENTREES_FILTRES,
+                 State("selection-filtres", "data"))(maj_selection)
+
+
+# ========================================
+# GRAPHIQUES
+# ========================================
+def rendre_kpi(s):
     # KPI
-    total_offres = len(dff)
-    taux_demande = (dff["pred_tres_demande"] == 1).mean() * 100 if total_offres > 0 else 0.0
+    sel = s.cellules
+    total_offres = cube.total(sel)
+    taux_demande = s.taux_demande()
 
     kpi_data = [
         ("Total d’offres", f"{total_offres:,}".replace(",", " "), COLORS['light_blue'], COLORS['primary']),
-        ("Pays couverts", f"{dff['Pays'].nunique() if HAS_PAYS else 1}", COLORS['light_green'], COLORS['success']),
-        ("Domaines distincts", f"{dff['Domaine_metier'].nunique()}", COLORS['light_blue'], COLORS['accent']),
+        ("Pays couverts", f"{cube.nunique(sel, 'Pays') if HAS_PAYS else 1}", COLORS['light_green'], COLORS['success']),
+        ("Domaines distincts", f"{cube.nunique(sel, 'Domaine_metier')}", COLORS['light_blue'], COLORS['accent']),
         ("Offres très demandées", f"{taux_demande:.1f}%", COLORS['light_orange'], COLORS['warning']),
     ]
 
@@ -570,12 +770,12 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
             )
         )
 
-    # 1) Top 10 domaines (en %)
-    series_dom = dff["Domaine_metier"].fillna("")
-    masque_autre = ~series_dom.str.lower().str.contains("autre", na=False)
-    domaines_filtre = series_dom[masque_autre]
+    return kpi_cards
+
 
-    domaines_count = domaines_filtre.value_counts()
+def figure_top_domaines(s):
+    # 1) Top 10 domaines (en %)
+    domaines_count = s.domaines_hors_autre()
     total_dom = domaines_count.sum()
     if total_dom > 0:
         domaines_pct = (domaines_count / total_dom * 100).head(10)
@@ -601,14 +801,18 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         paper_bgcolor='white',
     )
 
+    return fig_top_domaines
+
+
+def figure_salaire_funnel(s):
     # 2) Niveaux de salaires (funnel)
-    ordre_salaires = ["Très_Faible", "Faible", "Moyen", "Élevé", "Très_Élevé"]
-    sal_counts = dff["niveau_salaire"].value_counts().reindex(ordre_salaires, fill_value=0)
+    ordre = ordre_salaires(s.etat)
+    sal_counts = cube.compter(s.cellules, "niveau_salaire").reindex(ordre, fill_value=0)
     fig_salaire_funnel = go.Figure(go.Funnel(
-        y=ordre_salaires,
+        y=ordre,
         x=sal_counts.values,
         textinfo="value+percent initial",
-        marker=dict(color=['#F97373', '#FDBA74', '#60A5FA', '#4F46E5', '#22C55E'])
+        marker=dict(color=[COULEURS_SALAIRES[i % len(COULEURS_SALAIRES)] for i in range(len(ordre))])
     ))
     fig_salaire_funnel.update_layout(
         margin=dict(l=20, r=20, t=10, b=10),
@@ -616,9 +820,13 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
+    return fig_salaire_funnel
+
+
+def figure_offres_pays(s):
     # 3) Offres par pays
     if HAS_PAYS:
-        pays_count = dff["Pays"].value_counts()
+        pays_count = cube.compter(s.cellules, "Pays")
         fig_offres_pays = go.Figure(go.Bar(
             x=pays_count.index,
             y=pays_count.values,
@@ -635,8 +843,12 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
     else:
         fig_offres_pays = go.Figure()
 
+    return fig_offres_pays
+
+
+def figure_categories_pie(s):
     # 4) Répartition des catégories (pie)
-    cat_counts = domaines_filtre.value_counts()
+    cat_counts = s.domaines_hors_autre()
     if cat_counts.empty:
         cat_counts = pd.Series([1], index=["Aucun domaine"])
     fig_categories_pie = go.Figure(go.Pie(
@@ -652,9 +864,13 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
+    return fig_categories_pie
+
+
+def figure_salaire_pays(s):
     # 5) Salaire moyen par pays
     if HAS_PAYS:
-        salaire_pays = dff.groupby("Pays")["salary_score"].mean().sort_values()
+        salaire_pays = cube.moyenne_par(s.cellules, "Pays").sort_values()
         fig_salaire_pays = go.Figure(go.Bar(
             x=salaire_pays.values,
             y=salaire_pays.index,
@@ -671,10 +887,14 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
     else:
         fig_salaire_pays = go.Figure()
 
+    return fig_salaire_pays
+
+
+def figure_offres_temps(s):
     # 6) Offres dans le temps
-    temps_data = dff.groupby("jours_depuis")["Titre"].count().reset_index()
+    temps_data = cube.taille_par(s.cube("temps"), "jours_depuis").rename("n").reset_index()
     temps_data = temps_data.sort_values("jours_depuis", ascending=True)
-    temps_data["cumul"] = temps_data["Titre"].cumsum()
+    temps_data["cumul"] = temps_data["n"].cumsum()
     fig_offres_temps = go.Figure(go.Scatter(
         x=temps_data["jours_depuis"],
         y=temps_data["cumul"],
@@ -690,8 +910,14 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
-    # 7) Expérience (donut)
-    exp_counts = dff["experience_level"].value_counts()
+    return fig_offres_temps
+
+
+def figure_experience_donut(s):
+    # 7) Expérience (donut) ; classification.py ne produit pas experience_level
+    if not HAS_EXPERIENCE:
+        return go.Figure()
+    exp_counts = cube.compter(s.cube("experience"), "experience_level")
     fig_experience_donut = go.Figure(go.Pie(
         labels=exp_counts.index,
         values=exp_counts.values,
@@ -705,7 +931,15 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
-    # 8) Salaire vs expérience (box)
+    return fig_experience_donut
+
+
+def figure_salaire_experience(s):
+    # 8) Salaire vs expérience (box) : seul graphique qui a besoin des offres elles-mêmes
+    if not HAS_EXPERIENCE:
+        return go.Figure()
+    exp_counts = cube.compter(s.cube("experience"), "experience_level")
+    dff = s.lignes(["experience_level", "salary_score"])
     fig_salaire_experience = go.Figure()
     for lvl, col in zip(exp_counts.index, CATEGORICAL):
         fig_salaire_experience.add_trace(go.Box(
@@ -724,8 +958,12 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
+    return fig_salaire_experience
+
+
+def figure_villes(s):
     # 9) Top 10 villes
-    villes_count = dff["Ville_propre"].value_counts().head(10)
+    villes_count = cube.compter(s.cellules, "Ville_propre").head(10)
     fig_villes = go.Figure(go.Bar(
         x=villes_count.index,
         y=villes_count.values,
@@ -740,8 +978,12 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
+    return fig_villes
+
+
+def figure_contrats_pie(s):
     # 10) Types de contrat
-    contrats_count = dff["Contrat_propre"].value_counts()
+    contrats_count = cube.compter(s.cellules, "Contrat_propre")
     fig_contrats_pie = go.Figure(go.Pie(
         labels=contrats_count.index,
         values=contrats_count.values,
@@ -755,12 +997,16 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
+    return fig_contrats_pie
+
+
+def figure_salaire_pays_stacked(s):
     # 11) Niveaux de salaire par pays (stacked)
     if HAS_PAYS:
-        salaire_pays_stack = dff.groupby(["Pays", "niveau_salaire"])["Titre"].count().reset_index()
+        salaire_pays_stack = cube.taille_par(s.cellules, ["Pays", "niveau_salaire"]).rename("n").reset_index()
         salaire_pays_stack = salaire_pays_stack.pivot(index="Pays", columns="niveau_salaire",
-                                                      values="Titre").fillna(0)
-        salaire_pays_stack = salaire_pays_stack.reindex(columns=ordre_salaires).fillna(0)
+                                                      values="n").fillna(0)
+        salaire_pays_stack = salaire_pays_stack.reindex(columns=ordre_salaires(s.etat)).fillna(0)
 
         fig_salaire_pays_stacked = go.Figure()
         for i, lvl in enumerate(salaire_pays_stack.columns):
@@ -782,10 +1028,14 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
     else:
         fig_salaire_pays_stacked = go.Figure()
 
+    return fig_salaire_pays_stacked
+
+
+def figure_gauge(s):
     # 12) Gauge
     fig_gauge = go.Figure(go.Indicator(
         mode="gauge+number",
-        value=taux_demande,
+        value=s.taux_demande(),
         title={'text': "Offres très demandées (%)"},
         gauge={
             'axis': {'range': [0, 100]},
@@ -803,22 +1053,103 @@ def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_d
         plot_bgcolor='white',
     )
 
-    return (
-        kpi_cards,
-        fig_top_domaines,
-        fig_salaire_funnel,
-        fig_offres_pays,
-        fig_categories_pie,
-        fig_salaire_pays,
-        fig_offres_temps,
-        fig_experience_donut,
-        fig_salaire_experience,
-        fig_villes,
-        fig_contrats_pie,
-        fig_salaire_pays_stacked,
-        fig_gauge,
-    )
+    return fig_gauge
+
+
+# Composant -> (propriété, fonction de rendu)
+GRAPHIQUES = {
+    "kpi-cards": ("children", rendre_kpi),
+    "graph-top-domaines": ("figure", figure_top_domaines),
+    "graph-salaire-funnel": ("figure", figure_salaire_funnel),
+    "graph-offres-pays": ("figure", figure_offres_pays),
+    "graph-categories-pie": ("figure", figure_categories_pie),
+    "graph-salaire-pays": ("figure", figure_salaire_pays),
+    "graph-offres-temps": ("figure", figure_offres_temps),
+    "graph-experience-donut": ("figure", figure_experience_donut),
+    "graph-salaire-experience": ("figure", figure_salaire_experience),
+    "graph-villes": ("figure", figure_villes),
+    "graph-contrats-pie": ("figure", figure_contrats_pie),
+    "graph-salaire-pays-stacked": ("figure", figure_salaire_pays_stacked),
+    "graph-gauge-demande": ("figure", figure_gauge),
+}
+GRAPHIQUES_PAYS = ["graph-offres-pays", "graph-salaire-pays", "graph-salaire-pays-stacked"]
+GRAPHIQUES_EXPERIENCE = ["graph-experience-donut", "graph-salaire-experience"]
+
+
+def rendre(composant: str, selection: dict):
+    """
+    Rendu d'un composant pour une sélection publiée, mémorisé par
+    (composant, filtres, ordre des niveaux de salaire) pour la version
+    courante des données. Les figures sont gardées sous forme de dict
+    plotly : relire un go.Figure depuis le disque revaliderait chaque trace.
+    """
+    propriete, fonction = GRAPHIQUES[composant]
+    cle = cle_filtres(selection or {})
+    etat = donnees_a_jour()
+    cache_rendus.lier(etat["empreinte"])
+
+    def calculer():
+        sortie = fonction(selection_partagee(cle, etat))
+        return sortie.to_plotly_json() if propriete == "figure" else sortie
+
+    return cache_rendus.obtenir((composant, cle, tuple(ordre_salaires(etat))), calculer)
+
+
+def offres_navigateur() -> dict:
+    """
+    Données du mode navigateur pour la version courante des offres : colonnes
+    compactes, score de salaire et gabarit de chaque composant (rendu sans
+    filtre, sans ses données).
+    """
+    etat = donnees_a_jour()
+    cache_rendus.lier(etat["empreinte"])
+    ordre = ordre_salaires(etat)
+
+    def calculer():
+        return {
+            **colonnes_client(etat["df"]),
+            **gabarits({composant: rendre(composant, {}) for composant in GRAPHIQUES}),
+            "palette": CATEGORICAL,
+            "ordre_salaires": ordre,
+        }
+
+    return cache_rendus.obtenir(("offres-client", tuple(ordre)), calculer)
+
+
+def enregistrer_callback(composant: str):
+    propriete, _ = GRAPHIQUES[composant]
+
+    if MODE_CLIENT:
+        app.clientside_callback(ClientsideFunction("offres", composant), Output(composant, propriete),
+                                Input("selection-filtres", "data"), Input("offres-client", "data"))
+        return
+
+    @app.callback(Output(composant, propriete), Input("selection-filtres", "data"))
+    def maj_composant(selection):
+        return rendre(composant, selection)
+
+
+for _composant in GRAPHIQUES:
+    # Sans colonne Pays (ou experience_level), ces graphiques restent vides : pas de callback du tout
+    if ((HAS_PAYS or _composant not in GRAPHIQUES_PAYS)
+            and (HAS_EXPERIENCE or _composant not in GRAPHIQUES_EXPERIENCE)):
+        enregistrer_callback(_composant)
+
+if MODE_CLIENT:
+    # Seul aller-retour serveur du mode navigateur : un par chargement de page
+    @app.callback(Output("offres-client", "data"), Input("page", "pathname"))
+    def envoyer_offres(_):
+        return offres_navigateur()
+
+
+def update_dashboard(villes, contrats, domaines, pays_or_dummy, salaires, tres_demande, n_reset):
+    """Toutes les sorties d'une interaction, dans l'ordre de GRAPHIQUES (tests, mesures)."""
+    pays = pays_or_dummy if HAS_PAYS else None
+    cle = cle_filtres(filtres_actifs(villes, contrats, domaines, pays, salaires, tres_demande, n_reset))
+    selection = {dim: list(valeurs) for dim, valeurs in cle}
+    return tuple(rendre(composant, selection) for composant in GRAPHIQUES)
 
 
+# Serveur de développement ; en production : gunicorn -c config/gunicorn.conf.py (voir wsgi.py)
 if __name__ == "__main__":
     app.run(debug=True, port=8050)
@@ -0,0 +1,383 @@
+// ========================================
+// FILTRES ET GRAPHIQUES CÔTÉ NAVIGATEUR
+// Mode activé par app_dash.py sous DASHBOARD_CLIENT_MAX offres : le store
+// "offres-client" contient les colonnes compactes (codes + valeurs
+// distinctes), le score de salaire, un gabarit de chaque rendu serveur et
+// le thème plotly commun à toutes les figures.
+// Chaque fonction refait sur les offres retenues le calcul de cube.py et ne
+// remplace que les données du gabarit (styles définis une seule fois, en Python).
+// ========================================
+(function () {
+    "use strict";
+
+    function pasDeMaj() {
+        return window.dash_clientside.no_update;
+    }
+
+    function copie(objet) {
+        return JSON.parse(JSON.stringify(objet));
+    }
+
+    // Comme format(v, ".1f") en Python : arrondi au pair quand la valeur exacte tombe pile au milieu
+    function fixe1(v) {
+        const exact = v.toFixed(30);
+        const point = exact.indexOf(".");
+        if (/^50*$/.test(exact.slice(point + 2)) && Number(exact[point + 1]) % 2 === 0) {
+            return exact.slice(0, point + 2);
+        }
+        return v.toFixed(1);
+    }
+
+    // Comme f"{n:,}".replace(",", " ")
+    function milliers(n) {
+        return String(n).replace(/\B(?=(\d{3})+(?!\d))/g, " ");
+    }
+
+    // ---------- sélection ----------
+    // Forme canonique des filtres, comme filtres_actifs() + cle_filtres() côté serveur
+    function selection(villes, contrats, domaines, pays, salaires, tresDemande, nReset, precedente) {
+        if (nReset) {
+            villes = contrats = domaines = pays = salaires = null;
+            tresDemande = [];
+        }
+        const filtres = {
+            Ville_propre: villes,
+            Contrat_propre: contrats,
+            Domaine_metier: domaines,
+            Pays: pays,
+            niveau_salaire: salaires,
+            pred_tres_demande: tresDemande && tresDemande.indexOf(1) >= 0 ? [1] : null,
+        };
+        const canonique = {};
+        Object.keys(filtres).sort().forEach(function (dim) {
+            const valeurs = filtres[dim];
+            if (valeurs && valeurs.length) {
+                canonique[dim] = Array.from(new Set(valeurs)).sort(function (a, b) {
+                    return String(a) < String(b) ? -1 : String(a) > String(b) ? 1 : 0;
+                });
+            }
+        });
+        if (precedente && JSON.stringify(canonique) === JSON.stringify(precedente)) {
+            return pasDeMaj();
+        }
+        return canonique;
+    }
+
+    // Positions des offres retenues : OU à l'intérieur d'un filtre, ET entre filtres.
+    // Une dimension absente des données (pas de colonne Pays) est ignorée, comme dans IndexFiltres.
+    function filtrer(donnees, filtres) {
+        const actifs = [];
+        Object.keys(filtres || {}).forEach(function (dim) {
+            const colonne = donnees.colonnes[dim];
+            if (!colonne || !filtres[dim] || !filtres[dim].length) {
+                return;
+            }
+            const retenus = new Uint8Array(colonne.valeurs.length);
+            filtres[dim].forEach(function (valeur) {
+                const k = colonne.valeurs.indexOf(valeur);
+                if (k >= 0) {
+                    retenus[k] = 1;
+                }
+            });
+            actifs.push([colonne.codes, retenus]);
+        });
+
+        const positions = [];
+        for (let i = 0; i < donnees.n; i++) {
+            let garde = true;
+            for (let j = 0; j < actifs.length && garde; j++) {
+                const c = actifs[j][0][i];
+                garde = c >= 0 && actifs[j][1][c] === 1;
+            }
+            if (garde) {
+                positions.push(i);
+            }
+        }
+        return positions;
+    }
+
+    // Une interaction déclenche tous les graphiques : le filtrage n'est fait qu'une fois
+    let derniere = {donnees: null, cle: null, positions: null};
+
+    function offresRetenues(donnees, filtres) {
+        const cle = JSON.stringify(filtres || {});
+        if (derniere.donnees !== donnees || derniere.cle !== cle) {
+            derniere = {donnees: donnees, cle: cle, positions: filtrer(donnees, filtres)};
+        }
+        return derniere.positions;
+    }
+
+    // ---------- agrégats (mêmes réponses que cube.py) ----------
+    // Comptage par valeur : nombre décroissant, ex aequo par ordre de première apparition
+    function compter(donnees, positions, dim, dropna) {
+        const colonne = donnees.colonnes[dim];
+        if (!colonne) {
+            return {libelles: [], n: []};
+        }
+        const taille = colonne.valeurs.length + 1;  // 0 = valeur manquante
+        const n = new Array(taille).fill(0);
+        const premiere = new Array(taille).fill(0);
+        positions.forEach(function (i) {
+            const c = colonne.codes[i] + 1;
+            if (n[c] === 0) {
+                premiere[c] = i;
+            }
+            n[c] += 1;
+        });
+
+        const presents = [];
+        for (let c = dropna === false ? 0 : 1; c < taille; c++) {
+            if (n[c] > 0) {
+                presents.push(c);
+            }
+        }
+        presents.sort(function (a, b) {
+            return n[b] - n[a] || premiere[a] - premiere[b];
+        });
+        return {
+            libelles: presents.map(function (c) { return c === 0 ? null : colonne.valeurs[c - 1]; }),
+            n: presents.map(function (c) { return n[c]; }),
+        };
+    }
+
+    function nunique(donnees, positions, dim) {
+        const colonne = donnees.colonnes[dim];
+        const vus = new Set();
+        positions.forEach(function (i) {
+            if (colonne.codes[i] >= 0) {
+                vus.add(colonne.codes[i]);
+            }
+        });
+        return vus.size;
+    }
+
+    function tauxDemande(donnees, positions) {
+        if (!positions.length) {
+            return 0.0;
+        }
+        const codes = donnees.colonnes.pred_tres_demande;
+        const k = codes.valeurs.indexOf(1);
+        let demandes = 0;
+        positions.forEach(function (i) {
+            if (k >= 0 && codes.codes[i] === k) {
+                demandes += 1;
+            }
+        });
+        return demandes / positions.length * 100;
+    }
+
+    // Domaines (manquant -> "") sans les libellés contenant "autre"
+    function domainesHorsAutre(donnees, positions) {
+        const comptes = compter(donnees, positions, "Domaine_metier", false);
+        const resultat = {libelles: [], n: []};
+        comptes.libelles.forEach(function (libelle, j) {
+            libelle = libelle === null ? "" : String(libelle);
+            if (libelle.toLowerCase().indexOf("autre") < 0) {
+                resultat.libelles.push(libelle);
+                resultat.n.push(comptes.n[j]);
+            }
+        });
+        return resultat;
+    }
+
+    function somme(valeurs) {
+        return valeurs.reduce(function (a, b) { return a + b; }, 0);
+    }
+
+    // Gabarit du composant, dont la trace j reçoit les données `traces[j]`
+    function figure(donnees, composant, traces) {
+        const fig = copie(donnees.gabarits[composant]);
+        if (donnees.theme && !fig.layout.template) {
+            fig.layout.template = donnees.theme;
+        }
+        fig.data = traces.map(function (trace, j) {
+            return Object.assign({}, fig.data[Math.min(j, fig.data.length - 1)], trace);
+        });
+        return fig;
+    }
+
+    // ---------- rendus ----------
+    const rendus = {
+        "kpi-cards": function (donnees, positions) {
+            const valeurs = [
+                milliers(positions.length),
+                String(donnees.colonnes.Pays ? nunique(donnees, positions, "Pays") : 1),
+                String(nunique(donnees, positions, "Domaine_metier")),
+                fixe1(tauxDemande(donnees, positions)) + "%",
+            ];
+            const cartes = copie(donnees.gabarits["kpi-cards"]);
+            cartes.forEach(function (carte, j) {
+                carte.props.children[1].props.children = valeurs[j];
+            });
+            return cartes;
+        },
+
+        "graph-top-domaines": function (donnees, positions) {
+            const comptes = domainesHorsAutre(donnees, positions);
+            const total = somme(comptes.n);
+            let x = ["Aucun domaine"];
+            let y = [0.0];
+            if (total > 0) {
+                x = comptes.libelles.slice(0, 10);
+                y = comptes.n.slice(0, 10).map(function (v) { return v / total * 100; });
+            }
+            const text = y.map(function (v) { return fixe1(v) + " %"; });
+            return figure(donnees, "graph-top-domaines", [{x: x, y: y, text: text}]);
+        },
+
+        "graph-salaire-funnel": function (donnees, positions) {
+            const comptes = compter(donnees, positions, "niveau_salaire");
+            const x = donnees.ordre_salaires.map(function (niveau) {
+                const j = comptes.libelles.indexOf(niveau);
+                return j >= 0 ? comptes.n[j] : 0;
+            });
+            return figure(donnees, "graph-salaire-funnel", [{x: x, y: donnees.ordre_salaires}]);
+        },
+
+        "graph-offres-pays": function (donnees, positions) {
+            const comptes = compter(donnees, positions, "Pays");
+            return figure(donnees, "graph-offres-pays", [{x: comptes.libelles, y: comptes.n}]);
+        },
+
+        "graph-categories-pie": function (donnees, positions) {
+            let comptes = domainesHorsAutre(donnees, positions);
+            if (!comptes.n.length) {
+                comptes = {libelles: ["Aucun domaine"], n: [1]};
+            }
+            return figure(donnees, "graph-categories-pie", [{labels: comptes.libelles, values: comptes.n}]);
+        },
+
+        "graph-salaire-pays": function (donnees, positions) {
+            const pays = donnees.colonnes.Pays;
+            const n = new Array(pays.valeurs.length).fill(0);
+            const mesures = new Array(pays.valeurs.length).fill(0);
+            const sommes = new Array(pays.valeurs.length).fill(0);
+            positions.forEach(function (i) {
+                const c = pays.codes[i];
+                if (c >= 0) {
+                    n[c] += 1;
+                    // Comme .mean() : les scores manquants ne comptent pas
+                    if (donnees.mesure[i] !== null) {
+                        mesures[c] += 1;
+                        sommes[c] += donnees.mesure[i];
+                    }
+                }
+            });
+            const moyennes = [];
+            n.forEach(function (nc, c) {
+                if (nc > 0) {
+                    moyennes.push([pays.valeurs[c], mesures[c] > 0 ? sommes[c] / mesures[c] : null]);
+                }
+            });
+            // Pays sans aucun score (moyenne NaN) en dernier, comme sort_values()
+            moyennes.sort(function (a, b) {
+                return (a[1] === null) - (b[1] === null) || (a[1] === null ? 0 : a[1] - b[1]);
+            });
+            return figure(donnees, "graph-salaire-pays", [{
+                x: moyennes.map(function (m) { return m[1]; }),
+                y: moyennes.map(function (m) { return m[0]; }),
+            }]);
+        },
+
+        "graph-offres-temps": function (donnees, positions) {
+            // Valeurs distinctes triées : l'ordre des codes est celui des jours
+            const jours = donnees.colonnes.jours_depuis;
+            const n = new Array(jours.valeurs.length).fill(0);
+            positions.forEach(function (i) {
+                if (jours.codes[i] >= 0) {
+                    n[jours.codes[i]] += 1;
+                }
+            });
+            const x = [];
+            const y = [];
+            let cumul = 0;
+            n.forEach(function (nc, c) {
+                if (nc > 0) {
+                    cumul += nc;
+                    x.push(jours.valeurs[c]);
+                    y.push(cumul);
+                }
+            });
+            return figure(donnees, "graph-offres-temps", [{x: x, y: y}]);
+        },
+
+        "graph-experience-donut": function (donnees, positions) {
+            const comptes = compter(donnees, positions, "experience_level");
+            return figure(donnees, "graph-experience-donut", [{labels: comptes.libelles, values: comptes.n}]);
+        },
+
+        "graph-salaire-experience": function (donnees, positions) {
+            const niveaux = compter(donnees, positions, "experience_level").libelles
+                .slice(0, donnees.palette.length);
+            const experience = donnees.colonnes.experience_level;
+            const traces = niveaux.map(function (niveau, j) {
+                const k = experience.valeurs.indexOf(niveau);
+                const y = [];
+                positions.forEach(function (i) {
+                    if (experience.codes[i] === k) {
+                        y.push(donnees.mesure[i]);
+                    }
+                });
+                return {
+                    x: y.map(function () { return niveau; }),
+                    y: y,
+                    name: niveau,
+                    marker: {color: donnees.palette[j]},
+                };
+            });
+            return figure(donnees, "graph-salaire-experience", traces);
+        },
+
+        "graph-villes": function (donnees, positions) {
+            const comptes = compter(donnees, positions, "Ville_propre");
+            return figure(donnees, "graph-villes", [{x: comptes.libelles.slice(0, 10), y: comptes.n.slice(0, 10)}]);
+        },
+
+        "graph-contrats-pie": function (donnees, positions) {
+            const comptes = compter(donnees, positions, "Contrat_propre");
+            return figure(donnees, "graph-contrats-pie", [{labels: comptes.libelles, values: comptes.n}]);
+        },
+
+        "graph-salaire-pays-stacked": function (donnees, positions) {
+            // Pays dans l'ordre des valeurs distinctes, une trace par niveau de salaire
+            const pays = donnees.colonnes.Pays;
+            const salaires = donnees.colonnes.niveau_salaire;
+            const n = pays.valeurs.map(function () { return new Array(salaires.valeurs.length).fill(0); });
+            const presents = new Array(pays.valeurs.length).fill(false);
+            positions.forEach(function (i) {
+                const p = pays.codes[i];
+                const s = salaires.codes[i];
+                if (p >= 0 && s >= 0) {
+                    n[p][s] += 1;
+                    presents[p] = true;
+                }
+            });
+            const x = pays.valeurs.filter(function (v, p) { return presents[p]; });
+            const traces = donnees.ordre_salaires.map(function (niveau) {
+                const s = salaires.valeurs.indexOf(niveau);
+                return {
+                    x: x,
+                    y: n.filter(function (v, p) { return presents[p]; })
+                        .map(function (ligne) { return s >= 0 ? ligne[s] : 0; }),
+                };
+            });
+            return figure(donnees, "graph-salaire-pays-stacked", traces);
+        },
+
+        "graph-gauge-demande": function (donnees, positions) {
+            return figure(donnees, "graph-gauge-demande", [{value: tauxDemande(donnees, positions)}]);
+        },
+    };
+
+    const offres = {selection: selection};
+    Object.keys(rendus).forEach(function (composant) {
+        offres[composant] = function (filtres, donnees) {
+            if (!donnees) {
+                return pasDeMaj();
+            }
+            return rendus[composant](donnees, offresRetenues(donnees, filtres));
+        };
+    });
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {offres: offres});
+})();
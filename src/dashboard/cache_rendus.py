@@ -0,0 +1,148 @@
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+# ========================================
+# CACHE DES RENDUS DU DASHBOARD
+# Les sorties du callback (KPI + figures) sont mémorisées par combinaison
+# de filtres normalisée. Deux niveaux :
+#   - LRU en mémoire, propre au processus ;
+#   - répertoire sur disque partagé entre les workers gunicorn (un fichier
+#     pickle par combinaison, écrit de façon atomique).
+# Tout est rangé sous l'empreinte du fichier de données : dès qu'il change,
+# les anciens rendus ne sont plus jamais servis.
+# ========================================
+RE_EMPREINTE = re.compile(r"^[0-9a-f]+-[0-9a-f]+$")
+
+
+def empreinte_fichier(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def cle_filtres(filtres: dict) -> tuple:
+    """Clé canonique : dimensions triées, valeurs triées, filtres vides retirés."""
+    return tuple(
+        (dim, tuple(sorted(set(valeurs), key=str)))
+        for dim, valeurs in sorted(filtres.items())
+        if valeurs
+    )
+
+
+class CacheRendus:
+    def __init__(self, taille: int = 128, dossier: str = None, taille_disque: int = 2048):
+        self.taille = taille
+        self.dossier = dossier or None
+        self.taille_disque = taille_disque
+        self.empreinte = None
+        self._memoire = OrderedDict()
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.hits_disque = 0
+        self.misses = 0
+
+    # ---------- empreinte des données ----------
+    def lier(self, empreinte: str) -> None:
+        """Associe le cache à une version des données ; vide tout si elle a changé."""
+        with self._verrou:
+            if empreinte == self.empreinte:
+                return
+            self._memoire.clear()
+            self.empreinte = empreinte
+        if self.dossier:
+            os.makedirs(self._espace(), exist_ok=True)
+            for nom in os.listdir(self.dossier):
+                if nom != empreinte and RE_EMPREINTE.match(nom):
+                    shutil.rmtree(os.path.join(self.dossier, nom), ignore_errors=True)
+
+    def _espace(self) -> str:
+        return os.path.join(self.dossier, self.empreinte)
+
+    def _fichier(self, cle) -> str:
+        return os.path.join(self._espace(), hashlib.sha256(repr(cle).encode("utf-8")).hexdigest() + ".pkl")
+
+    # ---------- lecture / écriture ----------
+    def obtenir(self, cle, calculer):
+        """Rendu mémorisé pour `cle`, sinon `calculer()` (puis mémorisé)."""
+        with self._verrou:
+            if cle in self._memoire:
+                self._memoire.move_to_end(cle)
+                self.hits += 1
+                return self._memoire[cle]
+
+        valeur = self._lire_disque(cle)
+        if valeur is not None:
+            with self._verrou:
+                self.hits += 1
+                self.hits_disque += 1
+                self._ranger(cle, valeur)
+            return valeur
+
+        valeur = calculer()
+        with self._verrou:
+            self.misses += 1
+            self._ranger(cle, valeur)
+        self._ecrire_disque(cle, valeur)
+        return valeur
+
+    def _ranger(self, cle, valeur) -> None:
+        self._memoire[cle] = valeur
+        self._memoire.move_to_end(cle)
+        while len(self._memoire) > self.taille:
+            self._memoire.popitem(last=False)
+
+    def _lire_disque(self, cle):
+        if not (self.dossier and self.empreinte):
+            return None
+        path = self._fichier(cle)
+        try:
+            with open(path, "rb") as f:
+                valeur = pickle.load(f)
+            os.utime(path)  # élagage du plus ancien usage, pas de la plus ancienne écriture
+            return valeur
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _ecrire_disque(self, cle, valeur) -> None:
+        if not (self.dossier and self.empreinte):
+            return
+        espace = self._espace()
+        try:
+            os.makedirs(espace, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=espace, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(valeur, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._fichier(cle))
+            self._elaguer_disque(espace)
+        except OSError:
+            pass
+
+    def _elaguer_disque(self, espace: str) -> None:
+        fichiers = [os.path.join(espace, nom) for nom in os.listdir(espace) if nom.endswith(".pkl")]
+        if len(fichiers) <= self.taille_disque:
+            return
+        fichiers.sort(key=lambda p: os.stat(p).st_mtime_ns)
+        for path in fichiers[:len(fichiers) - self.taille_disque]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # ---------- compteurs ----------
+    def stats(self) -> dict:
+        with self._verrou:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "hits_disque": self.hits_disque,
+                "misses": self.misses,
+                "taux_hits": self.hits / total if total else 0.0,
+                "entrees_memoire": len(self._memoire),
+                "empreinte": self.empreinte,
+            }
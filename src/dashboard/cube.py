@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from src.dashboard.index_filtres import DIMENSIONS_FILTRES, IndexFiltres
+
+
+# ========================================
+# CUBE DE COMPTAGES (OLAP)
+# Les offres sont agrégées une fois par combinaison de valeurs des
+# dimensions : chaque cellule garde le nombre d'offres, la somme et le
+# nombre des scores de salaire renseignés, et la position de sa première
+# offre (pour départager les ex aequo dans l'ordre d'apparition, comme un
+# value_counts sur les lignes).
+# Un graphique se calcule en sommant les cellules retenues par les filtres.
+#
+# Le nombre de cellules se multiplie avec chaque dimension : plutôt qu'un
+# seul cube sur tout, un cube par dimension d'analyse qui n'est pas un
+# filtre (jours_depuis, experience_level), chacun croisé avec les filtres.
+# ========================================
+CUBES_DASHBOARD = {
+    "filtres": DIMENSIONS_FILTRES,
+    "temps": DIMENSIONS_FILTRES + ["jours_depuis"],
+    "experience": DIMENSIONS_FILTRES + ["experience_level"],
+}
+
+
+def codes_valeurs(serie: pd.Series):
+    """Codes entiers (-1 = manquant) et valeurs distinctes de la série."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.array.codes, serie.cat.categories
+    return pd.factorize(serie, sort=True)
+
+
+def _libelles(valeurs, codes: np.ndarray) -> np.ndarray:
+    return np.append(np.asarray(valeurs, dtype=object), np.nan)[codes]
+
+
+class CubeOffres:
+    def __init__(self, df: pd.DataFrame, dimensions: list = DIMENSIONS_FILTRES, mesure: str = "salary_score"):
+        self.dimensions = [d for d in dimensions if d in df.columns]
+        self.n_offres = len(df)
+
+        codes, valeurs = {}, {}
+        for dim in self.dimensions:
+            codes[dim], valeurs[dim] = codes_valeurs(df[dim])
+        cellules = pd.DataFrame(codes)
+        cellules["n"] = 1
+        cellules["somme"] = df[mesure].to_numpy() if mesure in df.columns else 0
+        cellules["mesures"] = df[mesure].notna().to_numpy() if mesure in df.columns else 1
+        cellules["premiere"] = np.arange(len(df))
+        cellules = (
+            cellules.groupby(self.dimensions, sort=False)
+            .agg(n=("n", "sum"), somme=("somme", "sum"), mesures=("mesures", "sum"),
+                 premiere=("premiere", "min"))
+            .reset_index()
+        )
+        # Cellules typées comme la table : mêmes catégories, mêmes libellés
+        for dim in self.dimensions:
+            c = cellules[dim].to_numpy()
+            if isinstance(df[dim].dtype, pd.CategoricalDtype):
+                cellules[dim] = pd.Categorical.from_codes(c, dtype=df[dim].dtype)
+            elif (c < 0).any():
+                cellules[dim] = _libelles(valeurs[dim], c)
+            else:
+                cellules[dim] = np.asarray(valeurs[dim])[c]
+        self.cellules = cellules
+        self.index = IndexFiltres(cellules, [d for d in DIMENSIONS_FILTRES if d in self.dimensions])
+
+    @classmethod
+    def depuis_cellules(cls, cellules: pd.DataFrame, index: IndexFiltres, dimensions: list,
+                        n_offres: int) -> "CubeOffres":
+        """Cube déjà agrégé (instantané du dashboard) : aucun calcul."""
+        c = cls.__new__(cls)
+        c.cellules, c.index, c.dimensions, c.n_offres = cellules, index, dimensions, n_offres
+        return c
+
+    def __len__(self):
+        return len(self.cellules)
+
+    def selection(self, filtres: dict) -> pd.DataFrame:
+        """Cellules retenues par `filtres` ({dimension: valeurs}, comme IndexFiltres)."""
+        lignes = self.index.lignes(filtres)
+        return self.cellules if lignes is None else self.cellules.take(lignes)
+
+
+# ========================================
+# RÉPONSES AUX GRAPHIQUES
+# Chaque fonction reproduit le calcul fait auparavant sur les lignes filtrées.
+# ========================================
+def total(sel: pd.DataFrame) -> int:
+    return int(sel["n"].sum())
+
+
+def nunique(sel: pd.DataFrame, dim: str) -> int:
+    return int(sel[dim].nunique())
+
+
+def part(sel: pd.DataFrame, dim: str, valeur) -> float:
+    """Équivalent de (dff[dim] == valeur).mean()."""
+    n = sel["n"].to_numpy()
+    return float(n[(sel[dim] == valeur).to_numpy()].sum()) / float(n.sum())
+
+
+def compter(sel: pd.DataFrame, dim: str, dropna: bool = True) -> pd.Series:
+    """Équivalent de table_offres.compter(dff[dim]) : ex aequo par ordre d'apparition."""
+    codes, valeurs = codes_valeurs(sel[dim])
+    decales = codes + 1  # 0 = valeur manquante
+    taille = len(valeurs) + 1
+    n = np.bincount(decales, weights=sel["n"].to_numpy(), minlength=taille).astype(np.int64)
+    premiere = np.full(taille, np.iinfo(np.int64).max)
+    np.minimum.at(premiere, decales, sel["premiere"].to_numpy())
+
+    presents = np.flatnonzero(n > 0)
+    if dropna:
+        presents = presents[presents > 0]
+    # Tri par nombre décroissant, puis par première apparition
+    presents = presents[np.lexsort((premiere[presents], -n[presents]))]
+
+    libelles = _libelles(valeurs, presents - 1)
+    return pd.Series(n[presents], index=pd.Index(libelles, dtype=object, name=dim), name="count")
+
+
+def taille_par(sel: pd.DataFrame, dims) -> pd.Series:
+    """Équivalent de dff.groupby(dims, observed=True).size()."""
+    return sel.groupby(dims, observed=True)["n"].sum()
+
+
+def moyenne_par(sel: pd.DataFrame, dim: str) -> pd.Series:
+    """Équivalent de dff.groupby(dim, observed=True)[mesure].mean() : scores manquants ignorés."""
+    groupes = sel.groupby(dim, observed=True)[["mesures", "somme"]].sum()
+    return groupes["somme"] / groupes["mesures"].replace(0, np.nan)
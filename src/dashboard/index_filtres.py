@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+
+# ========================================
+# INDEX INVERSÉ DES FILTRES
+# Une entrée par valeur de chaque dimension filtrable, sous l'une de deux
+# formes selon sa fréquence :
+# - valeur fréquente : bitmap compacté avec np.packbits (1 bit par offre) ;
+# - valeur rare : positions triées des offres (int32, 32 bits par offre
+#   retenue). Une dimension à forte cardinalité (villes) reste ainsi en
+#   O(n) au lieu de O(n × valeurs distinctes).
+# Une combinaison de filtres se résout en OU des entrées à l'intérieur d'un
+# filtre, puis ET entre filtres (intersection des positions en commençant
+# par la plus courte, puis test des bits), sans toucher aux autres colonnes.
+# ========================================
+DIMENSIONS_FILTRES = [
+    "Ville_propre", "Contrat_propre", "Domaine_metier", "Pays", "niveau_salaire", "pred_tres_demande",
+]
+
+# Une valeur est stockée en bitmap dès qu'elle couvre au moins 1 offre sur
+# SEUIL_DENSE : ses positions occuperaient alors plus de place que le bitmap
+SEUIL_DENSE = 32
+
+
+def est_bitmap(entree: np.ndarray) -> bool:
+    return entree.dtype == np.uint8
+
+
+def _marquer(bitmap: np.ndarray, positions: np.ndarray) -> None:
+    """Met à 1 les bits `positions` du bitmap (ordre de bits de np.packbits)."""
+    np.bitwise_or.at(bitmap, positions >> 3, (128 >> (positions & 7)).astype(np.uint8))
+
+
+def _contient(bitmap: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Masque des `positions` dont le bit vaut 1."""
+    return (bitmap[positions >> 3] & (128 >> (positions & 7)).astype(np.uint8)) != 0
+
+
+class IndexFiltres:
+    def __init__(self, df: pd.DataFrame, dimensions: list = DIMENSIONS_FILTRES):
+        self.n = len(df)
+        self.entrees = {}  # dimension -> {valeur: bitmap uint8 ou positions int32 triées}
+        for dim in dimensions:
+            if dim in df.columns:
+                self.entrees[dim] = self._indexer(df[dim])
+
+    @classmethod
+    def depuis_entrees(cls, n: int, entrees: dict) -> "IndexFiltres":
+        """Index déjà construit (instantané du dashboard) : aucun calcul."""
+        index = cls.__new__(cls)
+        index.n, index.entrees = n, entrees
+        return index
+
+    def _indexer(self, serie: pd.Series) -> dict:
+        codes, valeurs = pd.factorize(serie)
+        # Lignes regroupées par code : chaque valeur occupe une tranche contiguë, triée
+        ordre = np.argsort(codes, kind="stable").astype(np.int32)
+        bornes = np.searchsorted(codes[ordre], np.arange(len(valeurs) + 1))
+        entrees = {}
+        for k, valeur in enumerate(np.asarray(valeurs).tolist()):
+            positions = ordre[bornes[k]:bornes[k + 1]]
+            if len(positions) * SEUIL_DENSE >= self.n:
+                bits = np.zeros(self.n, dtype=bool)
+                bits[positions] = True
+                entrees[valeur] = np.packbits(bits)
+            else:
+                entrees[valeur] = positions.copy()
+        return entrees
+
+    def _union(self, dim: str, valeurs: list) -> np.ndarray:
+        """Offres ayant l'une des `valeurs` : bitmap si une valeur fréquente en fait partie."""
+        entrees = [e for e in (self.entrees[dim].get(v) for v in dict.fromkeys(valeurs)) if e is not None]
+        bitmaps = [e for e in entrees if est_bitmap(e)]
+        positions = [e for e in entrees if not est_bitmap(e)]
+        if not bitmaps:
+            # Une offre n'a qu'une valeur par dimension : les positions sont disjointes
+            return np.sort(np.concatenate(positions)) if positions else np.zeros(0, dtype=np.int32)
+        union = bitmaps[0].copy()
+        for bitmap in bitmaps[1:]:
+            union |= bitmap
+        for p in positions:
+            _marquer(union, p)
+        return union
+
+    def lignes(self, filtres: dict):
+        """
+        Positions (triées) des offres retenues par `filtres` ({dimension: valeurs}).
+        Un filtre vide (None ou []) ou sur une dimension non indexée est ignoré ;
+        None si aucun filtre n'est actif.
+        """
+        unions = [self._union(dim, valeurs) for dim, valeurs in filtres.items()
+                  if valeurs and dim in self.entrees]
+        if not unions:
+            return None
+        positions = sorted((u for u in unions if not est_bitmap(u)), key=len)
+        bitmaps = [u for u in unions if est_bitmap(u)]
+        if not positions:
+            resultat = bitmaps[0].copy()
+            for bitmap in bitmaps[1:]:
+                resultat &= bitmap
+            return np.flatnonzero(np.unpackbits(resultat, count=self.n))
+
+        resultat = positions[0]
+        for p in positions[1:]:
+            resultat = np.intersect1d(resultat, p, assume_unique=True)
+        for bitmap in bitmaps:
+            resultat = resultat[_contient(bitmap, resultat)]
+        return resultat
+
+    def nbytes(self) -> int:
+        return sum(e.nbytes for entrees in self.entrees.values() for e in entrees.values())
@@ -0,0 +1,330 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+from src.dashboard import cube  # noqa: E402
+from src.dashboard.cache_rendus import empreinte_fichier  # noqa: E402
+from src.dashboard.index_filtres import IndexFiltres, est_bitmap  # noqa: E402
+from src.dashboard.options_filtres import DIMENSIONS_OPTIONS, IndexPrefixes  # noqa: E402
+from src.dashboard.table_offres import ALIAS, COLONNES_DASHBOARD, construire_table, rapport_memoire  # noqa: E402
+from src.etl.stockage import chemin, lire_offres  # noqa: E402
+
+
+# ========================================
+# INSTANTANÉ DU DASHBOARD
+# Tout ce que le dashboard dérive des offres au démarrage (table compacte,
+# index des filtres, cubes, options des filtres) tient dans un seul fichier
+# écrit à côté de offres_ml : les tableaux numpy bout à bout (alignés sur
+# 64 octets), puis un en-tête JSON qui les décrit. Au démarrage, le fichier
+# est projeté en mémoire (np.memmap) : aucun tableau n'est copié ni
+# recalculé, et les workers d'un même serveur partagent les mêmes pages.
+# L'instantané porte l'empreinte du fichier d'offres dont il est issu : s'il
+# ne lui correspond plus, il est ignoré et reconstruit.
+#
+# Format : MAGIQUE | tableaux | en-tête JSON | position de l'en-tête (8 octets)
+# ========================================
+VERSION = 3
+MAGIQUE = b"OFFRES-DASHBOARD"
+ALIGNEMENT = 64
+EXTENSION = ".instantane"
+
+ML_BASE = os.path.join(BASE_DIR, "data", "processed", "offres_ml")
+
+
+def chemin_instantane(base: str) -> str:
+    return base + EXTENSION
+
+
+# ========================================
+# CONSTRUCTION (DEPUIS LE FICHIER D'OFFRES)
+# ========================================
+def construire_donnees(base: str, fmt: str = None) -> dict:
+    """
+    Lit les offres et construit la table compacte, l'index des filtres, les
+    cubes et les index d'options. `demarrage` détaille la durée de chaque
+    étape : (nature, étape, secondes), la nature étant "chargement" ou
+    "dérivation".
+    """
+    etapes = []
+    debut = time.perf_counter()
+
+    def etape(nature: str, nom: str):
+        nonlocal debut
+        fin = time.perf_counter()
+        etapes.append((nature, nom, fin - debut))
+        debut = fin
+
+    # Seules les colonnes affichées ou filtrées sont lues (projection Parquet)
+    brut = lire_offres(base, colonnes=COLONNES_DASHBOARD, fmt=fmt)
+    etape("chargement", "lecture des offres")
+
+    # Table compacte : colonnes catégorielles encodées, alias partagés
+    # (Ville_propre, Contrat_propre, Domaine_metier, niveau_salaire, score_popularite),
+    # pred_tres_demande et jours_depuis calculés au chargement
+    table = construire_table(brut)
+    etape("dérivation", "table compacte")
+    print(rapport_memoire(brut, table))
+    del brut
+
+    # Un bitmap (ou des positions, valeurs rares) par valeur filtrable : les
+    # filtres se combinent sans parcourir la table
+    index = IndexFiltres(table)
+    etape("dérivation", "index des filtres")
+    print(f"🔎 Index des filtres : {index.nbytes() / 1024:.1f} Ko")
+
+    # Cubes de comptages : les graphiques somment des cellules au lieu de parcourir les offres
+    cubes = {nom: cube.CubeOffres(table, dims) for nom, dims in cube.CUBES_DASHBOARD.items()}
+    etape("dérivation", "cubes")
+    print("🧊 Cubes : " + ", ".join(f"{nom} {len(c):,} cellules" for nom, c in cubes.items())
+          + f" pour {len(table):,} offres")
+
+    # Valeurs distinctes des filtres, cherchées par préfixe pendant la saisie
+    options = {dim: IndexPrefixes(table[dim]) for dim in DIMENSIONS_OPTIONS if dim in table.columns}
+    etape("dérivation", "options des filtres")
+
+    return {"df": table, "index_filtres": index, "cubes": cubes, "options": options, "demarrage": etapes}
+
+
+def rapport_demarrage(etapes: list, source: str, construction: list = None) -> str:
+    """
+    Durées du démarrage, étape par étape, regroupées en chargement /
+    dérivation. `construction` : étapes de l'instantané projeté, évitées.
+    """
+    total = sum(s for _, _, s in etapes)
+    lignes = [f"⏱️ Démarrage du dashboard ({source}) : {total * 1000:.0f} ms"]
+    for nature, nom, secondes in etapes:
+        lignes.append(f"   {nature:<11} {nom:<28} {secondes * 1000:9.1f} ms")
+    for nature in dict.fromkeys(n for n, _, _ in etapes):
+        lignes.append(f"   Total {nature} : {sum(s for n, _, s in etapes if n == nature) * 1000:.1f} ms")
+    if construction:
+        evitee = sum(s for n, _, s in construction if n != "écriture")
+        lignes.append(f"   Lecture et dérivation évitées (faites à la construction de l'instantané) : {evitee * 1000:.1f} ms")
+    return "\n".join(lignes)
+
+
+# ========================================
+# ÉCRITURE
+# ========================================
+def _json(valeur):
+    return valeur.item() if isinstance(valeur, np.generic) else valeur
+
+
+def _decrire_table(df: pd.DataFrame, tableaux: list, alias: dict = None) -> dict:
+    """
+    En-tête d'un DataFrame (index RangeIndex) : les données numériques et les
+    codes des catégories vont dans `tableaux`, le reste dans l'en-tête.
+    """
+    alias = alias or {}
+    colonnes = []
+    for col in df.columns:
+        serie = df[col]
+        if col in alias and alias[col] in df.columns:
+            colonnes.append({"nom": col, "alias": alias[col]})
+        elif isinstance(serie.dtype, pd.CategoricalDtype):
+            categories = serie.cat.categories
+            tableaux.append(serie.array.codes)
+            colonnes.append({
+                "nom": col, "type": "categorie", "codes": len(tableaux) - 1,
+                "categories": [_json(v) for v in categories.tolist()],
+                "dtype_categories": str(categories.dtype), "ordonnee": bool(serie.cat.ordered),
+            })
+        elif isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "biuf":
+            tableaux.append(serie.to_numpy())
+            colonnes.append({"nom": col, "type": "tableau", "donnees": len(tableaux) - 1})
+        else:
+            # Texte ou objets : valeurs distinctes dans l'en-tête, codes dans les tableaux
+            codes, valeurs = pd.factorize(serie)
+            tableaux.append(codes)
+            colonnes.append({
+                "nom": col, "type": "valeurs", "codes": len(tableaux) - 1,
+                "valeurs": [_json(v) for v in np.asarray(valeurs, dtype=object).tolist()],
+                "dtype": str(serie.dtype),
+            })
+    return {"lignes": len(df), "colonnes": colonnes}
+
+
+def _decrire_index(index: IndexFiltres, tableaux: list) -> dict:
+    dimensions = []
+    for dim, entrees in index.entrees.items():
+        denses = [v for v, e in entrees.items() if est_bitmap(e)]
+        creuses = [v for v, e in entrees.items() if not est_bitmap(e)]
+        # Par dimension : une matrice (un bitmap par valeur fréquente), puis les
+        # positions des valeurs rares bout à bout avec leurs bornes
+        tableaux.append(np.stack([entrees[v] for v in denses]) if denses
+                        else np.zeros((0, (index.n + 7) // 8), dtype=np.uint8))
+        tableaux.append(np.concatenate([entrees[v] for v in creuses]) if creuses
+                        else np.zeros(0, dtype=np.int32))
+        tableaux.append(np.cumsum([0] + [len(entrees[v]) for v in creuses], dtype=np.int64))
+        dimensions.append({"nom": dim, "denses": denses, "creuses": creuses, "bitmaps": len(tableaux) - 3,
+                           "positions": len(tableaux) - 2, "bornes": len(tableaux) - 1})
+    return {"n": index.n, "dimensions": dimensions}
+
+
+def ecrire_instantane(donnees: dict, path: str, empreinte: str) -> int:
+    """
+    Écrit l'instantané des données du dashboard (construites depuis le
+    fichier d'empreinte `empreinte`). Écriture atomique : les workers qui
+    projettent déjà l'ancien fichier le gardent intact. Renvoie la taille.
+    """
+    tableaux = []
+    entete = {
+        "version": VERSION,
+        "empreinte": empreinte,
+        "table": _decrire_table(donnees["df"], tableaux, ALIAS),
+        "index_filtres": _decrire_index(donnees["index_filtres"], tableaux),
+        "cubes": {
+            nom: {
+                "dimensions": c.dimensions, "n_offres": c.n_offres,
+                "cellules": _decrire_table(c.cellules, tableaux), "index": _decrire_index(c.index, tableaux),
+            }
+            for nom, c in donnees["cubes"].items()
+        },
+        "options": {},
+        "demarrage": donnees["demarrage"],
+    }
+    for dim, index in donnees["options"].items():
+        tableaux.append(index._rangs)
+        entete["options"][dim] = {
+            "limite": index.limite, "valeurs": index.valeurs, "cles": index._cles, "rangs": len(tableaux) - 1,
+        }
+
+    dossier = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dossier, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIQUE)
+            entete["tableaux"] = []
+            for tableau in tableaux:
+                tableau = np.ascontiguousarray(tableau)
+                f.write(b"\0" * (-f.tell() % ALIGNEMENT))
+                entete["tableaux"].append({"debut": f.tell(), "dtype": tableau.dtype.str, "forme": list(tableau.shape)})
+                f.write(tableau.tobytes())
+            position = f.tell()
+            f.write(json.dumps(entete, ensure_ascii=False).encode("utf-8"))
+            f.write(position.to_bytes(8, "little"))
+            taille = f.tell()
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return taille
+
+
+# ========================================
+# LECTURE (PROJECTION EN MÉMOIRE)
+# ========================================
+def _restaurer_table(description: dict, tableaux: list) -> pd.DataFrame:
+    colonnes = {}
+    for col in description["colonnes"]:
+        nom = col["nom"]
+        if "alias" in col:
+            colonnes[nom] = colonnes[col["alias"]]
+        elif col["type"] == "categorie":
+            dtype = pd.CategoricalDtype(pd.Index(col["categories"], dtype=col["dtype_categories"]),
+                                        ordered=col["ordonnee"])
+            colonnes[nom] = pd.Categorical.from_codes(tableaux[col["codes"]], dtype=dtype, validate=False)
+        elif col["type"] == "tableau":
+            colonnes[nom] = tableaux[col["donnees"]]
+        else:
+            valeurs = np.append(np.array(col["valeurs"], dtype=object), np.nan)[tableaux[col["codes"]]]
+            colonnes[nom] = valeurs if col["dtype"] == "object" else pd.array(valeurs, dtype=col["dtype"])
+    # copy=False : les colonnes restent des vues sur le fichier projeté
+    return pd.DataFrame(colonnes, index=pd.RangeIndex(description["lignes"]), copy=False)
+
+
+def _restaurer_index(description: dict, tableaux: list) -> IndexFiltres:
+    entrees = {}
+    for dim in description["dimensions"]:
+        matrice, positions, bornes = (tableaux[dim[cle]] for cle in ("bitmaps", "positions", "bornes"))
+        entrees[dim["nom"]] = {valeur: matrice[i] for i, valeur in enumerate(dim["denses"])}
+        entrees[dim["nom"]].update(
+            (valeur, positions[bornes[i]:bornes[i + 1]]) for i, valeur in enumerate(dim["creuses"]))
+    return IndexFiltres.depuis_entrees(description["n"], entrees)
+
+
+def lire_entete(path: str):
+    """En-tête JSON de l'instantané, ou None si le fichier est absent ou illisible."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIQUE)) != MAGIQUE:
+                return None
+            f.seek(-8, os.SEEK_END)
+            fin = f.tell()
+            position = int.from_bytes(f.read(8), "little")
+            if not len(MAGIQUE) <= position <= fin:
+                return None
+            f.seek(position)
+            entete = json.loads(f.read(fin - position).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    return entete if entete.get("version") == VERSION else None
+
+
+def lire_instantane(path: str, empreinte: str = None):
+    """
+    Données du dashboard projetées depuis l'instantané, ou None s'il est
+    absent, illisible ou construit depuis un autre fichier d'offres que
+    celui d'empreinte `empreinte`.
+    """
+    debut = time.perf_counter()
+    entete = lire_entete(path)
+    if entete is None or (empreinte is not None and entete["empreinte"] != empreinte):
+        return None
+
+    fichier = np.memmap(path, dtype=np.uint8, mode="r")
+    tableaux = [
+        np.frombuffer(fichier, dtype=t["dtype"], count=int(np.prod(t["forme"])), offset=t["debut"]).reshape(t["forme"])
+        for t in entete["tableaux"]
+    ]
+
+    cubes = {}
+    for nom, c in entete["cubes"].items():
+        cubes[nom] = cube.CubeOffres.depuis_cellules(
+            _restaurer_table(c["cellules"], tableaux), _restaurer_index(c["index"], tableaux),
+            c["dimensions"], c["n_offres"],
+        )
+    options = {
+        dim: IndexPrefixes.depuis_cles(o["valeurs"], o["cles"], tableaux[o["rangs"]], o["limite"])
+        for dim, o in entete["options"].items()
+    }
+    donnees = {
+        "df": _restaurer_table(entete["table"], tableaux),
+        "index_filtres": _restaurer_index(entete["index_filtres"], tableaux),
+        "cubes": cubes,
+        "options": options,
+        "construction": [tuple(e) for e in entete["demarrage"]],
+    }
+    donnees["demarrage"] = [("chargement", "projection de l'instantané", time.perf_counter() - debut)]
+    return donnees
+
+
+# ========================================
+# ÉTAPE DU PIPELINE
+# Après classification.py : python src/dashboard/instantane.py
+# ========================================
+def main():
+    parser = argparse.ArgumentParser(description="Construit l'instantané du dashboard depuis offres_ml.")
+    parser.add_argument("--base", default=ML_BASE, help="fichier d'offres, sans extension")
+    parser.add_argument("--sortie", default=None, help="instantané (défaut : <base>.instantane)")
+    args = parser.parse_args()
+
+    sortie = args.sortie or chemin_instantane(args.base)
+    empreinte = empreinte_fichier(chemin(args.base))
+    donnees = construire_donnees(args.base)
+    taille = ecrire_instantane(donnees, sortie, empreinte)
+    print(rapport_demarrage(donnees["demarrage"], os.path.basename(chemin(args.base))))
+    print(f"💾 Instantané du dashboard : {sortie} ({taille / 1e6:.2f} Mo)")
+
+
+if __name__ == "__main__":
+    main()
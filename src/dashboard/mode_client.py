@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from src.dashboard.cube import codes_valeurs
+from src.dashboard.index_filtres import DIMENSIONS_FILTRES
+
+
+# ========================================
+# MODE NAVIGATEUR (PETITS JEUX D'OFFRES)
+# Sous un seuil de lignes, les colonnes compactes (codes entiers + valeurs
+# distinctes) sont envoyées une seule fois au navigateur. Les filtres et les
+# comptages des graphiques sont ensuite recalculés par les callbacks
+# clientside de assets/filtres_client.js, sans aller-retour serveur.
+# Les styles restent définis côté Python : chaque rendu sans filtre sert de
+# gabarit, dont le navigateur ne remplace que les données.
+# ========================================
+COLONNES_CLIENT = DIMENSIONS_FILTRES + ["experience_level", "jours_depuis"]
+MESURE_CLIENT = "salary_score"
+
+# Données des traces recalculées par le navigateur (retirées des gabarits)
+CLES_DONNEES = ["x", "y", "labels", "values", "text", "value"]
+
+
+def colonnes_client(df: pd.DataFrame) -> dict:
+    """Colonnes utiles aux graphiques, sous forme de codes (-1 = manquant) et valeurs distinctes."""
+    colonnes = {}
+    for col in COLONNES_CLIENT:
+        if col in df.columns:
+            codes, valeurs = codes_valeurs(df[col])
+            colonnes[col] = {"valeurs": pd.Index(valeurs).tolist(), "codes": np.asarray(codes).tolist()}
+
+    mesure = df[MESURE_CLIENT] if MESURE_CLIENT in df.columns else pd.Series(0, index=df.index)
+    return {
+        "n": len(df),
+        "colonnes": colonnes,
+        "mesure": mesure.astype(object).where(mesure.notna(), None).tolist(),
+    }
+
+
+def gabarits(rendus: dict) -> dict:
+    """
+    Rendus sans filtre allégés de leurs données : il ne reste que styles et
+    mise en page. Le thème plotly, le même pour toutes les figures, n'est
+    envoyé qu'une fois (clé "theme", remis en place par le navigateur).
+    """
+    resultat, theme = {}, None
+    for composant, rendu in rendus.items():
+        if isinstance(rendu, dict) and "data" in rendu:
+            traces = [{k: v for k, v in trace.items() if k not in CLES_DONNEES} for trace in rendu["data"]]
+            layout = dict(rendu.get("layout", {}))
+            if "template" in layout and (theme is None or layout["template"] == theme):
+                theme = layout.pop("template")
+            rendu = {**rendu, "data": traces, "layout": layout}
+        resultat[composant] = rendu
+    return {"gabarits": resultat, "theme": theme}
@@ -0,0 +1,76 @@
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+# ========================================
+# OPTIONS DES FILTRES : RECHERCHE PAR PRÉFIXE
+# Les valeurs distinctes d'une dimension sont indexées une fois, de la plus
+# fréquente à la plus rare. Chaque clé normalisée (minuscules, sans accents)
+# est rangée dans une liste triée, pour le libellé entier et pour chaque
+# début de mot ("saint" trouve "Villeneuve-Saint-Georges"). Une recherche
+# est une dichotomie puis la lecture des seules clés qui commencent par le
+# texte saisi ; on garde les valeurs les plus fréquentes.
+# ========================================
+LIMITE_OPTIONS = 50
+
+# Dimensions proposées dans les dropdowns du dashboard
+DIMENSIONS_OPTIONS = ["Pays", "Ville_propre", "Contrat_propre", "Domaine_metier", "niveau_salaire"]
+
+RE_DEBUT_MOT = re.compile(r"\b\w")
+
+
+def normaliser(texte) -> str:
+    texte = unicodedata.normalize("NFKD", str(texte).lower())
+    return "".join(c for c in texte if not unicodedata.combining(c))
+
+
+def options(valeurs) -> list:
+    return [{"label": v, "value": v} for v in valeurs]
+
+
+class IndexPrefixes:
+    def __init__(self, serie: pd.Series, limite: int = LIMITE_OPTIONS):
+        self.limite = limite
+        comptes = serie.value_counts()
+        comptes = dict(zip(comptes.index.tolist(), comptes.tolist()))
+        # Rang 0 = valeur la plus fréquente (ex aequo : ordre des libellés)
+        self.valeurs = sorted((v for v, n in comptes.items() if n > 0), key=lambda v: (-comptes[v], str(v)))
+
+        entrees = []
+        for rang, valeur in enumerate(self.valeurs):
+            cle = normaliser(valeur)
+            for debut in {0} | {m.start() for m in RE_DEBUT_MOT.finditer(cle)}:
+                entrees.append((cle[debut:], rang))
+        entrees.sort()
+        self._cles = [cle for cle, _ in entrees]
+        self._rangs = np.array([rang for _, rang in entrees], dtype=np.int64)
+
+    @classmethod
+    def depuis_cles(cls, valeurs: list, cles: list, rangs: np.ndarray, limite: int = LIMITE_OPTIONS):
+        """Index déjà construit (instantané du dashboard) : aucun calcul."""
+        index = cls.__new__(cls)
+        index.valeurs, index._cles, index._rangs, index.limite = valeurs, cles, rangs, limite
+        return index
+
+    def __len__(self):
+        return len(self.valeurs)
+
+    def chercher(self, texte=None, limite: int = None) -> list:
+        """
+        Les `limite` valeurs les plus fréquentes dont le libellé ou un mot
+        commence par `texte` (toutes les valeurs si rien n'est saisi), triées
+        comme les options affichées.
+        """
+        limite = limite or self.limite
+        prefixe = normaliser(texte or "").strip()
+        if not prefixe:
+            rangs = range(min(limite, len(self.valeurs)))
+        else:
+            debut = bisect.bisect_left(self._cles, prefixe)
+            fin = bisect.bisect_left(self._cles, prefixe + "\U0010ffff", lo=debut)
+            rangs = np.unique(self._rangs[debut:fin])[:limite]
+        return sorted(self.valeurs[r] for r in rangs)
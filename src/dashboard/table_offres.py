@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from src.etl.dates import analyser_dates
+
+
+# ========================================
+# TABLE D'OFFRES COMPACTE POUR LE DASHBOARD
+# Chaque colonne à faible cardinalité est stockée une seule fois sous forme
+# de codes entiers + dictionnaire partagé (dtype `category`). Les alias
+# utilisés par les graphiques pointent vers les mêmes tableaux (copy-on-write
+# de pandas : aucune copie tant que personne n'écrit dedans).
+# ========================================
+
+# Colonnes lues dans offres_ml (les autres ne sont pas chargées). Deux formats :
+# celui de classification.py (colonnes déjà harmonisées) et l'ancien format
+# [file:3] (cluster_category, salary_level, confidence_score...)
+COLONNES_DASHBOARD = [
+    "Titre", "Ville", "Contrat", "Date", "jours_depuis", "Pays",
+    "Ville_propre", "Contrat_propre", "Domaine_metier", "niveau_salaire", "pred_tres_demande", "score_salaire",
+    "cluster_category", "salary_level", "confidence_score", "salary_score", "experience_level",
+]
+
+# Format classification.py : nom de colonne -> nom utilisé par les graphiques
+RENOMMAGES = {"score_salaire": "salary_score"}
+
+# Nom utilisé par les graphiques -> colonne source de l'ancien format. Quand
+# le fichier fournit déjà la colonne harmonisée, la source brute (inutilisée)
+# est retirée : un alias présent avec sa source partage toujours ses données.
+ALIAS = {
+    "Ville_propre": "Ville",
+    "Contrat_propre": "Contrat",
+    "Domaine_metier": "cluster_category",
+    "niveau_salaire": "salary_level",
+    "score_popularite": "salary_score",
+}
+
+# Colonnes qui ne servent qu'à calculer une colonne dérivée : retirées après coup
+COLONNES_SOURCES = ["Titre", "Date", "confidence_score"]
+
+# Sans ces colonnes (ou leur source), le dashboard ne peut pas filtrer les offres
+COLONNES_REQUISES = ["Ville_propre", "Contrat_propre", "Domaine_metier", "niveau_salaire",
+                     "pred_tres_demande", "jours_depuis"]
+
+# Une colonne texte est encodée si (valeurs distinctes / lignes) reste sous ce seuil
+SEUIL_CATEGORIE = 0.5
+
+
+def _est_texte(serie: pd.Series) -> bool:
+    return serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype)
+
+
+def compacter(df: pd.DataFrame) -> pd.DataFrame:
+    """Encode en `category` les colonnes texte à faible cardinalité."""
+    df = df.copy()
+    for col in df.columns:
+        serie = df[col]
+        if _est_texte(serie) and not isinstance(serie.dtype, pd.CategoricalDtype):
+            if serie.nunique(dropna=True) <= SEUIL_CATEGORIE * max(len(serie), 1):
+                df[col] = serie.astype("category")
+    return df
+
+
+def jours_depuis(df: pd.DataFrame) -> pd.Series:
+    """
+    Axe temps : jours écoulés depuis la publication, calculés par l'ETL
+    (prepare_data) ; un fichier plus ancien, sans cette colonne, voit sa
+    colonne Date analysée ici. Les dates non reconnues prennent le maximum.
+    """
+    if "jours_depuis" in df.columns:
+        jours = pd.to_numeric(df["jours_depuis"], errors="coerce").astype(float)
+    else:
+        jours = analyser_dates(df["Date"])["jours_depuis"]
+    max_jours = jours.max() if pd.notnull(jours.max()) else 0.0
+    return jours.fillna(max_jours)
+
+
+def construire_table(brut: pd.DataFrame) -> pd.DataFrame:
+    """
+    Table compacte prête pour les callbacks, à partir des colonnes de offres_ml.
+    ValueError si des colonnes indispensables manquent.
+    """
+    df = compacter(brut.rename(columns=RENOMMAGES))
+
+    if "pred_tres_demande" in df.columns:
+        df["pred_tres_demande"] = df["pred_tres_demande"].fillna(0).astype("int8")
+    elif "confidence_score" in df.columns:
+        df["pred_tres_demande"] = (df["confidence_score"] > 0.6).astype("int8")
+    if "jours_depuis" in df.columns or "Date" in df.columns:
+        df["jours_depuis"] = jours_depuis(df)
+    df = df.drop(columns=[c for c in COLONNES_SOURCES if c in df.columns])
+
+    for alias, source in ALIAS.items():
+        if alias in df.columns:
+            df = df.drop(columns=[source], errors="ignore")
+        elif source in df.columns:
+            df[alias] = df[source]
+
+    manquantes = [c for c in COLONNES_REQUISES if c not in df.columns]
+    if manquantes:
+        sources = {**ALIAS, "pred_tres_demande": "confidence_score", "jours_depuis": "Date"}
+        raise ValueError("Colonnes manquantes dans les offres du dashboard : "
+                         + ", ".join(f"{c} (ou {sources[c]})" for c in manquantes))
+    return df
+
+
+def compter(serie: pd.Series, dropna: bool = True) -> pd.Series:
+    """
+    value_counts sans les catégories absentes de la sélection. Comme pour une
+    colonne texte, les ex aequo restent dans l'ordre de première apparition.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.value_counts(dropna=dropna)
+    codes = serie.array.codes
+    presents = pd.unique(codes)
+    if dropna:
+        presents = presents[presents >= 0]
+    comptes = np.bincount(codes + 1, minlength=len(serie.cat.categories) + 1)[presents + 1]
+    tri = np.argsort(-comptes, kind="stable")
+    libelles = np.append(np.asarray(serie.cat.categories, dtype=object), np.nan)[presents[tri]]
+    return pd.Series(comptes[tri], index=pd.Index(libelles, dtype=object, name=serie.name), name="count")
+
+
+def memoire_colonnes(df: pd.DataFrame) -> pd.Series:
+    """Octets occupés par colonne ; un alias ne compte pas (données partagées)."""
+    memoire = df.memory_usage(deep=True, index=False)
+    for alias, source in ALIAS.items():
+        if alias in memoire.index and source in df.columns:
+            memoire[alias] = 0
+    return memoire
+
+
+def rapport_memoire(brut: pd.DataFrame, table: pd.DataFrame) -> str:
+    avant = brut.memory_usage(deep=True, index=False)
+    apres = memoire_colonnes(table)
+    lignes = [f"🧠 Mémoire de la table d'offres ({len(table):,} lignes) :"]
+    for col in table.columns:
+        if col in ALIAS and ALIAS[col] in table.columns:
+            detail = f"alias de {ALIAS[col]}"
+        elif isinstance(table[col].dtype, pd.CategoricalDtype):
+            detail = f"{len(table[col].cat.categories)} valeurs distinctes"
+        else:
+            detail = str(table[col].dtype)
+        lignes.append(f"   {col:<20} {apres[col] / 1024:9.1f} Ko  ({detail})")
+    lignes.append(f"   Total : {apres.sum() / 1e6:.2f} Mo (colonnes lues : {avant.sum() / 1e6:.2f} Mo)")
+    return "\n".join(lignes)
@@ -0,0 +1,20 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+
+# ========================================
+# POINT D'ENTRÉE WSGI (PRODUCTION)
+#   gunicorn -c config/gunicorn.conf.py
+# ou, avec d'autres réglages :
+#   gunicorn --preload "src.dashboard.wsgi:creer_serveur()"
+# Avec preload_app, la fabrique est appelée une seule fois, dans le processus
+# maître : les données du dashboard sont chargées avant le fork et les
+# workers les partagent (copy-on-write, pages de l'instantané projeté).
+# ========================================
+def creer_serveur():
+    """Serveur Flask du dashboard, données chargées et callbacks enregistrés."""
+    from src.dashboard import app_dash
+    return app_dash.server
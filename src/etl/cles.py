@@ -0,0 +1,30 @@
+import hashlib
+import re
+
+
+# ========================================
+# IDENTITÉ DES OFFRES
+# Partagée par le scraper (index des offres vues) et le ML (clusters
+# incrémentaux) : une même offre a la même clé d'une étape à l'autre. Le
+# lien de la carte est gardé dans le CSV brut (colonne Lien) puis dans les
+# données nettoyées, les deux étapes en tirent donc la même clé "id:".
+# Les lignes sans lien (CSV écrits avant cette colonne) retombent sur
+# l'empreinte "h:" des deux côtés.
+# ========================================
+RE_ID_OFFRE = re.compile(r"/emplois/(\d+)\.html")
+
+
+def cle_offre(offre: dict) -> str:
+    """
+    Identité stable d'une offre : l'identifiant Hellowork contenu dans le lien
+    de la carte, sinon une empreinte de titre + entreprise + ville.
+    """
+    m = RE_ID_OFFRE.search(offre.get("lien") or "")
+    if m:
+        return "id:" + m.group(1)
+
+    texte = "|".join(
+        " ".join(str(offre.get(champ, "")).lower().split())
+        for champ in ["titre", "entreprise", "ville"]
+    )
+    return "h:" + hashlib.sha1(texte.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,132 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# ========================================
+# DATES DE PUBLICATION
+# Hellowork affiche surtout des dates relatives ("il y a 18 heures",
+# "il y a 3 jours"), parfois une date absolue ("12/03/2025"). Une seule
+# regex compilée est appliquée en vectorisé (str.extract) aux dates
+# distinctes, puis les résultats sont redistribués par code : quelques
+# dizaines de chaînes analysées, quelle que soit la taille du fichier.
+# Les dates relatives sont ramenées à une date absolue à partir de l'heure
+# d'extraction (UTC) de la page où l'offre a été lue.
+# ========================================
+MOIS = ["janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août",
+        "septembre", "octobre", "novembre", "décembre"]
+
+RE_DATE = re.compile(
+    r"il\s+y\s+a\s+(?P<nombre>\d+(?:[.,]\d+)?|une?)\s*"
+    r"(?P<unite>minutes?|mins?|heures?|h|jours?|semaines?|mois|années?|ans?)\b"
+    r"|(?P<mot>aujourd['’]hui|avant-hier|hier)"
+    r"|\b(?P<jour>\d{1,2})[/.-](?P<mois>\d{1,2})[/.-](?P<annee>\d{4})\b"
+    r"|\b(?P<jour_lettres>\d{1,2})(?:er)?\s+(?P<mois_lettres>" + "|".join(MOIS) + r")\s+(?P<annee_lettres>\d{4})\b"
+    r"|\b(?P<annee_iso>\d{4})-(?P<mois_iso>\d{2})-(?P<jour_iso>\d{2})\b",
+    re.IGNORECASE,
+)
+
+# Durée d'une unité en jours : (multiplicateur, diviseur), pour que
+# "il y a 5 heures" donne exactement 5 / 24 comme l'ancien calcul
+UNITES = {
+    "mi": (1, 1440),  # minutes
+    "h": (1, 24),
+    "he": (1, 24),
+    "jo": (1, 1),
+    "se": (7, 1),
+    "mo": (30, 1),
+    "an": (365, 1),
+}
+MOTS = {"aujourd'hui": 0.0, "aujourd’hui": 0.0, "hier": 1.0, "avant-hier": 2.0}
+
+
+def date_extraction(path: str) -> pd.Timestamp:
+    """
+    Heure d'extraction par défaut d'un fichier brut : sa dernière écriture par
+    le scraper (UTC, à la seconde). Sert aux lignes sans colonne Extraction.
+    """
+    return pd.Timestamp(os.path.getmtime(path), unit="s").floor("s")
+
+
+def _analyser_distinctes(textes: pd.Series) -> pd.DataFrame:
+    """Jours relatifs ("il y a 3 jours") et dates absolues des textes distincts."""
+    morceaux = textes.str.extract(RE_DATE)
+
+    # Relatif : nombre x unité
+    nombre = morceaux["nombre"].str.lower().replace({"un": "1", "une": "1"}).str.replace(",", ".")
+    unite = morceaux["unite"].str.lower().str[:2]
+    multiplicateur = unite.map({u: m for u, (m, _) in UNITES.items()})
+    diviseur = unite.map({u: d for u, (_, d) in UNITES.items()})
+    jours = pd.to_numeric(nombre, errors="coerce") * multiplicateur / diviseur
+    jours = jours.fillna(morceaux["mot"].str.lower().map(MOTS))
+
+    # Absolu : jj/mm/aaaa, "12 mars 2025" ou aaaa-mm-jj
+    numero_mois = morceaux["mois_lettres"].str.lower().map({m: i + 1 for i, m in enumerate(MOIS)})
+    absolue = pd.to_datetime(pd.DataFrame({
+        "year": pd.to_numeric(morceaux["annee"].fillna(morceaux["annee_lettres"]).fillna(morceaux["annee_iso"])),
+        "month": pd.to_numeric(morceaux["mois"].fillna(numero_mois).fillna(morceaux["mois_iso"])),
+        "day": pd.to_numeric(morceaux["jour"].fillna(morceaux["jour_lettres"]).fillna(morceaux["jour_iso"])),
+    }), errors="coerce")
+    return pd.DataFrame({"jours": jours.astype(float), "absolue": absolue.astype("datetime64[ns]")})
+
+
+def analyser_dates(dates: pd.Series, reference=None) -> pd.DataFrame:
+    """
+    Colonnes `jours_depuis` (float, jours écoulés entre la publication et
+    `reference`) et `date_publication` (horodatage absolu) pour chaque date
+    affichée. `reference` : heure d'extraction, une pour toutes les lignes ou
+    une Series alignée sur `dates` (NaT : ligne sans heure connue). Non
+    reconnue : NaN / NaT. Sans `reference`, seules les dates relatives ont un
+    nombre de jours et seules les absolues une date.
+    """
+    codes, distincts = pd.factorize(dates)
+    textes = pd.Series(np.asarray(distincts, dtype=object))
+    textes = textes.where(textes.map(lambda v: isinstance(v, str)))
+    analyse = _analyser_distinctes(textes)
+
+    # Heures d'extraction distinctes (une par page scrapée) ; code -1 = inconnue
+    if isinstance(reference, pd.Series):
+        codes_ref, references = pd.factorize(reference.astype("datetime64[ns]"))
+    else:
+        codes_ref = np.zeros(len(dates), dtype=np.intp)
+        references = [pd.NaT if reference is None else pd.Timestamp(reference)]
+    references = np.append(pd.DatetimeIndex(references).as_unit("ns").to_numpy(), np.datetime64("NaT", "ns"))
+    codes_ref = np.where(codes_ref >= 0, codes_ref, len(references) - 1)
+
+    # Couples (date affichée, heure d'extraction) distincts ; dernière ligne
+    # de `analyse` (NaN / NaT) pour les dates manquantes (code -1)
+    manquante = pd.DataFrame({"jours": [np.nan], "absolue": [pd.NaT]})
+    analyse = pd.concat([analyse, manquante.astype(analyse.dtypes)], ignore_index=True)
+    codes = np.where(codes >= 0, codes, len(analyse) - 1)
+    couples, distincts = pd.factorize(codes.astype(np.int64) * len(references) + codes_ref)
+    analyse = analyse.take(distincts // len(references)).reset_index(drop=True)
+    reference = pd.Series(references[distincts % len(references)])
+
+    jours, absolue = analyse["jours"], analyse["absolue"]
+    publication = (reference - pd.to_timedelta(jours, unit="D")).dt.round("s")
+    jours = jours.fillna((reference - absolue) / pd.Timedelta(days=1))
+    publication = publication.fillna(absolue).astype("datetime64[ns]")
+
+    resultat = pd.DataFrame({"jours_depuis": jours.astype(float), "date_publication": publication}).take(couples)
+    resultat.index = dates.index
+    return resultat
+
+
+# Ancienne analyse, ligne à ligne (référence du test d'équivalence et du benchmark)
+def extraire_jours(s):
+    if isinstance(s, str):
+        s = s.strip().lower()
+        if "jour" in s:
+            try:
+                return float(s.split("il y a")[1].split("jour")[0].strip())
+            except Exception:
+                return None
+        if "heure" in s:
+            try:
+                h = float(s.split("il y a")[1].split("heure")[0].strip())
+                return h / 24.0
+            except Exception:
+                return None
+    return None
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from src.etl.regles import charger_regles
+
+
+# ========================================
+# DOMAINE MÉTIER À PARTIR DU TITRE
+# Les mots-clés et leur ordre de priorité sont dans config/settings.yaml
+# ========================================
+def extraire_domaine(titre: str, regles=None) -> str:
+    """
+    Détecte un domaine métier à partir du titre.
+    Règles simples basées sur des mots-clés français.
+    (Version ligne à ligne, gardée comme référence.)
+    """
+    regles = regles or charger_regles()
+    t = str(titre).lower()
+    for domaine, mots in regles.domaines_mots:
+        if any(m in t for m in mots):
+            return domaine
+
+    # Par défaut
+    return regles.domaine_defaut
+
+
+def classer_domaines(titres: pd.Series, regles=None) -> pd.Series:
+    """
+    Version vectorisée de `extraire_domaine`.
+
+    Les titres se répètent beaucoup : seuls les titres distincts sont
+    classés, puis le résultat est redistribué par code (factorize). Chaque
+    domaine, dans l'ordre de priorité, n'est testé que sur les titres
+    encore non classés, avec sa regex précompilée.
+    """
+    regles = regles or charger_regles()
+
+    codes, distincts = pd.factorize(titres.fillna("nan").astype(str))
+    textes = pd.Series(distincts, dtype=object).str.lower()
+    domaines = np.full(len(textes), regles.domaine_defaut, dtype=object)
+    restants = np.arange(len(textes))
+    for domaine, regex in regles.domaines:
+        if len(restants) == 0:
+            break
+        trouve = textes.str.contains(regex, na=False).to_numpy(dtype=bool)
+        domaines[restants[trouve]] = domaine
+        restants = restants[~trouve]
+        textes = textes[~trouve]
+    return pd.Series(domaines[codes], index=titres.index)
@@ -1,4 +1,8 @@
+import argparse
 import os
+import sys
+from collections import Counter
+
 import numpy as np
 import pandas as pd
 from sklearn.impute import SimpleImputer  # gardé si tu l'utilises plus tard
@@ -7,189 +11,217 @@ from sklearn.impute import SimpleImputer  # gardé si tu l'utilises plus tard
 # ========================================
 # CHEMINS
 # ========================================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 RAW_PATH = os.path.join(BASE_DIR, "data", "raw", "offres_hellowork.csv")
 INTERIM_DIR = os.path.join(BASE_DIR, "data", "interim")
 os.makedirs(INTERIM_DIR, exist_ok=True)
-CLEAN_PATH = os.path.join(INTERIM_DIR, "offres_hellowork_clean.csv")
-
-
-print("📂 Chargement des données brutes...")
-df = pd.read_csv(RAW_PATH, encoding="utf-8")
-print(f"✅ {len(df)} offres chargées")
-
-
-# ========================================
-# NETTOYAGE DE BASE
-# ========================================
-print("\n🧹 Nettoyage des espaces et formatage...")
-
-# Nettoyer les espaces pour toutes les colonnes texte
-for col in ["Titre", "Entreprise", "Ville", "Contrat", "Date"]:
-    if col in df.columns:
-        df[col] = (
-            df[col]
-            .astype(str)
-            .str.strip()
-            .str.replace(r"\s+", " ", regex=True)
-        )
+CLEAN_BASE = os.path.join(INTERIM_DIR, "offres_hellowork_clean")  # .csv ou .parquet
 
+sys.path.insert(0, BASE_DIR)
+from src.etl.dates import analyser_dates, date_extraction  # noqa: E402
+from src.etl.domaines import classer_domaines  # noqa: E402
+from src.etl.stockage import EcritureParBlocs, ecrire_offres  # noqa: E402
+from src.scraping.raw_store import COLONNE_EXTRACTION, FORMAT_EXTRACTION  # noqa: E402
 
-# ========================================
-# TRAITEMENT DES DONNÉES MANQUANTES
-# Important: On ne supprime PAS les lignes !
-# ========================================
-print("\n⚠️ Traitement des données manquantes (SANS suppression)...")
-
-# 1) TITRE : Si manquant, mettre "Non spécifié"
-df["Titre"] = (
-    df["Titre"]
-    .fillna("Non spécifié")
-    .replace(["", "nan", "NaN"], "Non spécifié")
-)
-
-# 2) ENTREPRISE : Si manquant, mettre "Entreprise non communiquée"
-df["Entreprise"] = (
-    df["Entreprise"]
-    .fillna("Entreprise non communiquée")
-    .replace(["", "nan", "NaN"], "Entreprise non communiquée")
-)
-
-# 3) VILLE : Extraire ville et département (format: "Ville - 75")
-ville_dep = df["Ville"].str.extract(r"^(?P<ville>.+?)\s*-\s*(?P<departement>\d+)$")
-df["Ville_propre"] = ville_dep["ville"].fillna(df["Ville"]).fillna("Non spécifié").str.strip()
-df["Departement"] = pd.to_numeric(ville_dep["departement"], errors="coerce")
-
-# Si département manquant, mettre 0 (code pour "non spécifié")
-df["Departement"] = df["Departement"].fillna(0).astype(int)
-
-# 4) CONTRAT : Normaliser et gérer les manquants
-df["Contrat_propre"] = (
-    df["Contrat"]
-    .fillna("NON_SPECIFIE")
-    .astype(str)
-    .str.upper()
-    .str.replace(" ", "", regex=False)
-    .replace(["", "NAN", "NONE"], "NON_SPECIFIE")
-)
-
-# 5) DATE : Garder telle quelle (on peut la traiter plus tard si besoin)
-df["Date"] = (
-    df["Date"]
-    .fillna("Date inconnue")
-    .replace(["", "nan", "NaN"], "Date inconnue")
-)
 
-
-# ========================================
-# EXTRACTION DE MOTS-CLÉS DU TITRE
-# Pour faciliter le clustering par domaine
-# ========================================
-print("\n🔍 Extraction des mots-clés métiers...")
-
-
-def extraire_domaine(titre: str) -> str:
+def nettoyer_offres(df: pd.DataFrame, verbeux: bool = True, reference=None) -> pd.DataFrame:
     """
-    Détecte un domaine métier à partir du titre.
-    Règles simples basées sur des mots-clés français.
+    Toutes les étapes de nettoyage, ligne à ligne : le résultat d'un fichier
+    traité d'un bloc est identique à la concaténation de ses morceaux.
+    Les dates relatives ("il y a 3 jours") se rapportent à l'heure
+    d'extraction de leur page (colonne Extraction du CSV brut) ; `reference`
+    sert pour les lignes qui n'en ont pas (CSV écrits avant cette colonne).
     """
-    t = str(titre).lower()
-
-    # Restauration / Hôtellerie
-    if any(m in t for m in ["cuisinier", "serveur", "restauration", "hôtel", "hotel", "chef de rang", "restaurant"]):
-        return "Restauration"
-
-    # Logistique / Transport
-    if any(m in t for m in ["logistique", "chauffeur", "livreur", "transport", "pl de nuit", "magasinier", "cariste"]):
-        return "Logistique"
-
-    # BTP / Construction / Travaux
-    if any(m in t for m in ["conducteur de travaux", "chantier", "géotechnique", "geotechnique", "ingénieur travaux", "travaux publics", "bâtiment", "batiment", "scierie"]):
-        return "BTP"
-
-    # Électricité / Énergie / Technique
-    if any(m in t for m in ["électricien", "electricien", "électricité", "electricite", "électrique", "electric", "énergie", "energie", "technicien", "maintenance"]):
-        return "Énergie / Technique"
-
-    # Qualité / QHSE / Sécurité
-    if any(m in t for m in ["qhse", "qse", "qualité", "qualite", "sécurité", "securite", "hse"]):
-        return "Qualité / QHSE"
-
-    # Finance / Assurance / Actuariat / Comptabilité
-    if any(m in t for m in ["actuaire", "risques", "assurances", "assurance", "comptable", "comptabilité", "audit", "contrôle de gestion", "controle de gestion"]):
-        return "Finance / Assurance"
-
-    # Informatique / SI / Data / Digital
-    if any(m in t for m in [
-        "développeur", "developpeur", "développeuse", "developer",
-        "informatique", "data", "si ", "système d'information", "systèmes d'information",
-        "logiciel", "software", "it", "tech", "numérique", "digital", "progiciel"
-    ]):
-        return "Informatique"
-
-    # Commerce / Vente / Magasin
-    if any(m in t for m in [
-        "commercial", "vente", "vendeur", "magasin", "magasinier",
-        "conseiller de vente", "conseiller client", "relation client",
-        "directeur de magasin", "responsable magasin"
-    ]):
-        return "Commerce"
-
-    # Administration / Assistant / Support
-    if any(m in t for m in [
-        "assistant", "assistante", "administratif", "administrative",
-        "gestionnaire", "secrétaire", "back office"
-    ]):
-        return "Administration"
-
-    # Management / Direction / Chef de projet
-    if any(m in t for m in [
-        "manager", "responsable", "directeur", "directrice",
-        "chef de projet", "chef de département", "chef d'équipe", "chef d equipe",
-        "responsable agence", "responsable des projets"
-    ]):
-        return "Management"
-
-    # Par défaut
-    return "Autre"
-
-
-
-# Appliquer la fonction
-df["Domaine_metier"] = df["Titre"].apply(extraire_domaine)
-
-
-# ========================================
-# CRÉATION DU TEXTE COMPLET POUR ML
-# ========================================
-print("\n📝 Création du texte complet pour analyse ML...")
-
-df["texte_complet"] = (
-    df["Titre"].fillna("") + " " +
-    df["Entreprise"].fillna("") + " " +
-    df["Ville_propre"].fillna("") + " " +
-    df["Contrat_propre"].fillna("") + " " +
-    df["Domaine_metier"].fillna("")
-).str.strip()
+    # ========================================
+    # NETTOYAGE DE BASE
+    # ========================================
+    if verbeux:
+        print("\n🧹 Nettoyage des espaces et formatage...")
+
+    # Nettoyer les espaces pour toutes les colonnes texte
+    for col in ["Titre", "Entreprise", "Ville", "Contrat", "Date"]:
+        if col in df.columns:
+            df[col] = (
+                df[col]
+                .astype(str)
+                .str.strip()
+                .str.replace(r"\s+", " ", regex=True)
+            )
+
+    # ========================================
+    # TRAITEMENT DES DONNÉES MANQUANTES
+    # Important: On ne supprime PAS les lignes !
+    # ========================================
+    if verbeux:
+        print("\n⚠️ Traitement des données manquantes (SANS suppression)...")
+
+    # 1) TITRE : Si manquant, mettre "Non spécifié"
+    df["Titre"] = (
+        df["Titre"]
+        .fillna("Non spécifié")
+        .replace(["", "nan", "NaN"], "Non spécifié")
+    )
+
+    # 2) ENTREPRISE : Si manquant, mettre "Entreprise non communiquée"
+    df["Entreprise"] = (
+        df["Entreprise"]
+        .fillna("Entreprise non communiquée")
+        .replace(["", "nan", "NaN"], "Entreprise non communiquée")
+    )
+
+    # 3) VILLE : Extraire ville et département (format: "Ville - 75")
+    ville_dep = df["Ville"].str.extract(r"^(?P<ville>.+?)\s*-\s*(?P<departement>\d+)$")
+    df["Ville_propre"] = ville_dep["ville"].fillna(df["Ville"]).fillna("Non spécifié").str.strip()
+    df["Departement"] = pd.to_numeric(ville_dep["departement"], errors="coerce")
+
+    # Si département manquant, mettre 0 (code pour "non spécifié")
+    df["Departement"] = df["Departement"].fillna(0).astype(int)
+
+    # 4) CONTRAT : Normaliser et gérer les manquants
+    df["Contrat_propre"] = (
+        df["Contrat"]
+        .fillna("NON_SPECIFIE")
+        .astype(str)
+        .str.upper()
+        .str.replace(" ", "", regex=False)
+        .replace(["", "NAN", "NONE"], "NON_SPECIFIE")
+    )
+
+    # 5) DATE : Garder telle quelle (on peut la traiter plus tard si besoin)
+    df["Date"] = (
+        df["Date"]
+        .fillna("Date inconnue")
+        .replace(["", "nan", "NaN"], "Date inconnue")
+    )
+
+    # 6) PUBLICATION : jours écoulés et date absolue (NaN / vide si non reconnue),
+    # calculés ici une fois pour toutes plutôt qu'au démarrage du dashboard
+    if COLONNE_EXTRACTION in df.columns:
+        extraction = pd.to_datetime(df[COLONNE_EXTRACTION], format=FORMAT_EXTRACTION, errors="coerce")
+        reference = extraction.fillna(pd.NaT if reference is None else pd.Timestamp(reference))
+    publication = analyser_dates(df["Date"], reference)
+    df["jours_depuis"] = publication["jours_depuis"]
+    df["date_publication"] = publication["date_publication"]
+
+    # ========================================
+    # EXTRACTION DE MOTS-CLÉS DU TITRE
+    # Pour faciliter le clustering par domaine
+    # ========================================
+    if verbeux:
+        print("\n🔍 Extraction des mots-clés métiers...")
+
+    # Règles dans config/settings.yaml : une regex précompilée par domaine,
+    # appliquée en vectorisé dans l'ordre de priorité
+    df["Domaine_metier"] = classer_domaines(df["Titre"])
+
+    # ========================================
+    # CRÉATION DU TEXTE COMPLET POUR ML
+    # ========================================
+    if verbeux:
+        print("\n📝 Création du texte complet pour analyse ML...")
+
+    df["texte_complet"] = (
+        df["Titre"].fillna("") + " " +
+        df["Entreprise"].fillna("") + " " +
+        df["Ville_propre"].fillna("") + " " +
+        df["Contrat_propre"].fillna("") + " " +
+        df["Domaine_metier"].fillna("")
+    ).str.strip()
+
+    return df
 
 
 # ========================================
 # CALCUL DE STATISTIQUES
+# Agrégats cumulés : fonctionnent aussi bien sur tout le fichier que bloc par bloc
 # ========================================
-print("\n📊 Statistiques des données nettoyées:")
-print(f"  - Total offres: {len(df)}")
-print(f"  - Villes uniques: {df['Ville_propre'].nunique()}")
-print(f"  - Contrats uniques: {df['Contrat_propre'].nunique()}")
-print(f"  - Domaines métiers:")
-for domaine, count in df["Domaine_metier"].value_counts().items():
-    print(f"      {domaine}: {count}")
+class StatistiquesOffres:
+    def __init__(self):
+        self.total = 0
+        self.villes = set()
+        self.contrats = set()
+        self.domaines = Counter()
+
+    def ajouter(self, df: pd.DataFrame) -> None:
+        self.total += len(df)
+        self.villes.update(df["Ville_propre"].dropna().unique())
+        self.contrats.update(df["Contrat_propre"].dropna().unique())
+        self.domaines.update(df["Domaine_metier"].value_counts().to_dict())
+
+    def afficher(self) -> None:
+        print("\n📊 Statistiques des données nettoyées:")
+        print(f"  - Total offres: {self.total}")
+        print(f"  - Villes uniques: {len(self.villes)}")
+        print(f"  - Contrats uniques: {len(self.contrats)}")
+        print(f"  - Domaines métiers:")
+        for domaine, count in sorted(self.domaines.items(), key=lambda x: -x[1]):
+            print(f"      {domaine}: {count}")
+
+
+def preparer(raw_path: str = RAW_PATH, clean_base: str = CLEAN_BASE, chunksize: int = None,
+             fmt: str = None, reference=None):
+    """
+    Nettoie le CSV brut et écrit le fichier intermédiaire (CSV ou Parquet,
+    voir src/etl/stockage.py).
 
+    Les dates relatives se rapportent à l'heure d'extraction de chaque ligne ;
+    pour les lignes sans heure d'extraction, à `reference`, par défaut la
+    dernière écriture du fichier brut par le scraper.
 
-# ========================================
-# SAUVEGARDE
-# ========================================
-df.to_csv(CLEAN_PATH, index=False, encoding="utf-8")
-print(f"\n✅ Données nettoyées sauvegardées dans: {CLEAN_PATH}")
-print(f"✅ Forme finale: {df.shape}")
-print("\n👀 Aperçu des 20 premières lignes:")
-print(df[["Titre", "Entreprise", "Ville_propre", "Contrat_propre", "Domaine_metier"]].head(20))
+    Avec `chunksize`, le fichier brut est lu par blocs de `chunksize` lignes,
+    chaque bloc est nettoyé puis ajouté au fichier de sortie : la mémoire
+    reste bornée quelle que soit la taille de l'archive.
+    """
+    stats = StatistiquesOffres()
+    reference = pd.Timestamp(reference) if reference is not None else date_extraction(raw_path)
+
+    print("📂 Chargement des données brutes...")
+    if chunksize is None:
+        df = pd.read_csv(raw_path, encoding="utf-8")
+        print(f"✅ {len(df)} offres chargées")
+        df = nettoyer_offres(df, reference=reference)
+        stats.ajouter(df)
+        apercu = df
+        clean_path = ecrire_offres(df, clean_base, fmt)
+        n_colonnes = df.shape[1]
+    else:
+        apercu, n_colonnes = None, 0
+        sortie = EcritureParBlocs(clean_base, fmt)
+        morceaux = pd.read_csv(raw_path, encoding="utf-8", chunksize=chunksize)
+        try:
+            for i, morceau in enumerate(morceaux):
+                morceau = nettoyer_offres(morceau, verbeux=(i == 0), reference=reference)
+                stats.ajouter(morceau)
+                sortie.ecrire(morceau)
+                if apercu is None:
+                    apercu, n_colonnes = morceau.head(20), morceau.shape[1]
+                print(f"   … bloc {i + 1} : {stats.total} offres traitées")
+        finally:
+            sortie.fermer()
+        if apercu is None:
+            raise ValueError(f"Aucune offre dans {raw_path}")
+        clean_path = sortie.path
+
+    stats.afficher()
+
+    # ========================================
+    # SAUVEGARDE
+    # ========================================
+    print(f"\n✅ Données nettoyées sauvegardées dans: {clean_path}")
+    print(f"✅ Forme finale: {(stats.total, n_colonnes)}")
+    print("\n👀 Aperçu des 20 premières lignes:")
+    print(apercu[["Titre", "Entreprise", "Ville_propre", "Contrat_propre", "Domaine_metier"]].head(20))
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nettoyage des offres brutes")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="traite le CSV brut par blocs de N lignes (mémoire bornée)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="format de sortie (par défaut : config/settings.yaml)")
+    parser.add_argument("--date-extraction", default=None,
+                        help="heure d'extraction des offres sans colonne Extraction "
+                             "(UTC, ex. 2025-12-17T16:52), par défaut la date de modification du CSV brut")
+    args = parser.parse_args()
+    preparer(chunksize=args.chunksize, fmt=args.format, reference=args.date_extraction)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+import yaml
+
+
+# ========================================
+# MOTEUR DE RÈGLES (config/settings.yaml)
+# Le fichier est compilé une fois ; la forme compilée est mise en cache
+# selon l'empreinte du fichier et recompilée dès que son contenu change.
+# ========================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SETTINGS_PATH = os.path.join(BASE_DIR, "config", "settings.yaml")
+
+
+def compiler_mots_cles(mots: list):
+    """Une regex d'alternance précompilée (mots-clés échappés, recherche de sous-chaîne)."""
+    return re.compile("|".join(re.escape(str(m)) for m in mots))
+
+
+class Regles:
+    """Forme compilée des règles métiers."""
+
+    def __init__(self, config: dict, empreinte: str = ""):
+        self.empreinte = empreinte
+
+        # Domaines (ordre = priorité)
+        domaines = config["domaines"]
+        self.domaine_defaut = domaines.get("defaut", "Autre")
+        self.domaines_mots = [(r["domaine"], [str(m) for m in r["mots_cles"]]) for r in domaines["regles"]]
+        self.domaines = [(domaine, compiler_mots_cles(mots)) for domaine, mots in self.domaines_mots]
+
+        # Salaire
+        salaire = config["salaire"]
+        self.salaire_base = salaire["base"]
+        self.salaire_min = salaire["min"]
+        self.salaire_max = salaire["max"]
+        self.salaire_contrat = [(str(c["motif"]).upper(), c["points"]) for c in salaire["contrat"]]
+        self.salaire_domaine = dict(salaire["domaine"])
+        self.salaire_titre = [(compiler_mots_cles(g["mots_cles"]), g["points"]) for g in salaire["titre"]]
+        self.niveaux_bornes = list(salaire["niveaux"]["bornes"])
+        self.niveaux_labels = list(salaire["niveaux"]["labels"])
+
+        # Popularité
+        popularite = config["popularite"]
+        self.popularite_defaut = popularite["defaut"]
+        self.popularite_domaines = dict(popularite["domaines"])
+
+    # ---------- salaire ----------
+    def scorer_salaires(self, df: pd.DataFrame) -> pd.Series:
+        """Score de salaire 0-100 de chaque offre (contrat, domaine, mots du titre)."""
+        score = np.full(len(df), self.salaire_base, dtype=np.int64)
+
+        contrats = df["Contrat_propre"].fillna("nan").astype(str).str.upper()
+        deja = np.zeros(len(df), dtype=bool)
+        for motif, points in self.salaire_contrat:
+            trouve = contrats.str.contains(motif, regex=False).to_numpy(dtype=bool) & ~deja
+            score[trouve] += points
+            deja |= trouve
+
+        domaines = df["Domaine_metier"].fillna("nan").astype(str)
+        score += domaines.map(self.salaire_domaine).fillna(0).to_numpy(dtype=np.int64)
+
+        titres = df["Titre"].fillna("nan").astype(str).str.lower()
+        for regex, points in self.salaire_titre:
+            score[titres.str.contains(regex).to_numpy(dtype=bool)] += points
+
+        return pd.Series(np.clip(score, self.salaire_min, self.salaire_max), index=df.index)
+
+    def niveaux_salaire(self, scores: pd.Series) -> pd.Series:
+        return pd.cut(scores, bins=self.niveaux_bornes, labels=self.niveaux_labels)
+
+    # ---------- popularité ----------
+    def points_popularite(self, domaines: pd.Series) -> pd.Series:
+        return domaines.map(self.popularite_domaines).fillna(self.popularite_defaut)
+
+
+_cache = {}          # empreinte -> Regles
+_derniere_lecture = {}  # chemin -> (mtime_ns, taille, empreinte)
+_verrou = threading.Lock()
+
+
+def charger_regles(path: str = SETTINGS_PATH) -> Regles:
+    """
+    Règles compilées du fichier `path`.
+
+    L'appel est peu coûteux : tant que la date et la taille du fichier ne
+    changent pas, la forme compilée en cache est renvoyée directement ; sinon
+    le contenu est haché et recompilé seulement si l'empreinte est nouvelle.
+    Un processus long (dashboard) voit donc les modifications sans redémarrer.
+    """
+    stat = os.stat(path)
+    with _verrou:
+        lecture = _derniere_lecture.get(path)
+        if lecture and lecture[:2] == (stat.st_mtime_ns, stat.st_size) and lecture[2] in _cache:
+            return _cache[lecture[2]]
+
+        with open(path, "rb") as f:
+            contenu = f.read()
+        empreinte = hashlib.sha256(contenu).hexdigest()
+        if empreinte not in _cache:
+            if len(_cache) >= 8:
+                _cache.pop(next(iter(_cache)))
+            _cache[empreinte] = Regles(yaml.safe_load(contenu), empreinte)
+        _derniere_lecture[path] = (stat.st_mtime_ns, stat.st_size, empreinte)
+        return _cache[empreinte]
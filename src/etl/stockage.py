@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+import yaml
+
+
+# ========================================
+# STOCKAGE DES OFFRES : CSV ou Parquet
+# Le format est choisi une fois pour toutes les étapes (interim, clusters,
+# ML) dans config/settings.yaml, ou via la variable OFFRES_FORMAT.
+# Chaque chemin est donné sans extension : ".csv" ou ".parquet" est ajouté.
+# ========================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SETTINGS_PATH = os.path.join(BASE_DIR, "config", "settings.yaml")
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+# Colonnes à faible cardinalité : encodées en dictionnaire dans Parquet
+COLONNES_CATEGORIELLES = [
+    "Ville_propre", "Contrat_propre", "Domaine_metier", "cluster_nom", "niveau_salaire",
+]
+
+# Horodatages : relus en datetime depuis le CSV, comme depuis Parquet
+COLONNES_DATES = ["date_publication"]
+
+
+def format_stockage() -> str:
+    fmt = os.environ.get("OFFRES_FORMAT")
+    if not fmt and os.path.exists(SETTINGS_PATH):
+        with open(SETTINGS_PATH, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        fmt = (config.get("stockage") or {}).get("format")
+    fmt = (fmt or "csv").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Format de stockage inconnu : {fmt} (attendu : {', '.join(FORMATS)})")
+    return fmt
+
+
+def chemin(base: str, fmt: str = None) -> str:
+    return base + FORMATS[fmt or format_stockage()]
+
+
+def _vers_table(df: pd.DataFrame, schema=None):
+    import pyarrow as pa
+
+    df = df.copy()
+    for col in COLONNES_CATEGORIELLES:
+        if col in df.columns:
+            df[col] = df[col].astype(str).where(df[col].notna()).astype("category")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Dictionnaires toujours en int32 -> string : schéma stable d'un bloc à l'autre
+    for i, champ in enumerate(table.schema):
+        if pa.types.is_dictionary(champ.type):
+            table = table.set_column(i, champ.name, table.column(i).cast(pa.dictionary(pa.int32(), pa.string())))
+    if schema is not None:
+        table = table.cast(schema)
+    return table
+
+
+def ecrire_offres(df: pd.DataFrame, base: str, fmt: str = None) -> str:
+    """Écrit les offres au format configuré et retourne le chemin du fichier."""
+    fmt = fmt or format_stockage()
+    path = chemin(base, fmt)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(_vers_table(df), path, compression="zstd")
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+class EcritureParBlocs:
+    """Écriture bloc par bloc (mode streaming de prepare_data.py)."""
+
+    def __init__(self, base: str, fmt: str = None):
+        self.fmt = fmt or format_stockage()
+        self.path = chemin(base, self.fmt)
+        self._writer = None
+        self._schema = None
+        self._premier = True
+
+    def ecrire(self, df: pd.DataFrame) -> None:
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            table = _vers_table(df, self._schema)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._premier else "a", header=self._premier,
+                      index=False, encoding="utf-8")
+        self._premier = False
+
+    def fermer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def lire_offres(base: str, colonnes: list = None, categories: bool = False,
+                fmt: str = None) -> pd.DataFrame:
+    """
+    Lit les offres d'une étape. `colonnes` limite la lecture aux colonnes
+    utiles (les colonnes absentes du fichier sont ignorées) : en Parquet,
+    les autres colonnes ne sont même pas lues sur le disque.
+
+    Par défaut les colonnes encodées en dictionnaire sont rendues en texte
+    simple, comme après un read_csv ; `categories=True` les garde en
+    `category` pandas.
+    """
+    fmt = fmt or format_stockage()
+    path = chemin(base, fmt)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        if colonnes is not None:
+            presentes = set(pq.read_schema(path).names)
+            colonnes = [c for c in colonnes if c in presentes]
+        df = pd.read_parquet(path, columns=colonnes)
+        if not categories:
+            for col in df.columns:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].astype(df[col].cat.categories.dtype)
+        return df
+
+    voulues = None if colonnes is None else set(colonnes)
+    usecols = None if voulues is None else (lambda c: c in voulues)
+    df = pd.read_csv(path, encoding="utf-8", usecols=usecols)
+    for col in COLONNES_DATES:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col]).astype("datetime64[ns]")
+    if categories:
+        for col in COLONNES_CATEGORIELLES:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+    return df
@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import DBSCAN, KMeans
+from threadpoolctl import threadpool_limits
+
+from src.ml.evaluation import evaluer
+from src.ml.hierarchique import agglomeratif
+
+
+# ========================================
+# BALAYAGE DES ALGORITHMES DE CLUSTERING (clustering.py, mode complet)
+# Chaque candidat de la grille (k pour KMeans et Agglomerative, eps et
+# min_samples pour DBSCAN) est entraîné puis évalué (evaluation.py) dans un
+# pool de processus. La matrice creuse est écrite une fois (data, indices,
+# indptr en .npy) et chaque worker la relit en mmap : les pages sont
+# partagées, pas copiées dans chaque processus. Un thread BLAS/OpenMP par
+# worker, pour ne pas surcharger les CPU.
+# Le gagnant est le meilleur candidat éligible selon le critère choisi :
+# au moins 2 clusters, au plus `k_max` (bruit exclu), au plus `bruit_max`
+# d'offres en bruit (DBSCAN). Sur des offres en doublon, DBSCAN trouve
+# des dizaines de micro-clusters à très bonne silhouette, inutilisables
+# dans le dashboard.
+# Ex æquo : le premier dans l'ordre de la grille.
+# ========================================
+GRILLE = {
+    "KMeans": [{"n_clusters": k} for k in range(4, 13)],
+    "Agglomerative": [{"n_clusters": k} for k in range(4, 13)],
+    "DBSCAN": [{"eps": eps, "min_samples": m} for eps in (0.3, 0.5, 0.7, 0.9) for m in (3, 5, 10)],
+}
+# Critère -> sens (1 : plus haut = mieux, -1 : plus bas = mieux)
+CRITERES = {"silhouette": 1, "silhouette_centroides": 1, "calinski_harabasz": 1, "davies_bouldin": -1}
+K_MAX = 12
+BRUIT_MAX = 0.2
+
+_X = None
+_limites = None
+
+
+def _partager(X, dossier: str) -> tuple:
+    """Écrit la matrice CSR sur disque, relue en mmap par les workers."""
+    X = sparse.csr_matrix(X)
+    for nom in ("data", "indices", "indptr"):
+        np.save(os.path.join(dossier, f"{nom}.npy"), getattr(X, nom))
+    return dossier, X.shape
+
+
+def _initialiser(dossier: str, forme: tuple) -> None:
+    global _X, _limites
+    data, indices, indptr = (np.load(os.path.join(dossier, f"{nom}.npy"), mmap_mode="r")
+                             for nom in ("data", "indices", "indptr"))
+    _X = sparse.csr_matrix((data, indices, indptr), shape=forme, copy=False)
+    _limites = threadpool_limits(1)
+
+
+def _pic_mo():
+    """Pic de mémoire résidente du processus (VmHWM), None hors Linux."""
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024
+    except OSError:
+        return None
+
+
+def _remettre_pic() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _ajuster(algo: str, params: dict) -> np.ndarray:
+    if algo == "KMeans":
+        return KMeans(random_state=42, n_init=10, max_iter=300, **params).fit_predict(_X)
+    if algo == "Agglomerative":
+        return agglomeratif(_X, params["n_clusters"])
+    return DBSCAN(**params).fit_predict(_X)
+
+
+def _candidat(tache: tuple) -> dict:
+    algo, params, exacte = tache
+    _remettre_pic()
+    avant = _pic_mo()
+    debut = time.perf_counter()
+    labels = _ajuster(algo, params)
+    duree = time.perf_counter() - debut
+    apres = _pic_mo()
+    return {
+        "algo": algo, "params": params, "labels": labels,
+        "k": len(set(labels.tolist()) - {-1}), "bruit": float(np.mean(labels == -1)),
+        "ajustement_s": duree, "pic_mo": None if avant is None else apres - avant,
+        "mesures": evaluer(_X, labels, exacte=exacte),
+    }
+
+
+def balayer(X, grille: dict = None, n_workers: int = None, exacte: bool = False) -> list:
+    """Tous les candidats de la grille, dans son ordre, entraînés et évalués en parallèle."""
+    grille = GRILLE if grille is None else grille
+    taches = [(algo, params, exacte) for algo, candidats in grille.items() for params in candidats]
+    with tempfile.TemporaryDirectory() as dossier:
+        with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count(),
+                                 initializer=_initialiser, initargs=_partager(X, dossier)) as pool:
+            return list(pool.map(_candidat, taches))
+
+
+def valeur(resultat: dict, critere: str):
+    """Score du candidat selon le critère, None s'il n'a pas pu être évalué."""
+    mesures = resultat["mesures"]
+    if mesures["silhouette"] is None:
+        return None
+    return mesures["silhouette"]["score"] if critere == "silhouette" else mesures[critere]
+
+
+def choisir(resultats: list, critere: str = "silhouette", k_max: int = K_MAX,
+            bruit_max: float = BRUIT_MAX) -> int:
+    """Position du gagnant ; chaque résultat reçoit sa clé "eligible"."""
+    for r in resultats:
+        r["eligible"] = valeur(r, critere) is not None and 2 <= r["k"] <= k_max and r["bruit"] <= bruit_max
+    eligibles = [i for i, r in enumerate(resultats) if r["eligible"]]
+    if not eligibles:
+        raise ValueError(f"aucun candidat éligible (k ≤ {k_max}, bruit ≤ {bruit_max:.0%})")
+    return max(eligibles, key=lambda i: CRITERES[critere] * valeur(resultats[i], critere))
+
+
+def nom_candidat(resultat: dict) -> str:
+    return f"{resultat['algo']} " + ", ".join(f"{c}={v}" for c, v in resultat["params"].items())
+
+
+def ecrire_rapport(resultats: list, gagnant: int, path: str, **contexte) -> None:
+    """Rapport JSON du balayage : contexte, candidats (sans labels), gagnant."""
+    rapport = dict(contexte, gagnant=nom_candidat(resultats[gagnant]), candidats=[
+        {c: v for c, v in r.items() if c != "labels"} | {"nom": nom_candidat(r)} for r in resultats
+    ])
+    dossier = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dossier, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(rapport, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def k_du_rapport(path: str):
+    """Nombre de clusters du gagnant du dernier balayage, ou None sans rapport."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        rapport = json.load(f)
+    return next((c["k"] for c in rapport["candidats"] if c["nom"] == rapport["gagnant"]), None)
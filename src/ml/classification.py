@@ -1,8 +1,8 @@
 import os
-import pandas as pd
+import sys
+import numpy as np
 
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 
@@ -10,36 +10,35 @@ from sklearn.metrics import accuracy_score, classification_report
 # ========================================
 # CHEMINS
 # ========================================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-CLUSTERS_PATH = os.path.join(BASE_DIR, "data", "processed", "offres_clusters.csv")
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CLUSTERS_BASE = os.path.join(BASE_DIR, "data", "processed", "offres_clusters")
 PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
 os.makedirs(PROCESSED_DIR, exist_ok=True)
-ML_PATH = os.path.join(PROCESSED_DIR, "offres_ml.csv")
+ML_BASE = os.path.join(PROCESSED_DIR, "offres_ml")  # .csv ou .parquet
+
+sys.path.insert(0, BASE_DIR)
+from src.etl.regles import charger_regles  # noqa: E402
+from src.etl.stockage import ecrire_offres, lire_offres  # noqa: E402
+from src.ml.features import features_tfidf, nettoyer_textes, rapport_features  # noqa: E402
 
 
 # ========================================
 # CHARGEMENT DES DONNÉES
 # ========================================
 print("📂 Chargement des données avec clusters...")
-df = pd.read_csv(CLUSTERS_PATH, encoding="utf-8")
+df = lire_offres(CLUSTERS_BASE)
 print(f"✅ {len(df)} offres chargées")
 
 
 # ========================================
-# PRÉTRAITEMENT TEXTE (même logique que clustering)
+# PRÉTRAITEMENT TEXTE (même nettoyage que clustering, voir features.py)
 # ========================================
-def nettoyer_texte(texte: str) -> str:
-    t = str(texte).lower()
-    remplacements = [
-        "h/f", "h / f", "(h/f)", "(h / f)",
-        " cdi ", " cdd ", " stage ", " alternance ",
-        " france ", " hf ", " h f "
-    ]
-    for r in remplacements:
-        t = t.replace(r, " ")
-    return t
+df["texte_ml"] = nettoyer_textes(df["texte_complet"])
 
-df["texte_ml"] = df["texte_complet"].fillna("").apply(nettoyer_texte)
+# Vectoriseur propre à la classification, ajusté sur l'entraînement seulement :
+# distinct de celui du clustering, son entrée du cache n'est pas préparée par
+# python src/ml/features.py (voir features.py)
+PARAMS_TFIDF_CLF = {"max_features": 1000, "min_df": 2}
 
 
 # ========================================
@@ -61,18 +60,20 @@ print(f"   Seuil pour 'très demandé': {seuil:.0f} offres")
 print(f"   Métiers très demandés: {df['metier_tres_demande'].sum()} offres")
 print(f"   Métiers normaux: {(df['metier_tres_demande'] == 0).sum()} offres")
 
-X = df["texte_ml"]
 y = df["metier_tres_demande"]
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
+pos_train, pos_test = train_test_split(
+    np.arange(len(df)), test_size=0.2, random_state=42, stratify=y
 )
+y_train, y_test = y.iloc[pos_train], y.iloc[pos_test]
 
-print("\n🤖 Entraînement du modèle de classification...")
+# TF-IDF ajusté sur les offres d'entraînement, appliqué à toutes (cache : features.py)
+features = features_tfidf(df["texte_ml"], PARAMS_TFIDF_CLF, apprentissage=pos_train)
+print(rapport_features(features))
+X_all_vec = features["matrice"]
+X_train_vec, X_test_vec = X_all_vec[pos_train], X_all_vec[pos_test]
 
-vectorizer_clf = TfidfVectorizer(max_features=1000, min_df=2)
-X_train_vec = vectorizer_clf.fit_transform(X_train)
-X_test_vec = vectorizer_clf.transform(X_test)
+print("\n🤖 Entraînement du modèle de classification...")
 
 clf = LogisticRegression(max_iter=1000, random_state=42)
 clf.fit(X_train_vec, y_train)
@@ -85,7 +86,6 @@ print("\n🧾 Classification report:")
 print(classification_report(y_test, y_pred))
 
 # Prédiction sur toutes les offres
-X_all_vec = vectorizer_clf.transform(X)
 df["pred_tres_demande"] = clf.predict(X_all_vec)
 
 
@@ -94,42 +94,11 @@ df["pred_tres_demande"] = clf.predict(X_all_vec)
 # ========================================
 print("\n💰 Estimation du niveau de salaire...")
 
-def estimer_salaire(row):
-    score = 50  # base 0-100
-
-    contrat = str(row["Contrat_propre"]).upper()
-    if "CDI" in contrat:
-        score += 20
-    elif "CDD" in contrat:
-        score += 10
-
-    domaine = str(row["Domaine_metier"])
-    if domaine == "Informatique":
-        score += 25
-    elif domaine == "Santé":
-        score += 15
-    elif domaine == "Industrie":
-        score += 10
-    elif domaine == "Commerce":
-        score += 5
-
-    titre = str(row["Titre"]).lower()
-    if any(m in titre for m in ["manager", "directeur", "responsable", "chef", "lead"]):
-        score += 20
-    if any(m in titre for m in ["senior", "expert", "ingénieur", "developpeur", "développeur"]):
-        score += 15
-    if any(m in titre for m in ["junior", "assistant", "stagiaire"]):
-        score -= 10
-
-    return max(0, min(100, score))
-
-df["score_salaire"] = df.apply(estimer_salaire, axis=1)
-
-df["niveau_salaire"] = pd.cut(
-    df["score_salaire"],
-    bins=[0, 40, 60, 80, 100],
-    labels=["Bas", "Moyen", "Bon", "Élevé"]
-)
+# Poids (contrat, domaine, mots du titre) et niveaux dans config/settings.yaml
+regles = charger_regles()
+
+df["score_salaire"] = regles.scorer_salaires(df)
+df["niveau_salaire"] = regles.niveaux_salaire(df["score_salaire"])
 
 print("   Distribution des niveaux de salaire:")
 for niveau, count in df["niveau_salaire"].value_counts().sort_index().items():
@@ -144,21 +113,7 @@ print("\n🌍 Calcul du score de popularité...")
 df["score_popularite"] = (
     df.groupby("Titre")["Titre"].transform("count") / len(df) * 100 +
     df["pred_tres_demande"] * 30 +
-    df["Domaine_metier"].map({
-        "Informatique": 30,
-        "Santé": 25,
-        "Commerce": 15,
-        "Logistique": 10,
-        "Administration": 10,
-        "Industrie": 15,
-        "Restauration": 5,
-        "Autre": 5,
-        "BTP": 15,
-        "Énergie / Technique": 20,
-        "Finance / Assurance": 20,
-        "Management": 15,
-        "Qualité / QHSE": 10,
-    }).fillna(5)
+    regles.points_popularite(df["Domaine_metier"])
 ).round(1)
 
 df["score_popularite"] = (
@@ -188,7 +143,7 @@ print(top_metiers)
 # ========================================
 # SAUVEGARDE
 # ========================================
-df.to_csv(ML_PATH, index=False, encoding="utf-8")
+ML_PATH = ecrire_offres(df, ML_BASE)
 print(f"\n✅ Fichier enrichi (ML complet) sauvegardé dans: {ML_PATH}")
 print("✅ Nouvelles colonnes ajoutées :")
 print("   - metier_tres_demande (0/1, vrai label)")
@@ -1,132 +1,146 @@
+import argparse
 import os
+import sys
+import time
+import numpy as np
 import pandas as pd
 
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans, AgglomerativeClustering, DBSCAN
-from sklearn.metrics import silhouette_score
 from scipy.sparse import hstack
 
 
 # ========================================
 # CHEMINS
 # ========================================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-INTERIM_PATH = os.path.join(BASE_DIR, "data", "interim", "offres_hellowork_clean.csv")
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INTERIM_BASE = os.path.join(BASE_DIR, "data", "interim", "offres_hellowork_clean")
 PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
 os.makedirs(PROCESSED_DIR, exist_ok=True)
-CLUSTERS_PATH = os.path.join(PROCESSED_DIR, "offres_clusters.csv")
-
-
-# ========================================
-# CHARGEMENT DES DONNÉES
-# ========================================
-print("📂 Chargement des données nettoyées...")
-df = pd.read_csv(INTERIM_PATH, encoding="utf-8")
-print(f"✅ {len(df)} offres chargées")
-
-
-# ========================================
-# PRÉPARATION TEXTE POUR TF-IDF
-# ========================================
-def nettoyer_texte(texte: str) -> str:
-    t = str(texte).lower()
-    remplacements = [
-        "h/f", "h / f", "(h/f)", "(h / f)",
-        " cdi ", " cdd ", " stage ", " alternance ",
-        " france ", " hf ", " h f "
-    ]
-    for r in remplacements:
-        t = t.replace(r, " ")
-    return t
-
-df["texte_tf"] = df["texte_complet"].fillna("").apply(nettoyer_texte)
-
-
-# ========================================
-# VECTORISATION TF-IDF
-# ========================================
-print("\n🔢 Vectorisation du texte (TF-IDF)...")
-
-french_stopwords = [
-    "le", "la", "les", "de", "des", "du", "un", "une", "et",
-    "en", "pour", "avec", "sur", "dans", "par", "au", "aux",
-    "d'", "l'", "h/f", "hf", "offre", "poste"
-]
-
-vectorizer = TfidfVectorizer(
-    max_features=1000,
-    stop_words=french_stopwords,
-    min_df=2,
-    max_df=0.7,
+CLUSTERS_BASE = os.path.join(PROCESSED_DIR, "offres_clusters")  # .csv ou .parquet
+MODELE_PATH = os.path.join(BASE_DIR, "data", "models", "clusters_kmeans.joblib")
+RAPPORT_PATH = os.path.join(PROCESSED_DIR, "clustering_balayage.json")
+
+sys.path.insert(0, BASE_DIR)
+from src.etl.stockage import ecrire_offres, lire_offres  # noqa: E402
+from src.ml.balayage import (  # noqa: E402
+    BRUIT_MAX, CRITERES, GRILLE, K_MAX, balayer, choisir, ecrire_rapport, k_du_rapport, nom_candidat,
 )
-
-X_text = vectorizer.fit_transform(df["texte_tf"])
-print(f"✅ Matrice TF-IDF: {X_text.shape[0]} offres × {X_text.shape[1]} mots-clés")
+from src.ml.clusters_incrementaux import (  # noqa: E402
+    SEUIL_HORS_VOCABULAIRE, SEUIL_INERTIE, ModeleClusters, cles_offres,
+)
+from src.ml.evaluation import rapport  # noqa: E402
+from src.ml.features import PARAMS_TFIDF, features_tfidf, nettoyer_textes, rapport_features  # noqa: E402
+from src.ml.hierarchique import AGGLO_DENSE_MAX  # noqa: E402
 
 
 # ========================================
-# AJOUT DE DOMAINE_METIER COMME FEATURE
+# OPTIONS
 # ========================================
-print("\n➕ Ajout de 'Domaine_metier' comme features (one-hot)...")
-
-domain_dummies = pd.get_dummies(df["Domaine_metier"], sparse=True)
-X_full = hstack([X_text, domain_dummies.values])
-
-print(f"✅ Matrice finale: {X_full.shape[0]} offres × {X_full.shape[1]} features")
+def options(argv=None):
+    parser = argparse.ArgumentParser(description="Clustering des offres nettoyées")
+    parser.add_argument("--incremental", action="store_true",
+                        help="affecte les offres aux clusters du modèle sauvegardé (MiniBatchKMeans), "
+                             "réentraîné seulement en cas de dérive")
+    parser.add_argument("--refit", action="store_true", help="avec --incremental : réentraîne le modèle")
+    parser.add_argument("--modele", default=MODELE_PATH, help="modèle sauvegardé (vocabulaire + centroïdes)")
+    parser.add_argument("--silhouette-exacte", action="store_true",
+                        help="silhouette sur toutes les offres (O(n²), petits jeux) au lieu d'échantillons")
+    parser.add_argument("--critere", choices=list(CRITERES), default="silhouette",
+                        help="mesure qui désigne l'algorithme gagnant du balayage")
+    parser.add_argument("--k-max", type=int, default=K_MAX, help="nombre maximal de clusters du gagnant")
+    parser.add_argument("--workers", type=int, help="processus du balayage (défaut : nombre de CPU)")
+    parser.add_argument("--rapport", default=RAPPORT_PATH, help="rapport JSON du balayage (scores, durées, mémoire)")
+    return parser.parse_args(argv)
 
 
 # ========================================
-# TEST DES 3 ALGORITHMES
-# ========================================
-print("\n🧪 Test de KMeans, Agglomerative, DBSCAN...")
-
-n_clusters = 8
-results = {}
-labels_dict = {}
-
-# 1) KMeans
-kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10, max_iter=300)
-labels_kmeans = kmeans.fit_predict(X_full)
-score_kmeans = silhouette_score(X_full, labels_kmeans)
-results["KMeans"] = {"labels": labels_kmeans, "score": score_kmeans, "k": n_clusters}
-labels_dict["KMeans"] = labels_kmeans
-
-# 2) Agglomerative
-agg = AgglomerativeClustering(n_clusters=n_clusters)
-labels_agg = agg.fit_predict(X_full.toarray())
-score_agg = silhouette_score(X_full, labels_agg)
-results["Agglomerative"] = {"labels": labels_agg, "score": score_agg, "k": n_clusters}
-labels_dict["Agglomerative"] = labels_agg
-
-# 3) DBSCAN
-dbscan = DBSCAN(eps=0.5, min_samples=5, n_jobs=-1)
-labels_db = dbscan.fit_predict(X_full)
-if len(set(labels_db)) > 1:
-    score_db = silhouette_score(X_full, labels_db)
-else:
-    score_db = -1.0
-results["DBSCAN"] = {"labels": labels_db, "score": score_db, "k": len(set(labels_db))}
-labels_dict["DBSCAN"] = labels_db
-
-print("\n📊 Scores de clustering (silhouette) avec Domaine_metier:")
-for name, info in results.items():
-    print(f" - {name} (k≈{info['k']}) : {info['score']:.3f}")
-
-
-print("\nℹ️ Choisis l'algorithme que tu veux utiliser parmi: KMeans, Agglomerative, DBSCAN")
-# ====== CHOIX MANUEL ======
-chosen_algo = "KMeans"  # <=== change ici si tu veux tester un autre
-# ==========================
-
-print(f"\n✅ Algorithme choisi manuellement : {chosen_algo}")
-df["cluster_id"] = labels_dict[chosen_algo]
+# VECTORISATION TF-IDF
+# Mode complet : matrice du cache de features (features.py). Mode
+# incrémental : le vocabulaire est sauvegardé avec le modèle ; son nombre de
+# clusters est celui du gagnant du dernier balayage (--rapport), sinon celui
+# du modèle sauvegardé, sinon N_CLUSTERS_DEFAUT.
+# ========================================
+N_CLUSTERS_DEFAUT = 8
+
+vectorizer = TfidfVectorizer(**PARAMS_TFIDF)
+
+
+# ========================================
+# MODE COMPLET : BALAYAGE DES 3 ALGORITHMES SUR TOUTES LES OFFRES
+# ========================================
+def clusters_complets(df: pd.DataFrame, args) -> np.ndarray:
+    print("\n🔢 Vectorisation du texte (TF-IDF)...")
+    features = features_tfidf(df["texte_tf"])
+    X_text = features["matrice"]
+    print(rapport_features(features))
+
+    # Ajout de Domaine_metier comme features
+    print("\n➕ Ajout de 'Domaine_metier' comme features (one-hot)...")
+
+    domain_dummies = pd.get_dummies(df["Domaine_metier"], sparse=True)
+    X_full = hstack([X_text, domain_dummies.values])
+
+    print(f"✅ Matrice finale: {X_full.shape[0]} offres × {X_full.shape[1]} features")
+
+    # Balayage de la grille en parallèle, gagnant choisi par --critere (voir balayage.py)
+    n_candidats = sum(len(c) for c in GRILLE.values())
+    print(f"\n🧪 Balayage de KMeans, Agglomerative, DBSCAN : {n_candidats} candidats...")
+    if X_full.shape[0] > AGGLO_DENSE_MAX:
+        print(f"   Agglomerative approché : {X_full.shape[0]} offres > {AGGLO_DENSE_MAX} (matrice non densifiée)")
+    debut = time.perf_counter()
+    resultats = balayer(X_full, n_workers=args.workers, exacte=args.silhouette_exacte)
+    duree = time.perf_counter() - debut
+    gagnant = choisir(resultats, args.critere, k_max=args.k_max)
+
+    mode = "exacte" if args.silhouette_exacte else "échantillonnée"
+    print(f"\n📊 Scores de clustering (silhouette {mode}) avec Domaine_metier, en {duree:.1f} s:")
+    for r in resultats:
+        memoire = "" if r["pic_mo"] is None else f", pic +{r['pic_mo']:.0f} Mo"
+        print(rapport(nom_candidat(r), r["k"], r["mesures"])
+              + f" | ajustement {r['ajustement_s']:.2f} s{memoire}" + ("" if r["eligible"] else " | non éligible"))
+
+    ecrire_rapport(resultats, gagnant, args.rapport, critere=args.critere, k_max=args.k_max,
+                   bruit_max=BRUIT_MAX, silhouette_exacte=args.silhouette_exacte,
+                   offres=X_full.shape[0], features=X_full.shape[1], duree_s=duree)
+    print(f"\n✅ Algorithme choisi ({args.critere}) : {nom_candidat(resultats[gagnant])}")
+    print(f"✅ Rapport du balayage sauvegardé dans: {args.rapport}")
+    return resultats[gagnant]["labels"]
+
+
+# ========================================
+# MODE INCRÉMENTAL : AFFECTATION AUX CLUSTERS SAUVEGARDÉS
+# Réentraînement (mini-batches) seulement sans modèle, avec --refit ou si
+# les nouvelles offres ont dérivé (voir clusters_incrementaux.py)
+# ========================================
+def clusters_incrementaux(df: pd.DataFrame, args) -> np.ndarray:
+    textes, domaines, cles = df["texte_tf"], df["Domaine_metier"], cles_offres(df)
+    modele = ModeleClusters.charger(args.modele)
+    if modele is not None and not args.refit:
+        derive = modele.derive(textes, domaines, cles)
+        print(f"\n📏 Dérive : {derive['nouvelles']} nouvelles offres, inertie x{derive['inertie']:.2f} "
+              f"(seuil {SEUIL_INERTIE}), hors vocabulaire {derive['hors_vocabulaire']:+.1%} "
+              f"(seuil {SEUIL_HORS_VOCABULAIRE:+.0%})")
+        if not derive["refit"]:
+            print(f"✅ Offres affectées aux {modele.n_clusters} clusters du modèle {args.modele}")
+            return modele.predire(textes, domaines)[0]
+
+    n_clusters = k_du_rapport(args.rapport) or (modele.n_clusters if modele is not None else N_CLUSTERS_DEFAUT)
+    if modele is not None and modele.n_clusters != n_clusters:
+        # Numéros repris seulement à nombre de clusters égal (renumeroter)
+        print(f"\n⚠️ k={n_clusters} (balayage) au lieu de {modele.n_clusters} : nouveaux numéros de clusters")
+        modele = None
+    print(f"\n🔁 Entraînement MiniBatchKMeans (k={n_clusters})"
+          + (" : numéros repris du modèle précédent" if modele is not None else ""))
+    nouveau = ModeleClusters(vectorizer, n_clusters)
+    labels = nouveau.ajuster(textes, domaines, cles, precedent=modele)
+    nouveau.sauver(args.modele)
+    print(f"✅ Modèle sauvegardé dans {args.modele}")
+    return labels
 
 
 # ========================================
 # NOMMER LES CLUSTERS (via Domaine_metier)
 # ========================================
-print("\n🏷️ Attribution des noms aux clusters...")
-
 def nommer_cluster(cluster_id: int, df_cluster: pd.DataFrame) -> str:
     domaines = df_cluster["Domaine_metier"].value_counts()
 
@@ -142,39 +156,58 @@ def nommer_cluster(cluster_id: int, df_cluster: pd.DataFrame) -> str:
     return domaine_principal
 
 
-cluster_names = {}
-for cluster_id in sorted(df["cluster_id"].unique()):
-    df_cluster = df[df["cluster_id"] == cluster_id]
-    cluster_names[cluster_id] = nommer_cluster(cluster_id, df_cluster)
+# ========================================
+# ÉTAPE DU PIPELINE
+# Après prepare_data.py : python src/ml/clustering.py
+# Sous garde __main__ : les workers du balayage (balayage.py) réimportent
+# ce module au démarrage (spawn, défaut hors Linux) sans relancer le pipeline.
+# ========================================
+def main(argv=None):
+    args = options(argv)
 
-df["cluster_nom"] = df["cluster_id"].map(cluster_names)
+    # Chargement des données
+    print("📂 Chargement des données nettoyées...")
+    df = lire_offres(INTERIM_BASE)
+    print(f"✅ {len(df)} offres chargées")
 
+    # Texte pour le TF-IDF : nettoyage vectorisé, commun avec classification.py (voir features.py)
+    df["texte_tf"] = nettoyer_textes(df["texte_complet"])
 
-# ========================================
-# AFFICHAGE DES RÉSULTATS
-# ========================================
-print("\n📊 Résultats du clustering final (algo choisi):")
-print("=" * 60)
+    df["cluster_id"] = clusters_incrementaux(df, args) if args.incremental else clusters_complets(df, args)
 
-for cluster_id in sorted(df["cluster_id"].unique()):
-    df_cluster = df[df["cluster_id"] == cluster_id]
-    print(f"\n🔹 Cluster {cluster_id}: {cluster_names[cluster_id]}")
-    print(f"   Nombre d'offres: {len(df_cluster)}")
+    # Noms des clusters (via Domaine_metier)
+    print("\n🏷️ Attribution des noms aux clusters...")
+    cluster_names = {}
+    for cluster_id in sorted(df["cluster_id"].unique()):
+        df_cluster = df[df["cluster_id"] == cluster_id]
+        cluster_names[cluster_id] = nommer_cluster(cluster_id, df_cluster)
 
-    top_titres = df_cluster["Titre"].value_counts().head(3)
-    print("   Top 3 métiers:")
-    for titre, count in top_titres.items():
-        print(f"      • {titre} ({count})")
+    df["cluster_nom"] = df["cluster_id"].map(cluster_names)
 
-print("\n📈 Répartition domaines × clusters:")
-print(df.groupby(["Domaine_metier", "cluster_nom"])["Titre"].count())
+    # Affichage des résultats
+    print("\n📊 Résultats du clustering final (algo choisi):")
+    print("=" * 60)
 
+    for cluster_id in sorted(df["cluster_id"].unique()):
+        df_cluster = df[df["cluster_id"] == cluster_id]
+        print(f"\n🔹 Cluster {cluster_id}: {cluster_names[cluster_id]}")
+        print(f"   Nombre d'offres: {len(df_cluster)}")
 
-# ========================================
-# SAUVEGARDE
-# ========================================
-df.to_csv(CLUSTERS_PATH, index=False, encoding="utf-8")
-print(f"\n✅ Fichier enrichi avec clusters sauvegardé dans: {CLUSTERS_PATH}")
-print(f"✅ Colonnes ajoutées: 'cluster_id', 'cluster_nom'")
-print("\n👀 Aperçu des données avec clusters:")
-print(df[["Titre", "Domaine_metier", "cluster_id", "cluster_nom"]].head(10))
+        top_titres = df_cluster["Titre"].value_counts().head(3)
+        print("   Top 3 métiers:")
+        for titre, count in top_titres.items():
+            print(f"      • {titre} ({count})")
+
+    print("\n📈 Répartition domaines × clusters:")
+    print(df.groupby(["Domaine_metier", "cluster_nom"])["Titre"].count())
+
+    # Sauvegarde
+    clusters_path = ecrire_offres(df, CLUSTERS_BASE)
+    print(f"\n✅ Fichier enrichi avec clusters sauvegardé dans: {clusters_path}")
+    print(f"✅ Colonnes ajoutées: 'cluster_id', 'cluster_nom'")
+    print("\n👀 Aperçu des données avec clusters:")
+    print(df[["Titre", "Domaine_metier", "cluster_id", "cluster_nom"]].head(10))
+
+
+if __name__ == "__main__":
+    main()
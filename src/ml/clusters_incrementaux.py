@@ -0,0 +1,141 @@
+import os
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import hstack
+from sklearn.base import clone
+from sklearn.cluster import MiniBatchKMeans
+
+from src.etl.cles import cle_offre
+
+
+# ========================================
+# CLUSTERS INCRÉMENTAUX (clustering.py --incremental)
+# Le vocabulaire TF-IDF, les domaines connus et les centroïdes d'un
+# MiniBatchKMeans sont sauvegardés. À chaque run, les offres sont affectées
+# aux clusters existants (predict) ; le modèle n'est réentraîné que si les
+# offres arrivées depuis l'entraînement ont dérivé :
+#   - inertie : distance² moyenne des nouvelles offres à leur centroïde,
+#     rapportée à celle des offres d'entraînement ;
+#   - vocabulaire : part de leurs mots absents du vocabulaire, comparée à
+#     celle des offres d'entraînement.
+# Après un réentraînement, les nouveaux clusters reprennent le numéro de
+# l'ancien cluster avec lequel ils partagent le plus d'offres (affectation
+# hongroise) : cluster_id et cluster_nom ne changent pas d'un run à l'autre.
+# ========================================
+SEUIL_INERTIE = 1.3
+SEUIL_HORS_VOCABULAIRE = 0.15
+MIN_NOUVELLES = 20
+
+
+def cles_offres(df: pd.DataFrame) -> list:
+    """
+    Identité de chaque offre, comme l'index des offres vues du scraper :
+    "id:" depuis la colonne Lien, empreinte "h:" pour les lignes sans lien.
+    """
+    liens = df["Lien"].fillna("") if "Lien" in df.columns else [""] * len(df)
+    return [cle_offre({"lien": l, "titre": t, "entreprise": e, "ville": v})
+            for l, t, e, v in zip(liens, df["Titre"], df["Entreprise"], df["Ville"])]
+
+
+def renumeroter(labels: np.ndarray, precedents: np.ndarray, n_clusters: int) -> np.ndarray:
+    """
+    Permutation des nouveaux numéros de clusters : chacun prend le numéro
+    précédent avec lequel il partage le plus d'offres.
+    """
+    communs = np.zeros((n_clusters, n_clusters), dtype=np.int64)
+    np.add.at(communs, (labels, precedents), 1)
+    nouveaux, anciens = linear_sum_assignment(-communs)
+    permutation = np.empty(n_clusters, dtype=np.int64)
+    permutation[nouveaux] = anciens
+    return permutation
+
+
+class ModeleClusters:
+    def __init__(self, vectoriseur, n_clusters: int, random_state: int = 42):
+        self.vectoriseur = vectoriseur
+        self.n_clusters = n_clusters
+        self.random_state = random_state
+        self.domaines = []
+        self.kmeans = None
+        self.cles = set()
+        self.inertie_reference = None
+        self.hors_vocabulaire_reference = None
+
+    def _features(self, X_text, domaines: pd.Series):
+        # Même matrice que clustering.py : TF-IDF + one-hot du domaine (domaines connus seulement)
+        dummies = pd.get_dummies(pd.Categorical(domaines, categories=self.domaines), sparse=True)
+        return hstack([X_text, dummies.values]).tocsr()
+
+    def _affecter(self, X):
+        distances = self.kmeans.transform(X) ** 2
+        labels = distances.argmin(axis=1)
+        return labels, distances[np.arange(len(labels)), labels]
+
+    def _hors_vocabulaire(self, textes: pd.Series) -> float:
+        analyser = self.vectoriseur.build_analyzer()
+        mots = [m for t in textes for m in analyser(t)]
+        if not mots:
+            return 0.0
+        return sum(m not in self.vectoriseur.vocabulary_ for m in mots) / len(mots)
+
+    def ajuster(self, textes: pd.Series, domaines: pd.Series, cles: list, precedent=None) -> np.ndarray:
+        """
+        Entraîne vocabulaire et centroïdes (mini-batches) sur toutes les offres.
+        Avec `precedent`, les numéros de clusters suivent ceux de l'ancien modèle.
+        """
+        self.vectoriseur = clone(self.vectoriseur)
+        X_text = self.vectoriseur.fit_transform(textes)
+        self.domaines = sorted(domaines.dropna().unique().tolist())
+        X = self._features(X_text, domaines)
+        self.kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=self.random_state,
+                                      n_init=3, batch_size=1024).fit(X)
+        labels = self.kmeans.labels_
+        if precedent is not None:
+            permutation = renumeroter(labels, precedent.predire(textes, domaines)[0], self.n_clusters)
+            centres = np.empty_like(self.kmeans.cluster_centers_)
+            centres[permutation] = self.kmeans.cluster_centers_
+            self.kmeans.cluster_centers_ = centres
+            labels = permutation[labels]
+            self.kmeans.labels_ = labels
+
+        self.cles = set(cles)
+        self.inertie_reference = float(self._affecter(X)[1].mean())
+        self.hors_vocabulaire_reference = self._hors_vocabulaire(textes)
+        return labels
+
+    def predire(self, textes: pd.Series, domaines: pd.Series):
+        """Cluster de chaque offre et distance² à son centroïde."""
+        return self._affecter(self._features(self.vectoriseur.transform(textes), domaines))
+
+    def derive(self, textes: pd.Series, domaines: pd.Series, cles: list) -> dict:
+        """Indicateurs de dérive des offres absentes de l'entraînement."""
+        nouvelles = np.array([c not in self.cles for c in cles], dtype=bool)
+        mesures = {"nouvelles": int(nouvelles.sum()), "inertie": 1.0, "hors_vocabulaire": 0.0}
+        if nouvelles.any():
+            _, distances = self.predire(textes[nouvelles], domaines[nouvelles])
+            mesures["inertie"] = float(distances.mean()) / max(self.inertie_reference, 1e-12)
+            mesures["hors_vocabulaire"] = self._hors_vocabulaire(textes[nouvelles]) - self.hors_vocabulaire_reference
+        mesures["refit"] = mesures["nouvelles"] >= MIN_NOUVELLES and (
+            mesures["inertie"] > SEUIL_INERTIE or mesures["hors_vocabulaire"] > SEUIL_HORS_VOCABULAIRE)
+        return mesures
+
+    def sauver(self, path: str) -> None:
+        dossier = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dossier, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(self, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    @staticmethod
+    def charger(path: str):
+        """Modèle sauvegardé, ou None s'il n'existe pas encore."""
+        return joblib.load(path) if os.path.exists(path) else None
@@ -0,0 +1,147 @@
+import time
+
+import numpy as np
+from scipy import sparse, stats
+from sklearn.metrics import silhouette_score
+
+
+# ========================================
+# ÉVALUATION DES CLUSTERINGS
+# La silhouette exacte compare chaque offre à toutes les autres : O(n²)
+# distances, le coût dominant de clustering.py au-delà de quelques milliers
+# d'offres. Par défaut, elle est estimée sur des échantillons stratifiés par
+# cluster (chaque cluster garde sa part), répétés pour donner un intervalle
+# de confiance. S'y ajoutent des mesures en O(n × k), calculées à partir des
+# centroïdes, directement sur la matrice creuse :
+#   - silhouette simplifiée : a = distance au centroïde de son cluster,
+#     b = distance au centroïde le plus proche parmi les autres ;
+#   - Calinski-Harabasz (plus haut = mieux) ;
+#   - Davies-Bouldin (plus bas = mieux).
+# Les étiquettes -1 (bruit DBSCAN) forment un cluster comme les autres, comme
+# dans silhouette_score.
+# ========================================
+TAILLE_ECHANTILLON = 2000
+REPETITIONS = 5
+NIVEAU_CONFIANCE = 0.95
+
+
+def echantillon_stratifie(labels: np.ndarray, taille: int, rng) -> np.ndarray:
+    """Positions tirées sans remise : chaque cluster en proportion de sa taille (au moins 2 offres)."""
+    valeurs, codes, effectifs = np.unique(labels, return_inverse=True, return_counts=True)
+    parts = np.maximum(np.round(effectifs * taille / len(labels)).astype(int), 2)
+    parts = np.minimum(parts, effectifs)
+    ordre = np.argsort(codes, kind="stable")
+    debuts = np.concatenate([[0], np.cumsum(effectifs)])
+    return np.sort(np.concatenate([
+        rng.choice(ordre[debuts[c]:debuts[c + 1]], parts[c], replace=False) for c in range(len(valeurs))
+    ]))
+
+
+def silhouette_echantillonnee(X, labels: np.ndarray, taille: int = TAILLE_ECHANTILLON,
+                              repetitions: int = REPETITIONS, random_state: int = 42) -> dict:
+    """
+    Silhouette moyenne estimée sur `repetitions` échantillons stratifiés de
+    `taille` offres, avec son intervalle de confiance (loi de Student). Sur
+    un jeu plus petit que l'échantillon, c'est la silhouette exacte.
+    """
+    if len(labels) <= taille:
+        score = float(silhouette_score(X, labels))
+        return {"score": score, "bas": score, "haut": score, "echantillon": len(labels)}
+    rng = np.random.default_rng(random_state)
+    scores = []
+    for _ in range(repetitions):
+        positions = echantillon_stratifie(labels, taille, rng)
+        scores.append(silhouette_score(X[positions], labels[positions]))
+    scores = np.array(scores)
+    marge = stats.t.ppf((1 + NIVEAU_CONFIANCE) / 2, repetitions - 1) * scores.std(ddof=1) / np.sqrt(repetitions)
+    return {"score": float(scores.mean()), "bas": float(scores.mean() - marge),
+            "haut": float(scores.mean() + marge), "echantillon": len(positions)}
+
+
+def _centroides(X, codes: np.ndarray, k: int):
+    """Centroïdes (k × features, dense), effectifs et distances² de chaque offre à chaque centroïde."""
+    appartenance = sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))), shape=(k, len(codes)))
+    effectifs = np.asarray(appartenance.sum(axis=1)).ravel()
+    if sparse.issparse(X):
+        centres = (appartenance @ X).toarray() / effectifs[:, None]
+        normes = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    else:
+        centres = (appartenance @ X) / effectifs[:, None]
+        normes = (X ** 2).sum(axis=1)
+    produits = np.asarray(X @ centres.T)
+    distances = np.maximum(normes[:, None] - 2 * produits + (centres ** 2).sum(axis=1)[None, :], 0)
+    return centres, effectifs, distances
+
+
+def mesures_centroides(X, labels: np.ndarray) -> dict:
+    """Silhouette simplifiée, Calinski-Harabasz et Davies-Bouldin, en O(n × k)."""
+    _, codes = np.unique(labels, return_inverse=True)
+    k, n = codes.max() + 1, len(codes)
+    centres, effectifs, distances = _centroides(X, codes, k)
+    propre = distances[np.arange(n), codes]
+
+    # Silhouette simplifiée
+    autres = distances.copy()
+    autres[np.arange(n), codes] = np.inf
+    a, b = np.sqrt(propre), np.sqrt(autres.min(axis=1))
+    denominateur = np.maximum(a, b)
+    silhouette = np.divide(b - a, denominateur, out=np.zeros(n), where=denominateur > 0)
+
+    # Calinski-Harabasz : dispersion entre clusters / dispersion intra, ramenées aux degrés de liberté
+    centre_global = np.asarray(X.mean(axis=0)).ravel()
+    inter = float((effectifs * ((centres - centre_global) ** 2).sum(axis=1)).sum())
+    intra = float(propre.sum())
+    calinski = float(inter * (n - k) / (intra * (k - 1))) if intra > 0 else 1.0
+
+    # Davies-Bouldin : pour chaque cluster, le pire rapport (dispersions) / (écart des centroïdes)
+    dispersion = np.bincount(codes, weights=np.sqrt(propre), minlength=k) / effectifs
+    carres = (centres ** 2).sum(axis=1)
+    ecarts = np.sqrt(np.maximum(carres[:, None] + carres[None, :] - 2 * centres @ centres.T, 0))
+    rapports = np.divide(dispersion[:, None] + dispersion[None, :], ecarts,
+                         out=np.zeros((k, k)), where=ecarts > 0)
+    np.fill_diagonal(rapports, 0)
+    davies = float(rapports.max(axis=1).mean())
+
+    return {"silhouette_centroides": float(silhouette.mean()), "calinski_harabasz": calinski, "davies_bouldin": davies}
+
+
+def evaluer(X, labels, exacte: bool = False, taille: int = TAILLE_ECHANTILLON,
+            random_state: int = 42) -> dict:
+    """
+    Mesures d'un clustering et durée de chacune (secondes, clé "durees").
+    `exacte` : silhouette sur toutes les offres (O(n²), pour les petits jeux).
+    Moins de 2 clusters : aucune mesure (None).
+    """
+    labels = np.asarray(labels)
+    n_clusters = len(np.unique(labels))
+    if n_clusters < 2 or n_clusters >= len(labels):
+        return {"silhouette": None, "durees": {}}
+    X = X.tocsr() if sparse.issparse(X) else np.asarray(X)
+
+    durees = {}
+    debut = time.perf_counter()
+    if exacte:
+        score = float(silhouette_score(X, labels))
+        resultat = {"silhouette": {"score": score, "bas": score, "haut": score, "echantillon": len(labels)}}
+    else:
+        resultat = {"silhouette": silhouette_echantillonnee(X, labels, taille, random_state=random_state)}
+    durees["silhouette"] = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    resultat.update(mesures_centroides(X, labels))
+    durees["centroides"] = time.perf_counter() - debut
+    resultat["durees"] = durees
+    return resultat
+
+
+def rapport(nom: str, k: int, mesures: dict) -> str:
+    """Une ligne de comparaison des algorithmes (clustering.py)."""
+    s = mesures["silhouette"]
+    if s is None:
+        return f" - {nom} (k≈{k}) : moins de 2 clusters, pas de score"
+    intervalle = "exacte" if s["bas"] == s["haut"] else f"IC95 [{s['bas']:.3f} ; {s['haut']:.3f}]"
+    d = mesures["durees"]
+    return (f" - {nom} (k≈{k}) : silhouette {s['score']:.3f} ({intervalle}, {s['echantillon']} offres, "
+            f"{d['silhouette'] * 1000:.0f} ms) | simplifiée {mesures['silhouette_centroides']:.3f}, "
+            f"CH {mesures['calinski_harabasz']:.1f}, DB {mesures['davies_bouldin']:.3f} "
+            f"({d['centroides'] * 1000:.0f} ms)")
@@ -0,0 +1,188 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+from src.etl.stockage import lire_offres  # noqa: E402
+
+
+# ========================================
+# FEATURES TF-IDF (clustering.py, classification.py)
+# Seuls le nettoyage du texte (vectorisé) et le cache sont communs aux deux
+# étapes ; ce n'est pas une étape de features unique. Chaque étape ajuste
+# son propre vectoriseur : clustering sur toutes les offres (PARAMS_TFIDF),
+# classification sur les seules offres d'entraînement, avec ses paramètres
+# (le test ne doit peser ni sur le vocabulaire ni sur les idf). Chaque
+# ajustement a donc son entrée dans data/cache/features : matrice de toutes
+# les offres, vocabulaire et idf. Le nom du fichier est l'empreinte du texte
+# nettoyé, des paramètres du vectoriseur et des offres d'ajustement. Sur des
+# données inchangées, le pipeline ne revectorise rien.
+# ========================================
+VERSION = 1
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "features")
+GARDER = 4  # fichiers conservés dans le cache (les plus récents)
+INTERIM_BASE = os.path.join(BASE_DIR, "data", "interim", "offres_hellowork_clean")
+
+# Mentions sans valeur pour distinguer les métiers, retirées du texte
+REMPLACEMENTS = [
+    "h/f", "h / f", "(h/f)", "(h / f)",
+    " cdi ", " cdd ", " stage ", " alternance ",
+    " france ", " hf ", " h f ",
+]
+
+FRENCH_STOPWORDS = [
+    "le", "la", "les", "de", "des", "du", "un", "une", "et",
+    "en", "pour", "avec", "sur", "dans", "par", "au", "aux",
+    "d'", "l'", "h/f", "hf", "offre", "poste",
+]
+
+PARAMS_TFIDF = {"max_features": 1000, "stop_words": FRENCH_STOPWORDS, "min_df": 2, "max_df": 0.7}
+
+
+def nettoyer_textes(textes: pd.Series) -> pd.Series:
+    """
+    Minuscules, puis chaque mention de REMPLACEMENTS remplacée par une
+    espace, dans l'ordre de la liste (même résultat que l'ancien
+    nettoyer_texte ligne à ligne).
+    """
+    t = textes.fillna("").astype(str).str.lower()
+    for r in REMPLACEMENTS:
+        t = t.str.replace(r, " ", regex=False)
+    return t
+
+
+def cle_features(textes: pd.Series, params: dict = None, apprentissage: np.ndarray = None) -> str:
+    """Empreinte du texte nettoyé (ordre des offres compris), des paramètres et des offres d'ajustement."""
+    params = PARAMS_TFIDF if params is None else params
+    empreinte = hashlib.sha256(json.dumps([VERSION, params], sort_keys=True).encode())
+    empreinte.update(pd.util.hash_pandas_object(textes, index=False).to_numpy().tobytes())
+    if apprentissage is not None:
+        empreinte.update(b"apprentissage")
+        empreinte.update(np.asarray(apprentissage, dtype=np.int64).tobytes())
+    return empreinte.hexdigest()[:24]
+
+
+def chemin_features(cle: str, dossier: str = CACHE_DIR) -> str:
+    return os.path.join(dossier, f"tfidf-{cle}.npz")
+
+
+def calculer_features(textes: pd.Series, params: dict = None, apprentissage: np.ndarray = None) -> dict:
+    """Vectoriseur ajusté sur les offres `apprentissage` (positions ; toutes si None), appliqué à toutes."""
+    vectoriseur = TfidfVectorizer(**(PARAMS_TFIDF if params is None else params))
+    if apprentissage is None:
+        matrice = vectoriseur.fit_transform(textes).tocsr()
+    else:
+        vectoriseur.fit(textes.iloc[apprentissage])
+        matrice = vectoriseur.transform(textes).tocsr()
+    return {"matrice": matrice, "vocabulaire": vectoriseur.get_feature_names_out(), "idf": vectoriseur.idf_}
+
+
+def ecrire_features(features: dict, path: str) -> None:
+    """Écriture atomique : une étape concurrente lit l'ancien fichier ou le nouveau, jamais un fichier partiel."""
+    dossier = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dossier, exist_ok=True)
+    matrice = features["matrice"]
+    fd, tmp = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, data=matrice.data, indices=matrice.indices, indptr=matrice.indptr,
+                     forme=np.array(matrice.shape), vocabulaire=np.asarray(features["vocabulaire"], dtype=str),
+                     idf=features["idf"])
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    elaguer_cache(dossier)
+
+
+def _date(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0.0
+
+
+def elaguer_cache(dossier: str, garder: int = GARDER) -> None:
+    """
+    Supprime les plus anciens fichiers du cache. Un autre processus peut
+    élaguer en même temps : un fichier déjà supprimé n'est pas une erreur.
+    """
+    for ancien in sorted(glob.glob(os.path.join(dossier, "tfidf-*.npz")), key=_date)[:-garder]:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(ancien)
+
+
+def lire_features(path: str):
+    """Features sauvegardées, ou None si le fichier est absent ou illisible."""
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            matrice = sparse.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["forme"]))
+            return {"matrice": matrice, "vocabulaire": f["vocabulaire"], "idf": f["idf"]}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def features_tfidf(textes: pd.Series, params: dict = None, dossier: str = CACHE_DIR,
+                   apprentissage: np.ndarray = None) -> dict:
+    """
+    Features TF-IDF du texte nettoyé (nettoyer_textes), vectoriseur ajusté sur
+    les offres `apprentissage` (positions ; toutes si None) : depuis le cache
+    si rien n'a changé, sinon calculées puis sauvegardées.
+    Clés : matrice, vocabulaire, idf, cle, depuis_cache, duree.
+    """
+    debut = time.perf_counter()
+    cle = cle_features(textes, params, apprentissage)
+    path = chemin_features(cle, dossier)
+    features = lire_features(path)
+    depuis_cache = features is not None
+    if depuis_cache:
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)  # récent : gardé par le nettoyage du cache
+    else:
+        features = calculer_features(textes, params, apprentissage)
+        ecrire_features(features, path)
+    return dict(features, cle=cle, depuis_cache=depuis_cache,
+                duree=time.perf_counter() - debut)
+
+
+def rapport_features(features: dict) -> str:
+    origine = "chargée depuis le cache" if features["depuis_cache"] else "calculée et sauvegardée"
+    matrice = features["matrice"]
+    return (f"✅ Matrice TF-IDF {origine} ({features['duree'] * 1000:.0f} ms): "
+            f"{matrice.shape[0]} offres × {matrice.shape[1]} mots-clés [{features['cle']}]")
+
+
+# ========================================
+# ÉTAPE DU PIPELINE
+# Après prepare_data.py : python src/ml/features.py
+# Ne prépare que l'entrée du clustering (ajustement sur toutes les offres) :
+# celle de la classification dépend de son découpage entraînement/test et
+# reste calculée par classification.py.
+# ========================================
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calcule (ou retrouve) les features TF-IDF du clustering sur les offres nettoyées.")
+    parser.add_argument("--base", default=INTERIM_BASE, help="fichier d'offres, sans extension")
+    parser.add_argument("--dossier", default=CACHE_DIR, help="cache des features")
+    args = parser.parse_args()
+
+    features = features_tfidf(nettoyer_textes(lire_offres(args.base)["texte_complet"]), dossier=args.dossier)
+    print(rapport_features(features))
+    print(f"💾 {chemin_features(features['cle'], args.dossier)}")
+
+
+if __name__ == "__main__":
+    main()
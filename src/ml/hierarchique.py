@@ -0,0 +1,79 @@
+import numpy as np
+from sklearn.cluster import AgglomerativeClustering, MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+
+
+# ========================================
+# CLUSTERING HIÉRARCHIQUE SUR MATRICE CREUSE
+# AgglomerativeClustering (ward) veut une matrice dense et garde toutes les
+# distances entre offres : O(n²) en mémoire (plusieurs dizaines de Go à
+# 50 000 offres). Au-delà de AGGLO_DENSE_MAX offres :
+#   1. la matrice creuse (TF-IDF + one-hot) est réduite par SVD tronquée,
+#      qui travaille directement sur le format creux ;
+#   2. MiniBatchKMeans y résume les offres en micro-centroïdes ;
+#   3. les micro-centroïdes sont fusionnés par ward pondéré (chacun pèse son
+#      nombre d'offres), jusqu'au nombre de clusters demandé.
+# Mémoire O(n × composantes), temps linéaire en n.
+# ========================================
+AGGLO_DENSE_MAX = 5000
+N_COMPOSANTES = 100
+MICRO_PAR_CLUSTER = 50
+
+
+def ward_pondere(centres: np.ndarray, poids: np.ndarray, n_clusters: int) -> np.ndarray:
+    """
+    Ward agglomératif sur des points pondérés : fusionne à chaque étape les
+    deux groupes dont la réunion augmente le moins l'inertie totale
+    (mise à jour de Lance-Williams). Renvoie le cluster de chaque point.
+    """
+    m = len(centres)
+    poids = poids.astype(float)
+    carres = (centres ** 2).sum(axis=1)
+    distances = np.maximum(carres[:, None] + carres[None, :] - 2 * centres @ centres.T, 0)
+    # Coût de fusion de deux groupes : n_a n_b / (n_a + n_b) × ||c_a - c_b||²
+    couts = poids[:, None] * poids[None, :] / (poids[:, None] + poids[None, :]) * distances
+    np.fill_diagonal(couts, np.inf)
+
+    groupe = np.arange(m)
+    for _ in range(m - n_clusters):
+        a, b = divmod(int(np.argmin(couts)), m)
+        n_a, n_b = poids[a], poids[b]
+        # Le groupe fusionné prend la place de a ; b est retiré
+        couts[a] = ((n_a + poids) * couts[a] + (n_b + poids) * couts[b] - poids * couts[a, b]) / (n_a + n_b + poids)
+        couts[:, a] = couts[a]
+        couts[a, a] = np.inf
+        couts[b, :] = couts[:, b] = np.inf
+        poids[a] = n_a + n_b
+        groupe[groupe == b] = a
+
+    # Numéros 0..n_clusters-1, dans l'ordre des micro-centroïdes
+    _, labels = np.unique(groupe, return_inverse=True)
+    return labels
+
+
+def agglomeratif_creux(X, n_clusters: int, n_composantes: int = N_COMPOSANTES,
+                       micro_par_cluster: int = MICRO_PAR_CLUSTER, random_state: int = 42) -> np.ndarray:
+    """Labels d'un clustering hiérarchique (ward) approché, sans densifier X."""
+    n = X.shape[0]
+    n_composantes = max(1, min(n_composantes, X.shape[1] - 1, n - 1))
+    reduit = TruncatedSVD(n_components=n_composantes, random_state=random_state).fit_transform(X)
+
+    n_micro = min(n, micro_par_cluster * n_clusters)
+    micro = MiniBatchKMeans(n_clusters=n_micro, random_state=random_state, n_init=3,
+                            batch_size=max(1024, 3 * n_micro))
+    labels_micro = micro.fit_predict(reduit)
+    poids = np.bincount(labels_micro, minlength=n_micro)
+
+    # Micro-centroïdes vides (possibles avec MiniBatchKMeans) : hors de la fusion
+    presents = np.flatnonzero(poids > 0)
+    labels_presents = ward_pondere(micro.cluster_centers_[presents], poids[presents], min(n_clusters, len(presents)))
+    fusion = np.full(n_micro, -1)
+    fusion[presents] = labels_presents
+    return fusion[labels_micro]
+
+
+def agglomeratif(X, n_clusters: int, dense_max: int = AGGLO_DENSE_MAX, random_state: int = 42) -> np.ndarray:
+    """Ward exact sur la matrice densifiée jusqu'à `dense_max` offres, approché au-delà."""
+    if X.shape[0] <= dense_max:
+        return AgglomerativeClustering(n_clusters=n_clusters).fit_predict(X.toarray())
+    return agglomeratif_creux(X, n_clusters, random_state=random_state)
@@ -0,0 +1,216 @@
+import atexit
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ========================================
+# POOL DE NAVIGATEURS PARTAGÉ
+# Les navigateurs sont démarrés à la demande (au plus `taille`), prêtés aux
+# jobs de scraping puis recyclés après `pages_par_navigateur` pages.
+# ========================================
+@functools.lru_cache(maxsize=None)
+def chemin_chromedriver() -> str:
+    """ChromeDriverManager().install() une seule fois par processus."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+# ========================================
+# PROFILS NAVIGATEUR
+# "complet" : comportement historique (tout est téléchargé, chargement complet)
+# "leger"   : images, polices, médias et scripts tiers bloqués, on rend la
+#             main dès que le HTML est là et on attend les cartes serpCard
+# ========================================
+URLS_BLOQUEES = [
+    # Images, polices, médias
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.mp4", "*.webm",
+    # Analytics et publicité (scripts tiers de la page de résultats)
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*aticdn.net*", "*piwik.pro*", "*facebook.net*", "*hotjar.com*", "*criteo.*",
+]
+
+PROFILS = {
+    "complet": {
+        "strategie_chargement": "normal",
+        "arguments": [],
+        "urls_bloquees": [],
+    },
+    "leger": {
+        "strategie_chargement": "none",
+        "arguments": [
+            "--blink-settings=imagesEnabled=false",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--mute-audio",
+            "--no-first-run",
+            "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+        ],
+        "urls_bloquees": URLS_BLOQUEES,
+    },
+}
+
+
+def creer_driver(headless: bool = True, profil: str = "complet", mesures: bool = False):
+    """
+    Démarre Chrome avec le profil demandé. Avec `mesures`, les événements
+    réseau sont journalisés pour `octets_transferes`.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    config = PROFILS[profil]
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    for argument in config["arguments"]:
+        options.add_argument(argument)
+    if config["urls_bloquees"]:
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        })
+    options.page_load_strategy = config["strategie_chargement"]
+    if mesures:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    driver = webdriver.Chrome(service=Service(chemin_chromedriver()), options=options)
+    if config["urls_bloquees"]:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": config["urls_bloquees"]})
+    return driver
+
+
+def octets_transferes(driver) -> int:
+    """
+    Octets reçus depuis le dernier appel (somme des encodedDataLength des
+    requêtes terminées), d'après le journal "performance" de Chrome.
+    """
+    total = 0
+    for entree in driver.get_log("performance"):
+        message = json.loads(entree["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            total += int(message["params"].get("encodedDataLength", 0))
+    return total
+
+
+class PoolNavigateurs:
+    def __init__(self, taille: int = 1, pages_par_navigateur: int = 50,
+                 headless: bool = True, profil: str = "complet",
+                 mesures: bool = False, fabrique=None):
+        self.taille = taille
+        self.pages_par_navigateur = pages_par_navigateur
+        self.profil = profil
+        self.mesures = mesures
+        self.fabrique = fabrique or functools.partial(creer_driver, headless, profil, mesures)
+        self._libres = []  # (driver, pages déjà servies)
+        self._condition = threading.Condition()
+        self._demarres = 0
+        self._ferme = False
+        # Instrumentation
+        self.demarrages = 0
+        self.recyclages = 0
+        self.latences = []  # secondes d'attente par acquisition
+
+    @contextmanager
+    def navigateur(self):
+        """Prête un navigateur pour une page ; il revient au pool ensuite."""
+        debut = time.perf_counter()
+        driver, pages = self._acquerir()
+        self.latences.append(time.perf_counter() - debut)
+        try:
+            yield driver
+        except BaseException:
+            # Navigateur dans un état inconnu : on ne le remet pas en circulation
+            self._quitter(driver)
+            raise
+        self._rendre(driver, pages + 1)
+
+    def _acquerir(self):
+        with self._condition:
+            while True:
+                if self._libres:
+                    return self._libres.pop()
+                if self._demarres < self.taille:
+                    self._demarres += 1
+                    break
+                self._condition.wait()
+        try:
+            driver = self.fabrique()
+        except BaseException:
+            with self._condition:
+                self._demarres -= 1
+                self._condition.notify()
+            raise
+        self.demarrages += 1
+        return driver, 0
+
+    def _rendre(self, driver, pages):
+        if self._ferme or pages >= self.pages_par_navigateur:
+            if not self._ferme:
+                self.recyclages += 1
+            self._quitter(driver)
+            return
+        with self._condition:
+            self._libres.append((driver, pages))
+            self._condition.notify()
+
+    def _quitter(self, driver):
+        with self._condition:
+            self._demarres -= 1
+            self._condition.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def fermer(self):
+        with self._condition:
+            self._ferme = True
+            libres, self._libres = self._libres, []
+        for driver, _ in libres:
+            self._quitter(driver)
+
+    def rapport(self) -> str:
+        if not self.latences:
+            return "🧭 Pool navigateurs : aucune acquisition"
+        latences = sorted(self.latences)
+        moyenne = sum(latences) / len(latences)
+        return (
+            f"🧭 Pool navigateurs : {len(latences)} acquisitions, "
+            f"{self.demarrages} démarrages, {self.recyclages} recyclages | "
+            f"latence moy {moyenne * 1000:.1f} ms, "
+            f"médiane {latences[len(latences) // 2] * 1000:.1f} ms, "
+            f"max {latences[-1] * 1000:.1f} ms"
+        )
+
+
+_pool = None
+_pool_parametres = None
+_pool_verrou = threading.Lock()
+
+
+def pool_partage(**kwargs) -> PoolNavigateurs:
+    """
+    Pool unique du processus, créé au premier appel et fermé à la sortie du
+    programme. Un appel avec d'autres paramètres ferme le pool existant (les
+    navigateurs prêtés sont quittés à leur retour) et en crée un nouveau.
+    """
+    global _pool, _pool_parametres
+    with _pool_verrou:
+        if _pool is not None and kwargs != _pool_parametres:
+            _pool.fermer()
+            _pool = None
+        if _pool is None:
+            _pool, _pool_parametres = PoolNavigateurs(**kwargs), kwargs
+            atexit.register(_pool.fermer)
+        return _pool
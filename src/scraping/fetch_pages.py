@@ -0,0 +1,86 @@
+import itertools
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+# ========================================
+# LIMITEUR DE DÉBIT PAR HÔTE
+# Remplace le time.sleep(2) fixe entre deux pages
+# ========================================
+class LimiteurDebit:
+    """
+    Autorise au plus `requetes_par_seconde` requêtes par seconde vers un
+    même hôte, quel que soit le nombre de workers qui le partagent.
+    """
+
+    def __init__(self, requetes_par_seconde: float = 0.5):
+        self.intervalle = 1.0 / requetes_par_seconde if requetes_par_seconde > 0 else 0.0
+        self._verrou = threading.Lock()
+        self._prochain = {}  # hôte -> instant du prochain créneau libre
+
+    def attendre(self, url: str) -> None:
+        hote = urlsplit(url).netloc
+        with self._verrou:
+            maintenant = time.monotonic()
+            creneau = max(maintenant, self._prochain.get(hote, 0.0))
+            self._prochain[hote] = creneau + self.intervalle
+        if creneau > maintenant:
+            time.sleep(creneau - maintenant)
+
+
+# ========================================
+# TÉLÉCHARGEMENT HTTP SIMPLE
+# La page de résultats est rendue côté serveur : pas besoin de navigateur
+# ========================================
+def telecharger_page(url: str, limiteur: LimiteurDebit = None, timeout: float = 15.0):
+    """Retourne le HTML de la page, ou None si la requête échoue."""
+    if limiteur is not None:
+        limiteur.attendre(url)
+
+    requete = urllib.request.Request(url, headers={
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "fr-FR,fr;q=0.9",
+    })
+    try:
+        with urllib.request.urlopen(requete, timeout=timeout) as reponse:
+            charset = reponse.headers.get_content_charset() or "utf-8"
+            return reponse.read().decode(charset, errors="replace")
+    except (urllib.error.URLError, TimeoutError) as e:
+        print(f"⚠️ Échec du téléchargement de {url} : {e}")
+        return None
+
+
+def recuperer_pages(urls, telecharger, n_workers: int = 4):
+    """
+    Télécharge les URLs en parallèle (au plus `n_workers` à la fois) et
+    rend les couples (url, html) dans l'ordre d'origine.
+    Seule une fenêtre de 2 × n_workers pages est en mémoire à un instant donné.
+    """
+    urls = iter(urls)
+    fenetre = deque()
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        try:
+            for url in itertools.islice(urls, 2 * n_workers):
+                fenetre.append((url, pool.submit(telecharger, url)))
+            while fenetre:
+                url, futur = fenetre.popleft()
+                suivante = next(urls, None)
+                if suivante is not None:
+                    fenetre.append((suivante, pool.submit(telecharger, suivante)))
+                yield url, futur.result()
+        finally:
+            # Arrêt anticipé : on abandonne les pages pas encore commencées
+            for _, futur in fenetre:
+                futur.cancel()
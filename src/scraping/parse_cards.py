@@ -0,0 +1,201 @@
+import re
+from html.parser import HTMLParser
+
+
+# ========================================
+# EXTRACTION DES CARTES D'OFFRES DEPUIS LE HTML
+# Reproduit les sélecteurs Selenium de scrape_hellowork.py :
+#   - titre      : [data-cy='offerTitle']
+#   - entreprise : [data-cy='offerTitle'] p.tw-typo-s
+#   - ville      : [data-cy='localisationCard']
+#   - contrat    : [data-cy='contractCard']
+#   - date       : div.tw-typo-s.tw-text-grey-500
+#   - lien       : href de [data-cy='offerTitle'] (identité de l'offre, voir src/etl/cles.py)
+# ========================================
+COLONNES = ["Titre", "Entreprise", "Ville", "Contrat", "Date", "Lien"]
+CHAMPS = ["titre", "entreprise", "ville", "contrat", "date"]
+
+# Balises qui provoquent un retour à la ligne dans le texte rendu (comme `.text` de Selenium)
+BALISES_BLOC = {
+    "address", "article", "aside", "br", "dd", "div", "dl", "dt", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol",
+    "p", "section", "table", "tr", "ul",
+}
+BALISES_IGNOREES = {"script", "style", "template", "noscript"}
+
+# Repère chaque carte sans analyser le reste de la page
+RE_CARTE = re.compile(r"""data-cy=["']serpCard["']""")
+
+
+def rendre_texte(morceaux: list) -> str:
+    """
+    Reconstruit le texte visible d'un élément : espaces fusionnés,
+    une ligne par bloc, lignes vides supprimées.
+    """
+    lignes = "".join(morceaux).split("\n")
+    return "\n".join(l for l in (" ".join(ligne.split()) for ligne in lignes) if l)
+
+
+class _Capture:
+    def __init__(self, champ: str, balise: str):
+        self.champ = champ
+        self.balise = balise
+        self.imbrication = 0
+        self.morceaux = []
+
+
+class _FinExtraction(Exception):
+    """Toutes les cartes attendues ont été lues : inutile d'analyser la suite."""
+
+
+class ExtracteurCartes(HTMLParser):
+    """Parcourt le HTML d'une page de résultats en une seule passe."""
+
+    def __init__(self, cartes_attendues: int = None):
+        super().__init__(convert_charrefs=True)
+        self.offres = []
+        self.cartes_attendues = cartes_attendues
+        self._cartes_lues = 0
+        self._carte = None       # champs trouvés dans la carte courante
+        self._profondeur_div = 0  # divs ouverts depuis le début de la carte
+        self._captures = []
+        self._ignore = 0
+
+    # ---------- ouverture ----------
+    def handle_starttag(self, tag, attrs):
+        if tag in BALISES_IGNOREES:
+            self._ignore += 1
+            return
+
+        a = dict(attrs)
+        data_cy = a.get("data-cy")
+
+        if self._carte is None:
+            if tag == "div" and data_cy == "serpCard":
+                self._carte = {}
+                self._profondeur_div = 0
+                self._captures = []
+            return
+
+        if tag == "div":
+            self._profondeur_div += 1
+
+        for c in self._captures:
+            if c.balise == tag:
+                c.imbrication += 1
+            if tag in BALISES_BLOC:
+                c.morceaux.append("\n")
+
+        classes = (a.get("class") or "").split()
+        if data_cy == "offerTitle":
+            self._ouvrir("titre", tag)
+            self._carte.setdefault("lien", a.get("href") or "")
+        elif data_cy == "localisationCard":
+            self._ouvrir("ville", tag)
+        elif data_cy == "contractCard":
+            self._ouvrir("contrat", tag)
+        elif tag == "p" and "tw-typo-s" in classes and self._dans("titre"):
+            self._ouvrir("entreprise", tag)
+        elif tag == "div" and "tw-typo-s" in classes and "tw-text-grey-500" in classes:
+            self._ouvrir("date", tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # Balise auto-fermante : seul un <br/> influence le texte
+        if self._carte is not None and tag == "br":
+            for c in self._captures:
+                c.morceaux.append("\n")
+
+    # ---------- texte ----------
+    def handle_data(self, data):
+        if self._carte is None or self._ignore:
+            return
+        for c in self._captures:
+            c.morceaux.append(data)
+
+    # ---------- fermeture ----------
+    def handle_endtag(self, tag):
+        if tag in BALISES_IGNOREES:
+            self._ignore = max(0, self._ignore - 1)
+            return
+        if self._carte is None:
+            return
+
+        for c in list(self._captures):
+            if c.balise != tag:
+                continue
+            if c.imbrication == 0:
+                self._carte[c.champ] = rendre_texte(c.morceaux)
+                self._captures.remove(c)
+            else:
+                c.imbrication -= 1
+
+        for c in self._captures:
+            if tag in BALISES_BLOC:
+                c.morceaux.append("\n")
+
+        if tag == "div":
+            if self._profondeur_div == 0:
+                self._fermer_carte()
+            else:
+                self._profondeur_div -= 1
+
+    # ---------- utilitaires ----------
+    def _ouvrir(self, champ, tag):
+        # Comme find_element : seule la première occurrence compte
+        if champ in self._carte or self._dans(champ):
+            return
+        self._captures.append(_Capture(champ, tag))
+
+    def _dans(self, champ):
+        return any(c.champ == champ for c in self._captures)
+
+    def _fermer_carte(self):
+        carte, self._carte = self._carte, None
+        self._captures = []
+        self._cartes_lues += 1
+        try:
+            self._ajouter_offre(carte)
+        finally:
+            if self._cartes_lues == self.cartes_attendues:
+                raise _FinExtraction
+
+    def _ajouter_offre(self, carte):
+        # 1) Titre : si pas trouvé, on ignore la carte
+        if "titre" not in carte:
+            return
+        offre = {champ: carte.get(champ, "") for champ in CHAMPS}
+        offre["lien"] = carte.get("lien", "")
+
+        # si tout est vide, on n’enregistre pas
+        if not any(offre[champ] for champ in CHAMPS):
+            return
+        self.offres.append(offre)
+
+
+def extraire_offres_html(html: str) -> list:
+    """
+    Extrait les offres d'une page de résultats Hellowork.
+    Chaque offre est un dict {titre, entreprise, ville, contrat, date, lien}.
+
+    Une regex compilée localise les cartes, puis chaque carte est analysée
+    seule, de sa balise ouvrante jusqu'à sa fermeture : l'en-tête, les
+    scripts, le pied de page et le HTML entre deux cartes sont sautés.
+    """
+    debuts = [html.rfind("<div", 0, m.start()) for m in RE_CARTE.finditer(html)]
+    fins = debuts[1:] + [len(html)]
+
+    offres = []
+    for debut, fin in zip(debuts, fins):
+        parseur = ExtracteurCartes(cartes_attendues=1)
+        try:
+            parseur.feed(html[debut:fin])
+            parseur.close()
+        except _FinExtraction:
+            pass
+        offres.extend(parseur.offres)
+    return offres
+
+
+def offre_vers_ligne(offre: dict) -> list:
+    """Ligne CSV [Titre, Entreprise, Ville, Contrat, Date, Lien]."""
+    return [offre[champ] for champ in CHAMPS] + [offre.get("lien", "")]
@@ -0,0 +1,132 @@
+import csv
+import json
+import os
+from datetime import datetime, timezone
+
+
+# ========================================
+# ÉCRITURE EN FLUX DU CSV BRUT + POINT DE REPRISE
+# Chaque page terminée est écrite, flushée puis notée dans le checkpoint :
+# un crash ne fait perdre que la page en cours. Le checkpoint, remplacé de
+# façon atomique, est le point de validation d'une page : il porte aussi les
+# clés de ses offres, reportées dans l'index des offres vues au run suivant
+# si le crash a eu lieu avant la sauvegarde de l'index.
+# Chaque ligne porte l'heure d'extraction (UTC) de sa page : les dates
+# relatives ("il y a 3 jours") s'y rapportent (voir src/etl/dates.py).
+# ========================================
+COLONNE_EXTRACTION = "Extraction"
+FORMAT_EXTRACTION = "%Y-%m-%d %H:%M:%S"
+
+
+class StockageBrut:
+    def __init__(self, csv_path: str, colonnes: list, checkpoint_path: str = None):
+        self.csv_path = csv_path
+        self.colonnes = list(colonnes) + [COLONNE_EXTRACTION]
+        self.checkpoint_path = checkpoint_path or csv_path + ".checkpoint.json"
+        self.lignes_ecrites = 0
+        self._f = None
+        self._writer = None
+
+    # ---------- point de reprise ----------
+    def lire_checkpoint(self, url: str):
+        """Checkpoint du dernier run interrompu sur la même recherche, sinon None."""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("url") != url or not os.path.exists(self.csv_path):
+            return None
+        return checkpoint
+
+    def _checkpoint_restant(self):
+        """Checkpoint laissé par un run interrompu, quelle que soit sa recherche."""
+        if not os.path.exists(self.checkpoint_path) or not os.path.exists(self.csv_path):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _ecrire_checkpoint(self, url: str, page: int, cles: list = ()) -> None:
+        checkpoint = {
+            "url": url,
+            "derniere_page": page,
+            "octets": self._f.tell(),
+            "lignes": self.lignes_ecrites,
+            "cles": list(cles),
+        }
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    # ---------- écriture ----------
+    def ouvrir(self, ajout: bool = False, checkpoint: dict = None) -> list:
+        """
+        - reprise (checkpoint) : le CSV est tronqué à la fin de la dernière
+          page validée, pour éliminer une page à moitié écrite ;
+        - ajout : les lignes sont ajoutées à la fin du CSV existant (tronqué
+          de même si un run interrompu a laissé son checkpoint) ;
+        - sinon : le CSV est réécrit depuis zéro.
+        Un CSV existant écrit par une version précédente du scraper reçoit
+        d'abord les colonnes qui lui manquent (vides).
+        Retourne les clés d'offres de la dernière page validée du run
+        interrompu (vide sinon), à compléter dans l'index des offres vues.
+        """
+        if checkpoint is None and ajout:
+            checkpoint = self._checkpoint_restant()
+            if checkpoint is not None:
+                checkpoint = dict(checkpoint, lignes=0)
+        cles = []
+        if checkpoint is not None:
+            with open(self.csv_path, "r+b") as f:
+                f.truncate(checkpoint["octets"])
+            self.lignes_ecrites = checkpoint["lignes"]
+            cles = checkpoint.get("cles", [])
+            ajout = True
+
+        ajout = ajout and os.path.exists(self.csv_path) and os.path.getsize(self.csv_path) > 0
+        if ajout:
+            self._migrer_entete()
+        self._f = open(self.csv_path, "a" if ajout else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f)
+        if not ajout:
+            self._writer.writerow(self.colonnes)
+        return cles
+
+    def _migrer_entete(self) -> None:
+        """Réécrit le CSV avec les colonnes courantes si son en-tête en diffère."""
+        with open(self.csv_path, newline="", encoding="utf-8") as f:
+            lecteur = csv.reader(f)
+            entete = next(lecteur, [])
+            if entete == self.colonnes:
+                return
+            inconnues = [c for c in entete if c not in self.colonnes]
+            if inconnues:
+                raise ValueError(f"Colonnes inconnues dans {self.csv_path} : {', '.join(inconnues)}")
+            positions = [entete.index(c) if c in entete else None for c in self.colonnes]
+            tmp = self.csv_path + ".tmp"
+            with open(tmp, "w", newline="", encoding="utf-8") as sortie:
+                writer = csv.writer(sortie)
+                writer.writerow(self.colonnes)
+                writer.writerows([ligne[p] if p is not None and p < len(ligne) else "" for p in positions]
+                                 for ligne in lecteur)
+        os.replace(tmp, self.csv_path)
+
+    def ecrire_page(self, url: str, page: int, lignes: list, cles: list = ()) -> None:
+        """
+        Écrit et valide une page, datée de son heure d'extraction ; `cles` :
+        clés de ses offres (index des offres vues).
+        """
+        extraction = datetime.now(timezone.utc).strftime(FORMAT_EXTRACTION)
+        self._writer.writerows(list(ligne) + [extraction] for ligne in lignes)
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self.lignes_ecrites += len(lignes)
+        self._ecrire_checkpoint(url, page, cles)
+
+    def fermer(self, termine: bool = True) -> None:
+        """Ferme le CSV ; un run terminé n'a plus besoin de checkpoint."""
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        if termine and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
@@ -1,100 +1,198 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-import csv
+import argparse
 import os
+import sys
+import time
 
 
 # Définir le chemin du CSV (seule modification)
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 RAW_DIR = os.path.join(BASE_DIR, "data", "raw")
 os.makedirs(RAW_DIR, exist_ok=True)
 CSV_PATH = os.path.join(RAW_DIR, "offres_hellowork.csv")
+INDEX_PATH = os.path.join(RAW_DIR, "offres_vues.txt")
 
-
-# Initialisation
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-wait = WebDriverWait(driver, 10)
+sys.path.insert(0, BASE_DIR)
+from src.etl.cles import cle_offre  # noqa: E402
+from src.scraping.driver_pool import PROFILS, octets_transferes, pool_partage  # noqa: E402
+from src.scraping.fetch_pages import LimiteurDebit, recuperer_pages, telecharger_page  # noqa: E402
+from src.scraping.parse_cards import COLONNES, extraire_offres_html, offre_vers_ligne  # noqa: E402
+from src.scraping.raw_store import StockageBrut  # noqa: E402
+from src.scraping.seen_index import IndexOffresVues  # noqa: E402
 
 base_url = "https://www.hellowork.com/fr-fr/emploi/recherche.html?k=&l=&d=all&page="
-
-all_offers = []
-page = 1
 max_pages = 10  # ajuste selon ton besoin
 
-while page <= max_pages:
-    url = base_url + str(page)
-    driver.get(url)
-    print(f"⏳ Chargement de la page {page}...")
 
-    cards = wait.until(
-        EC.presence_of_all_elements_located(
+# ========================================
+# MODE SELENIUM (navigateurs du pool partagé)
+# ========================================
+def extraire_offres_selenium(driver, wait):
+    """Attend les cartes puis les extrait du HTML en une seule lecture de page_source."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
+    wait.until(
+        EC.presence_of_element_located(
             (By.CSS_SELECTOR, "div[data-cy='serpCard']")
         )
     )
-    print("Nb cartes:", len(cards))
-
-    for i, card in enumerate(cards):
-        # 1) Titre : si pas trouvé, on ignore la carte
-        try:
-            titre = card.find_element(
-                By.CSS_SELECTOR, "[data-cy='offerTitle']"
-            ).text.strip()
-        except NoSuchElementException:
-            continue
-
-        # 2) Entreprise
-        try:
-            entreprise = card.find_element(
-                By.CSS_SELECTOR, "[data-cy='offerTitle'] p.tw-typo-s"
-            ).text.strip()
-        except NoSuchElementException:
-            entreprise = ""
-
-        # 3) Ville
-        try:
-            ville = card.find_element(
-                By.CSS_SELECTOR, "[data-cy='localisationCard']"
-            ).text.strip()
-        except NoSuchElementException:
-            ville = ""
-
-        # 4) Contrat
-        try:
-            contrat = card.find_element(
-                By.CSS_SELECTOR, "[data-cy='contractCard']"
-            ).text.strip()
-        except NoSuchElementException:
-            contrat = ""
-
-        # 5) Date
-        try:
-            date = card.find_element(
-                By.CSS_SELECTOR, "div.tw-typo-s.tw-text-grey-500"
-            ).text.strip()
-        except NoSuchElementException:
-            date = ""
-
-        # si tout est vide, on n’enregistre pas
-        if not any([titre, entreprise, ville, contrat, date]):
-            continue
-
-        print(f"OFFRE {i}:", titre, "|", entreprise, "|", ville, "|", contrat, "|", date)
-        all_offers.append([titre, entreprise, ville, contrat, date])
-
-    page += 1
-    time.sleep(2)
-
-# Sauvegarde CSV (même contenu, nouvel emplacement)
-with open(CSV_PATH, "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Titre", "Entreprise", "Ville", "Contrat", "Date"])
-    writer.writerows(all_offers)
-
-print(f"✅ Scraping terminé : {len(all_offers)} offres enregistrées dans '{CSV_PATH}'.")
-driver.quit()
+    # HTML entièrement analysé (sans attendre images, polices et scripts)
+    wait.until(lambda d: d.execute_script("return document.readyState") != "loading")
+    offres = extraire_offres_html(driver.page_source)
+    print("Nb cartes:", len(offres))
+    return offres
+
+
+def scraper_selenium(urls, limiteur, n_workers, profil="complet", mesures=False):
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    pool = pool_partage(taille=n_workers, profil=profil, mesures=mesures)
+
+    def telecharger(url):
+        with pool.navigateur() as driver:
+            limiteur.attendre(url)
+            debut = time.perf_counter()
+            driver.get(url)
+            offres = extraire_offres_selenium(driver, WebDriverWait(driver, 10))
+            if pool.profil == "leger":
+                # Les cartes sont là : inutile de laisser finir le chargement
+                driver.execute_script("window.stop();")
+            duree = time.perf_counter() - debut
+            octets = octets_transferes(driver) if pool.mesures else None
+            return offres, duree, octets
+
+    total_octets, total_duree = 0, 0.0
+    pages = recuperer_pages(urls, telecharger, pool.taille)
+    for page, (url, (offres, duree, octets)) in enumerate(pages, start=1):
+        print(f"⏳ Chargement de la page {page}...")
+        total_duree += duree
+        if octets is not None:
+            total_octets += octets
+            print(f"📦 Page {page} : {octets / 1024:.0f} Ko transférés en {duree:.2f} s")
+        yield page, offres
+    if pool.mesures:
+        print(f"📦 Profil '{pool.profil}' : {total_octets / 1024:.0f} Ko au total, "
+              f"{total_duree:.2f} s de chargement cumulé")
+    print(pool.rapport())
+
+
+# ========================================
+# MODE HTTP (pages téléchargées en parallèle)
+# ========================================
+def scraper_http(urls, limiteur, n_workers):
+    def telecharger(url):
+        return telecharger_page(url, limiteur)
+
+    for page, (url, html) in enumerate(recuperer_pages(urls, telecharger, n_workers), start=1):
+        print(f"⏳ Page {page} reçue")
+        offres = extraire_offres_html(html) if html else []
+        print("Nb cartes:", len(offres))
+        yield page, offres
+
+
+# ========================================
+# SCRAPING
+# ========================================
+def scraper(mode="selenium", pages=max_pages, url=base_url, workers=4,
+            requetes_par_seconde=0.5, csv_path=CSV_PATH,
+            incremental=False, index_path=INDEX_PATH, reprendre=False,
+            profil="complet", mesures=False):
+    """
+    Scrape `pages` pages de résultats et écrit le CSV brut au fil de l'eau :
+    chaque page terminée est ajoutée au CSV et notée dans un checkpoint.
+    Retourne le nombre d'offres écrites par ce run.
+
+    En mode incrémental, seules les offres absentes de l'index des offres vues
+    sont ajoutées à la fin du CSV existant, et le scraping s'arrête à la
+    première page ne contenant que des offres déjà connues.
+
+    Avec `reprendre`, un run interrompu repart de la page qui suit la
+    dernière page validée dans le checkpoint.
+
+    En mode selenium, `profil` choisit le profil navigateur ("leger" bloque
+    images, polices et scripts tiers) et `mesures` affiche octets et durée
+    de chaque page.
+    """
+    stockage = StockageBrut(csv_path, COLONNES)
+    checkpoint = stockage.lire_checkpoint(url) if reprendre else None
+    page_debut = checkpoint["derniere_page"] + 1 if checkpoint else 1
+    if checkpoint:
+        print(f"↩️ Reprise après la page {checkpoint['derniere_page']} "
+              f"({checkpoint['lignes']} offres déjà enregistrées)")
+
+    urls = [url + str(page) for page in range(page_debut, pages + 1)]
+    limiteur = LimiteurDebit(requetes_par_seconde)
+    index = IndexOffresVues(index_path) if incremental else None
+
+    if mode == "http":
+        resultats = scraper_http(urls, limiteur, workers)
+    else:
+        resultats = scraper_selenium(urls, limiteur, workers, profil, mesures)
+
+    n_offres = 0
+    cles_validees = stockage.ouvrir(ajout=incremental, checkpoint=checkpoint)
+    if index is not None:
+        # Dernière page validée d'un run interrompu avant la sauvegarde de l'index
+        index.completer(cles_validees)
+    # Point de départ validé : un crash dès la première page laisse un checkpoint
+    stockage.ecrire_page(url, page_debut - 1, [])
+    try:
+        for page, offres in resultats:
+            page += page_debut - 1
+            if index is not None:
+                nouvelles = index.nouvelles(offres)
+                if offres and not nouvelles:
+                    print(f"⏹️ Page {page} : offres déjà connues, arrêt du scraping.")
+                    break
+                offres = nouvelles
+
+            lignes = []
+            for i, offre in enumerate(offres):
+                ligne = offre_vers_ligne(offre)
+                print(f"OFFRE {i}:", " | ".join(ligne))
+                lignes.append(ligne)
+
+            # L'index n'est mis à jour qu'une fois les lignes écrites ; leurs
+            # clés sont aussi dans le checkpoint, repris si l'index n'a pas suivi
+            cles = [cle_offre(o) for o in offres] if index is not None else []
+            stockage.ecrire_page(url, page, lignes, cles)
+            if index is not None:
+                index.enregistrer()
+            n_offres += len(lignes)
+    except BaseException:
+        stockage.fermer(termine=False)
+        raise
+    stockage.fermer()
+
+    print(f"✅ Scraping terminé : {n_offres} offres enregistrées dans '{csv_path}'.")
+    return n_offres
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping des offres Hellowork")
+    parser.add_argument("--mode", choices=["selenium", "http"], default="selenium",
+                        help="selenium : pool de navigateurs headless ; http : téléchargement direct")
+    parser.add_argument("--pages", type=int, default=max_pages)
+    parser.add_argument("--url", default=base_url, help="URL de recherche (sans le numéro de page)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="pages chargées simultanément (navigateurs ou connexions)")
+    parser.add_argument("--rps", type=float, default=0.5, help="requêtes par seconde et par hôte")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--incremental", action="store_true",
+                        help="n'ajoute que les nouvelles offres et s'arrête sur une page déjà connue")
+    parser.add_argument("--index", default=INDEX_PATH, help="index des offres déjà vues")
+    parser.add_argument("--profil", choices=sorted(PROFILS), default="complet",
+                        help="profil navigateur du mode selenium")
+    parser.add_argument("--mesures", action="store_true",
+                        help="affiche les octets transférés et la durée de chaque page")
+    parser.add_argument("--reprendre", action="store_true",
+                        help="reprend un run interrompu à partir de son checkpoint")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    scraper(mode=args.mode, pages=args.pages, url=args.url, workers=args.workers,
+            requetes_par_seconde=args.rps, csv_path=args.csv,
+            incremental=args.incremental, index_path=args.index, reprendre=args.reprendre,
+            profil=args.profil, mesures=args.mesures)
@@ -0,0 +1,53 @@
+import os
+
+from src.etl.cles import cle_offre
+
+
+# ========================================
+# INDEX DES OFFRES DÉJÀ VUES
+# Un fichier texte, une clé par ligne, complété à chaque run
+# ========================================
+class IndexOffresVues:
+    def __init__(self, path: str):
+        self.path = path
+        self.cles = set()
+        self._a_enregistrer = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.cles = {ligne.strip() for ligne in f if ligne.strip()}
+
+    def __len__(self):
+        return len(self.cles)
+
+    def __contains__(self, offre: dict) -> bool:
+        return cle_offre(offre) in self.cles
+
+    def nouvelles(self, offres: list) -> list:
+        """
+        Offres absentes de l'index. Elles sont aussitôt marquées comme vues
+        (en mémoire) ; `enregistrer()` les écrit dans le fichier.
+        """
+        resultat = []
+        for offre in offres:
+            cle = cle_offre(offre)
+            if cle in self.cles:
+                continue
+            self.cles.add(cle)
+            self._a_enregistrer.append(cle)
+            resultat.append(offre)
+        return resultat
+
+    def completer(self, cles: list) -> None:
+        """Ajoute à l'index (et au fichier) les clés qui n'y sont pas encore."""
+        manquantes = [c for c in dict.fromkeys(cles) if c not in self.cles]
+        self.cles.update(manquantes)
+        self._a_enregistrer.extend(manquantes)
+        self.enregistrer()
+
+    def enregistrer(self) -> None:
+        """Ajoute les nouvelles clés à la fin du fichier d'index."""
+        if not self._a_enregistrer:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(c + "\n" for c in self._a_enregistrer)
+        self._a_enregistrer = []
@@ -0,0 +1,458 @@
+import base64
+import importlib
+import json
+import os
+import re
+import runpy
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from plotly.io.json import to_json_plotly
+
+from src.dashboard import cube
+from src.dashboard.cache_rendus import CacheRendus, cle_filtres
+from src.dashboard.index_filtres import IndexFiltres
+from src.dashboard.instantane import construire_donnees, ecrire_instantane, lire_instantane
+from src.dashboard.mode_client import CLES_DONNEES
+from src.dashboard.options_filtres import IndexPrefixes, normaliser
+from src.dashboard.table_offres import ALIAS, compter, construire_table
+from src.etl.dates import extraire_jours
+from src.etl.regles import SETTINGS_PATH, charger_regles
+
+
+def offres_synthetiques(n: int, seed: int = 0) -> pd.DataFrame:
+    """Offres au format attendu par le dashboard (colonnes de offres_ml)."""
+    rng = np.random.default_rng(seed)
+    dates = ["il y a 3 jours", "Il y a 5 heures", "il y a 12 jours", "Date inconnue", None,
+             "il y a 1 jour", "il y a 30 jours"]
+    return pd.DataFrame({
+        "Titre": [f"Offre {i}" for i in range(n)],
+        "Ville": rng.choice(["Paris", "Lyon", "Lille", "Nantes", "Brest", None], n),
+        "Contrat": rng.choice(["CDI", "CDD", "INTERIM", "STAGE"], n),
+        "Date": rng.choice(np.array(dates, dtype=object), n),
+        "Pays": rng.choice(["France", "Belgique", "Suisse"], n),
+        "cluster_category": rng.choice(["Informatique", "Commerce", "Autre", "BTP", None], n),
+        "salary_level": rng.choice(["Très_Faible", "Faible", "Moyen", "Élevé", "Très_Élevé"], n),
+        "confidence_score": rng.random(n).round(3),
+        "salary_score": rng.integers(0, 100, n),
+        "experience_level": rng.choice(["Junior", "Confirmé", "Senior"], n),
+    })
+
+
+def avec_scores_manquants(brut: pd.DataFrame) -> pd.DataFrame:
+    """Une offre sur 7 sans score de salaire, et aucun score pour les stages en Suisse."""
+    manquant = (np.arange(len(brut)) % 7 == 0) | ((brut["Pays"] == "Suisse") & (brut["Contrat"] == "STAGE"))
+    return brut.assign(salary_score=brut["salary_score"].where(~manquant))
+
+
+def valeurs_trace(valeurs):
+    """Valeurs d'une trace plotly sérialisée (les tableaux numpy sont encodés en base64)."""
+    if isinstance(valeurs, dict) and "bdata" in valeurs:
+        return np.frombuffer(base64.b64decode(valeurs["bdata"]), dtype=valeurs["dtype"]).tolist()
+    return list(valeurs)
+
+
+@pytest.fixture(scope="module")
+def app_dash(tmp_path_factory, monkeypatch_module):
+    dossier = tmp_path_factory.mktemp("dashboard")
+    avec_scores_manquants(offres_synthetiques(2000)).to_csv(dossier / "offres_ml.csv", index=False, encoding="utf-8")
+    monkeypatch_module.setenv("OFFRES_ML", str(dossier / "offres_ml"))
+    monkeypatch_module.setenv("OFFRES_FORMAT", "csv")
+    monkeypatch_module.setenv("DASHBOARD_CACHE", str(dossier / "cache"))
+    # Mode navigateur (désactivé par défaut) : ces offres passent sous le seuil
+    monkeypatch_module.setenv("DASHBOARD_CLIENT_MAX", "10000")
+    sys.modules.pop("src.dashboard.app_dash", None)
+    module = importlib.import_module("src.dashboard.app_dash")
+    yield module
+    sys.modules.pop("src.dashboard.app_dash", None)
+
+
+@pytest.fixture(scope="module")
+def monkeypatch_module():
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+def test_table_compacte_alias_partages():
+    brut = offres_synthetiques(500)
+    table = construire_table(brut)
+
+    for col in ["Ville", "Contrat", "cluster_category", "salary_level", "experience_level", "Pays"]:
+        assert isinstance(table[col].dtype, pd.CategoricalDtype)
+    assert "Titre" not in table.columns and "Date" not in table.columns
+
+    for alias, source in ALIAS.items():
+        if isinstance(table[source].dtype, pd.CategoricalDtype):
+            assert np.shares_memory(table[alias].array.codes, table[source].array.codes)
+        else:
+            assert np.shares_memory(table[alias].to_numpy(), table[source].to_numpy())
+
+    attendu = pd.to_numeric(brut["Date"].apply(extraire_jours), errors="coerce")
+    attendu = attendu.fillna(attendu.max())
+    assert table["jours_depuis"].tolist() == attendu.tolist()
+    assert table["pred_tres_demande"].tolist() == (brut["confidence_score"] > 0.6).astype(int).tolist()
+
+
+def test_table_compacte_sortie_du_pipeline():
+    # Offres réellement produites par classification.py (colonnes harmonisées, sans Pays)
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ml_base = os.path.join(racine, "data", "processed", "offres_ml")
+    brut = pd.read_csv(ml_base + ".csv", encoding="utf-8")
+    donnees = construire_donnees(ml_base, fmt="csv")
+    table = donnees["df"]
+
+    assert len(table) == len(brut)
+    for col in ["Ville_propre", "Contrat_propre", "Domaine_metier", "niveau_salaire"]:
+        assert table[col].astype(object).where(table[col].notna(), None).tolist() == \
+            brut[col].astype(object).where(brut[col].notna(), None).tolist()
+    assert table["pred_tres_demande"].tolist() == brut["pred_tres_demande"].tolist()
+    assert table["salary_score"].tolist() == brut["score_salaire"].tolist()
+    assert "Ville" not in table.columns and "Pays" not in table.columns
+    assert cube.total(donnees["cubes"]["filtres"].selection({})) == len(brut)
+
+    with pytest.raises(ValueError, match="Domaine_metier"):
+        construire_table(brut.drop(columns="Domaine_metier"))
+
+    # Le dashboard démarre sur ce fichier et rend tous ses graphiques
+    env = {**os.environ, "OFFRES_ML": ml_base, "OFFRES_FORMAT": "csv",
+           "DASHBOARD_CACHE": "", "DASHBOARD_INSTANTANE": ""}
+    script = ("from src.dashboard import app_dash; "
+              "sortie = app_dash.update_dashboard(None, None, None, None, None, [], 0); "
+              "print(list(sortie[2]['data'][0]['y'])); "
+              "print(sortie[0][0].children[1].children)")
+    sortie = subprocess.run([sys.executable, "-c", script], env=env, cwd=racine,
+                            capture_output=True, text=True, check=True).stdout
+    assert sortie.splitlines()[-1] == f"{len(brut):,}".replace(",", " ")
+    # Niveaux de salaire dans l'ordre des labels de config/settings.yaml
+    niveaux = [n for n in charger_regles().niveaux_labels if n in set(brut["niveau_salaire"].dropna())]
+    assert sortie.splitlines()[-2] == str(niveaux)
+
+
+def test_ordre_salaires_suit_les_regles(app_dash, tmp_path, monkeypatch):
+    assert app_dash.ordre_salaires(app_dash.donnees) == app_dash.ORDRE_SALAIRES_ANCIEN
+
+    settings = tmp_path / "settings.yaml"
+    settings.write_text(open(SETTINGS_PATH, encoding="utf-8").read(), encoding="utf-8")
+    monkeypatch.setattr(app_dash, "charger_regles", lambda: charger_regles(str(settings)))
+    etat = {"niveaux_salaire": frozenset(["Moyen", "Bas", "Élevé", "Bon", "Autre"])}
+    assert app_dash.ordre_salaires(etat) == ["Bas", "Moyen", "Bon", "Élevé", "Autre"]
+
+    # Règles modifiées sans redémarrage : le nouvel ordre est pris en compte
+    texte = settings.read_text(encoding="utf-8").replace("[Bas, Moyen, Bon, Élevé]", "[Élevé, Bon, Moyen, Bas]")
+    settings.write_text(texte + "\n", encoding="utf-8")
+    assert app_dash.ordre_salaires(etat) == ["Élevé", "Bon", "Moyen", "Bas", "Autre"]
+
+
+def test_update_dashboard_filtre(app_dash):
+    brut = offres_synthetiques(2000)
+    sortie = app_dash.update_dashboard(["Paris", "Lyon"], ["CDI"], None, ["France"], None, [], 0)
+    total = sortie[0][0].children[1].children
+
+    attendu = brut[brut["Ville"].isin(["Paris", "Lyon"]) & (brut["Contrat"] == "CDI")
+                   & (brut["Pays"] == "France")]
+    assert total == f"{len(attendu):,}".replace(",", " ")
+
+    barres = sortie[9]["data"][0]
+    villes = dict(zip(valeurs_trace(barres["x"]), valeurs_trace(barres["y"])))
+    assert villes == attendu["Ville"].value_counts().to_dict()
+
+
+def filtres_aleatoires(table, dimensions, rng):
+    filtres = {}
+    for dim in dimensions:
+        possibles = [0, 1] if dim == "pred_tres_demande" else list(table[dim].dropna().unique()) + ["Inconnue"]
+        if rng.random() < 0.5:
+            filtres[dim] = list(rng.choice(np.array(possibles, dtype=object),
+                                           rng.integers(1, len(possibles) + 1), replace=False))
+    return filtres
+
+
+def test_index_filtres_identique_aux_isin_chaines():
+    table = construire_table(offres_synthetiques(3000, seed=1))
+    index = IndexFiltres(table)
+    rng = np.random.default_rng(7)
+
+    assert index.lignes({}) is None
+    for _ in range(200):
+        filtres = filtres_aleatoires(table, index.entrees, rng)
+        attendu = table
+        for dim, choisies in filtres.items():
+            attendu = attendu[attendu[dim].isin(choisies)]
+        lignes = index.lignes(filtres)
+        obtenu = table.index if lignes is None else table.index[lignes]
+        assert obtenu.tolist() == attendu.index.tolist()
+
+
+def test_index_filtres_valeurs_rares_en_positions():
+    # Beaucoup de villes : les rares en positions triées, les fréquentes en bitmap
+    rng = np.random.default_rng(3)
+    offres = offres_synthetiques(5000, seed=3)
+    rares = [f"Ville {i}" for i in rng.integers(0, 800, 5000)]
+    offres["Ville"] = np.where(rng.random(5000) < 0.5, offres["Ville"], rares)
+    table = construire_table(offres)
+    index = IndexFiltres(table)
+    entrees = index.entrees["Ville_propre"]
+    assert entrees["Paris"].dtype == np.uint8 and entrees["Ville 1"].dtype == np.int32
+    assert index.nbytes() < 5000 * 4 * len(index.entrees)
+
+    for _ in range(200):
+        filtres = filtres_aleatoires(table, index.entrees, rng)
+        if rng.random() < 0.7:
+            filtres["Ville_propre"] = list(rng.choice(np.array(list(entrees), dtype=object), rng.integers(1, 20)))
+        attendu = np.ones(len(table), dtype=bool)
+        for dim, choisies in filtres.items():
+            attendu &= table[dim].isin(choisies).to_numpy()
+        lignes = index.lignes(filtres)
+        assert (np.arange(len(table)) if lignes is None else lignes).tolist() == np.flatnonzero(attendu).tolist()
+
+
+def test_cube_identique_au_parcours_des_lignes():
+    table = construire_table(avec_scores_manquants(offres_synthetiques(3000, seed=2)))
+    cubes = {nom: cube.CubeOffres(table, dims) for nom, dims in cube.CUBES_DASHBOARD.items()}
+    cube_complet = cube.CubeOffres(table, cube.CUBES_DASHBOARD["temps"] + ["experience_level"])
+    index = IndexFiltres(table)
+    rng = np.random.default_rng(11)
+
+    for _ in range(100):
+        filtres = filtres_aleatoires(table, index.entrees, rng)
+        lignes = index.lignes(filtres)
+        dff = table if lignes is None else table.take(lignes)
+        sel = cubes["filtres"].selection(filtres)
+
+        assert cube.total(sel) == len(dff)
+        if len(dff) == 0:
+            continue
+        assert cube.part(sel, "pred_tres_demande", 1) == (dff["pred_tres_demande"] == 1).mean()
+        for c in [cube_complet, *cubes.values()]:
+            sel_c = c.selection(filtres)
+            for dim in c.dimensions:
+                assert cube.nunique(sel_c, dim) == dff[dim].nunique()
+                for dropna in (True, False):
+                    obtenu, attendu = cube.compter(sel_c, dim, dropna), compter(dff[dim], dropna)
+                    assert obtenu.index.equals(attendu.index)
+                    assert obtenu.tolist() == attendu.tolist()
+        pd.testing.assert_series_equal(cube.taille_par(cubes["temps"].selection(filtres), "jours_depuis"),
+                                       dff.groupby("jours_depuis").size(), check_names=False)
+        pd.testing.assert_series_equal(cube.taille_par(sel, ["Pays", "niveau_salaire"]),
+                                       dff.groupby(["Pays", "niveau_salaire"], observed=True).size(),
+                                       check_names=False)
+        pd.testing.assert_series_equal(cube.moyenne_par(sel, "Pays"),
+                                       dff.groupby("Pays", observed=True)["salary_score"].mean(),
+                                       check_names=False, check_exact=True)
+
+
+def test_index_prefixes_identique_au_parcours():
+    rng = np.random.default_rng(3)
+    noms = ["Saint-Étienne", "Évry", "Paris", "Lyon 3e", "Villeneuve-Saint-Georges", "L'Isle-d'Abeau",
+            "Aix-en-Provence", "Évreux", "Sainte-Foy"] + [f"Ville {i}" for i in range(300)]
+    serie = pd.Series(rng.choice(np.array(noms, dtype=object), 5000), dtype="category")
+    index = IndexPrefixes(serie, limite=10)
+    comptes = serie.value_counts()
+
+    def suffixes(valeur):
+        cle = normaliser(valeur)
+        return [cle[m.start():] for m in re.finditer(r"\b\w|^", cle)]
+
+    def attendu(texte):
+        prefixe = normaliser(texte).strip()
+        trouvees = [v for v in comptes[comptes > 0].index if any(s.startswith(prefixe) for s in suffixes(v))]
+        return sorted(sorted(trouvees, key=lambda v: (-comptes[v], v))[:10])
+
+    for texte in ["", "s", "saint", "SAINT-E", "ev", "évr", "isle", "v", "ville 1", "ville 29", "zz", "3e"]:
+        assert index.chercher(texte) == attendu(texte), texte
+    assert len(index.chercher("ville", limite=100)) == 100
+
+
+def test_options_initiales_inchangees_sous_la_limite(app_dash):
+    # Peu de villes : toutes dans la page, triées, sans callback de recherche
+    assert app_dash.donnees["options_initiales"]["Ville_propre"] == [
+        {"label": v, "value": v} for v in sorted(app_dash.donnees["df"]["Ville_propre"].dropna().unique())]
+    assert not any(d.startswith("filter-ville.options") for d in app_dash.app.callback_map)
+
+
+def test_cle_filtres_canonique():
+    assert cle_filtres({"Ville_propre": ["Lyon", "Paris"], "Pays": None, "niveau_salaire": []}) == \
+        cle_filtres({"niveau_salaire": None, "Ville_propre": ["Paris", "Lyon", "Paris"]})
+    assert cle_filtres({"Ville_propre": ["Paris"]}) != cle_filtres({"Contrat_propre": ["Paris"]})
+
+
+def test_cache_rendus_lru_disque_et_invalidation(tmp_path):
+    appels = []
+
+    def calculer(valeur):
+        return lambda: appels.append(valeur) or {"rendu": valeur}
+
+    worker_1 = CacheRendus(taille=2, dossier=str(tmp_path))
+    worker_2 = CacheRendus(taille=2, dossier=str(tmp_path))
+    for cache in (worker_1, worker_2):
+        cache.lier("1a-10")
+
+    assert worker_1.obtenir("a", calculer("a")) == {"rendu": "a"}
+    assert worker_1.obtenir("a", calculer("a")) == {"rendu": "a"}
+    # Un autre worker relit le rendu sur disque au lieu de le recalculer
+    assert worker_2.obtenir("a", calculer("a")) == {"rendu": "a"}
+    assert appels == ["a"]
+    assert worker_1.stats()["hits"] == 1 and worker_1.stats()["misses"] == 1
+    assert worker_2.stats()["hits_disque"] == 1
+
+    worker_1.obtenir("b", calculer("b"))
+    worker_1.obtenir("c", calculer("c"))
+    assert worker_1.stats()["entrees_memoire"] == 2
+
+    # Nouvelles données : plus aucun ancien rendu servi
+    worker_2.lier("2b-10")
+    worker_2.obtenir("a", calculer("a2"))
+    assert appels == ["a", "b", "c", "a2"]
+    assert not (tmp_path / "1a-10").exists()
+
+
+def test_update_dashboard_memorise(app_dash):
+    avant = app_dash.cache_rendus.stats()
+    premier = app_dash.update_dashboard(["Lille"], None, ["BTP", "Commerce"], None, [], [], 0)
+    second = app_dash.update_dashboard(["Lille"], [], ["Commerce", "BTP"], None, None, [], 0)
+    apres = app_dash.cache_rendus.stats()
+    n = len(app_dash.GRAPHIQUES)
+    assert all(a is b for a, b in zip(premier, second))
+    assert apres["misses"] == avant["misses"] + n and apres["hits"] == avant["hits"] + n
+
+
+def test_update_dashboard_recharge_les_donnees(app_dash):
+    path = app_dash.donnees["path"]
+    with open(path, "rb") as f:
+        original = f.read()
+    try:
+        offres = offres_synthetiques(300, seed=5).assign(Ville="Quimper")
+        offres.to_csv(path, index=False, encoding="utf-8")
+        sortie = app_dash.update_dashboard(None, None, None, None, None, [], 0)
+        assert sortie[0][0].children[1].children == "300"
+        # Options des filtres de la page recalculées avec les données
+        assert "Quimper" in str(app_dash.creer_layout())
+
+        # Sans colonne Pays, les callbacks enregistrés ne conviennent plus : rechargement refusé
+        offres.drop(columns="Pays").head(200).to_csv(path, index=False, encoding="utf-8")
+        sortie = app_dash.update_dashboard(None, None, None, None, None, [], 0)
+        assert sortie[0][0].children[1].children == "300"
+    finally:
+        with open(path, "wb") as f:
+            f.write(original)
+    sortie = app_dash.update_dashboard(None, None, None, None, None, [], 0)
+    assert sortie[0][0].children[1].children == "2 000"
+
+
+def test_rechargement_refuse_au_dela_de_client_max(app_dash, monkeypatch):
+    # Le mode navigateur est choisi au démarrage : pas de rechargement qui dépasse le seuil
+    assert app_dash.MODE_CLIENT
+    monkeypatch.setattr(app_dash, "CLIENT_MAX", 1000)
+    path = app_dash.donnees["path"]
+    with open(path, "rb") as f:
+        original = f.read()
+    try:
+        offres_synthetiques(1500, seed=6).to_csv(path, index=False, encoding="utf-8")
+        assert app_dash.donnees_a_jour()["structure"]["mode_client"]
+        assert len(app_dash.donnees_a_jour()["df"]) == 2000
+    finally:
+        with open(path, "wb") as f:
+            f.write(original)
+    assert len(app_dash.donnees_a_jour()["df"]) == 2000
+
+
+def test_instantane_identique_a_la_construction(app_dash, tmp_path):
+    offres_synthetiques(3000, seed=4).to_csv(tmp_path / "offres_ml.csv", index=False, encoding="utf-8")
+    construit = construire_donnees(str(tmp_path / "offres_ml"), fmt="csv")
+    ecrire_instantane(construit, str(tmp_path / "offres_ml.instantane"), "empreinte")
+    assert lire_instantane(str(tmp_path / "offres_ml.instantane"), "autre") is None
+    assert lire_instantane(str(tmp_path / "absent.instantane")) is None
+    projete = lire_instantane(str(tmp_path / "offres_ml.instantane"), "empreinte")
+
+    table = projete["df"]
+    pd.testing.assert_frame_equal(table, construit["df"], check_exact=True)
+    # Vues en lecture seule sur le fichier projeté ; les alias restent partagés
+    assert not table["salary_score"].to_numpy().flags.writeable
+    assert np.shares_memory(table["Ville_propre"].array.codes, table["Ville"].array.codes)
+    for nom, c in construit["cubes"].items():
+        pd.testing.assert_frame_equal(projete["cubes"][nom].cellules, c.cellules, check_exact=True)
+
+    rng = np.random.default_rng(17)
+    for _ in range(50):
+        filtres = filtres_aleatoires(table, construit["index_filtres"].entrees, rng)
+        attendu, obtenu = construit["index_filtres"].lignes(filtres), projete["index_filtres"].lignes(filtres)
+        assert (attendu is None and obtenu is None) or np.array_equal(attendu, obtenu)
+        for nom, c in construit["cubes"].items():
+            assert projete["cubes"][nom].selection(filtres).equals(c.selection(filtres))
+    for dim, index in construit["options"].items():
+        for texte in ["", "p", "l", "inf", "très", "zz"]:
+            assert projete["options"][dim].chercher(texte) == index.chercher(texte)
+
+    # Le dashboard a écrit l'instantané de ses propres données
+    assert lire_instantane(app_dash.INSTANTANE, app_dash.donnees["empreinte"]) is not None
+
+
+def test_wsgi_serveur_prechargement(app_dash, monkeypatch):
+    from src.dashboard.wsgi import creer_serveur
+    assert creer_serveur() is app_dash.server
+
+    conf = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "gunicorn.conf.py")
+    monkeypatch.setenv("DASHBOARD_WORKERS", "3")
+    monkeypatch.setenv("DASHBOARD_THREADS", "4")
+    reglages = runpy.run_path(conf)
+    assert reglages["preload_app"] and reglages["wsgi_app"] == "src.dashboard.wsgi:creer_serveur()"
+    assert (reglages["workers"], reglages["threads"], reglages["worker_class"]) == (3, 4, "gthread")
+
+
+# Charge assets/filtres_client.js et rend chaque sélection avec les fonctions clientside
+SCRIPT_NODE = """
+const fs = require("fs");
+global.window = {dash_clientside: {no_update: "no_update"}};
+require(process.argv[1]);
+const entree = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+const offres = window.dash_clientside.offres;
+const sorties = entree.selections.map(function (selection) {
+    const rendus = {};
+    entree.composants.forEach(function (c) { rendus[c] = offres[c](selection, entree.donnees); });
+    return rendus;
+});
+process.stdout.write(JSON.stringify(sorties));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node absent")
+def test_mode_client_identique_au_serveur(app_dash, tmp_path):
+    assert app_dash.MODE_CLIENT
+    rng = np.random.default_rng(13)
+    selections = [{}] + [
+        {dim: list(valeurs) for dim, valeurs in cle_filtres(filtres_aleatoires(app_dash.donnees["df"], app_dash.donnees["index_filtres"].entrees, rng))}
+        for _ in range(40)
+    ] + [
+        # Stages : aucun score en Suisse (moyenne NaN, placée en dernier)
+        {dim: list(valeurs) for dim, valeurs in cle_filtres(filtres)}
+        for filtres in ({"Contrat_propre": ["STAGE"]}, {"Contrat_propre": ["STAGE"], "Pays": ["Suisse", "France"]})
+    ]
+    entree = {"donnees": app_dash.offres_navigateur(), "selections": selections, "composants": list(app_dash.GRAPHIQUES)}
+    (tmp_path / "entree.json").write_text(to_json_plotly(entree), encoding="utf-8")
+    asset = os.path.join(os.path.dirname(app_dash.__file__), "assets", "filtres_client.js")
+    sortie = subprocess.run(["node", "-e", SCRIPT_NODE, asset, str(tmp_path / "entree.json")],
+                            capture_output=True, text=True, check=True).stdout
+
+    for selection, rendus in zip(selections, json.loads(sortie)):
+        for composant, client in rendus.items():
+            serveur = json.loads(to_json_plotly(app_dash.rendre(composant, selection)))
+            if composant == "kpi-cards":
+                assert [c["props"]["children"][1]["props"]["children"] for c in client] == \
+                    [c["props"]["children"][1]["props"]["children"] for c in serveur]
+                continue
+            assert len(client["data"]) == len(serveur["data"]), composant
+            for trace_client, trace_serveur in zip(client["data"], serveur["data"]):
+                for cle in CLES_DONNEES:
+                    if cle in trace_serveur:
+                        attendu = trace_serveur[cle]
+                        if isinstance(attendu, (list, dict)):
+                            # Score manquant : NaN côté serveur, null côté navigateur
+                            attendu = [None if isinstance(v, float) and np.isnan(v) else v
+                                       for v in valeurs_trace(attendu)]
+                        obtenu = trace_client[cle]
+                        assert obtenu == attendu, (composant, cle, selection)
+            assert client["layout"] == serveur["layout"]
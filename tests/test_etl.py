@@ -0,0 +1,166 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.etl.dates import analyser_dates, extraire_jours
+from src.etl.domaines import classer_domaines, extraire_domaine
+from src.etl.prepare_data import RAW_PATH, nettoyer_offres, preparer
+from src.etl.regles import SETTINGS_PATH, charger_regles
+from src.etl.stockage import lire_offres
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTERIM_PATH = os.path.join(BASE_DIR, "data", "interim", "offres_hellowork_clean.csv")
+
+
+@pytest.fixture(scope="module")
+def df_clean():
+    return pd.read_csv(INTERIM_PATH, encoding="utf-8")
+
+
+def test_classer_domaines_identique_a_extraire_domaine(df_clean):
+    titres = df_clean["Titre"]
+    attendu = titres.apply(extraire_domaine)
+    assert classer_domaines(titres).tolist() == attendu.tolist()
+    assert attendu.tolist() == df_clean["Domaine_metier"].tolist()
+
+
+def test_classer_domaines_priorite_et_cas_limites():
+    titres = pd.Series(
+        ["Serveur logistique", "Magasinier cariste", "Responsable magasin",
+         "Chef de projet IT", "Plombier", None, ""],
+        index=[10, 10, 3, 4, 5, 6, 7],
+    )
+    resultat = classer_domaines(titres)
+    assert resultat.tolist() == [extraire_domaine(t) for t in titres]
+    assert resultat.tolist()[:5] == ["Restauration", "Logistique", "Commerce", "Informatique", "Autre"]
+    assert resultat.index.tolist() == titres.index.tolist()
+
+
+def estimer_salaire_reference(row):
+    # Heuristique d'origine de classification.py, ligne à ligne
+    score = 50
+    contrat = str(row["Contrat_propre"]).upper()
+    if "CDI" in contrat:
+        score += 20
+    elif "CDD" in contrat:
+        score += 10
+    score += {"Informatique": 25, "Santé": 15, "Industrie": 10, "Commerce": 5}.get(str(row["Domaine_metier"]), 0)
+    titre = str(row["Titre"]).lower()
+    if any(m in titre for m in ["manager", "directeur", "responsable", "chef", "lead"]):
+        score += 20
+    if any(m in titre for m in ["senior", "expert", "ingénieur", "developpeur", "développeur"]):
+        score += 15
+    if any(m in titre for m in ["junior", "assistant", "stagiaire"]):
+        score -= 10
+    return max(0, min(100, score))
+
+
+def test_scorer_salaires_identique_a_l_heuristique(df_clean):
+    regles = charger_regles()
+    df = pd.concat([df_clean, pd.DataFrame({
+        "Titre": ["Stagiaire assistant junior", None],
+        "Contrat_propre": ["CDD/CDI", None],
+        "Domaine_metier": ["Informatique", None],
+    })], ignore_index=True)
+    attendu = df.apply(estimer_salaire_reference, axis=1)
+    assert regles.scorer_salaires(df).tolist() == attendu.tolist()
+
+
+def test_charger_regles_recharge_a_chaud(tmp_path):
+    with open(SETTINGS_PATH, encoding="utf-8") as f:
+        contenu = f.read()
+    path = tmp_path / "settings.yaml"
+    path.write_text(contenu, encoding="utf-8")
+
+    regles = charger_regles(str(path))
+    assert charger_regles(str(path)) is regles
+    assert classer_domaines(pd.Series(["Plombier"]), regles).tolist() == ["Autre"]
+
+    path.write_text(contenu.replace("[cuisinier,", "[plombier, cuisinier,"), encoding="utf-8")
+    nouvelles = charger_regles(str(path))
+    assert nouvelles is not regles and nouvelles.empreinte != regles.empreinte
+    assert classer_domaines(pd.Series(["Plombier"]), nouvelles).tolist() == ["Restauration"]
+
+
+def test_preparer_par_blocs_identique(tmp_path):
+    complet = tmp_path / "complet.csv"
+    par_blocs = tmp_path / "blocs.csv"
+    stats_complet = preparer(RAW_PATH, str(tmp_path / "complet"), fmt="csv")
+    stats_blocs = preparer(RAW_PATH, str(tmp_path / "blocs"), chunksize=37, fmt="csv")
+
+    assert par_blocs.read_bytes() == complet.read_bytes()
+    assert stats_blocs.total == stats_complet.total
+    assert stats_blocs.villes == stats_complet.villes
+    assert stats_blocs.domaines == stats_complet.domaines
+
+
+def test_parquet_identique_au_csv(tmp_path, df_clean):
+    pytest.importorskip("pyarrow")
+    preparer(RAW_PATH, str(tmp_path / "complet"), fmt="parquet")
+    preparer(RAW_PATH, str(tmp_path / "blocs"), chunksize=37, fmt="parquet")
+
+    attendu = df_clean.assign(date_publication=pd.to_datetime(df_clean["date_publication"]))
+    for base in ("complet", "blocs"):
+        lu = lire_offres(str(tmp_path / base), fmt="parquet")
+        pd.testing.assert_frame_equal(lu, attendu, check_dtype=False)
+
+    colonnes = ["Titre", "Domaine_metier", "absente"]
+    projete = lire_offres(str(tmp_path / "complet"), colonnes=colonnes, categories=True, fmt="parquet")
+    assert list(projete.columns) == ["Titre", "Domaine_metier"]
+    assert isinstance(projete["Domaine_metier"].dtype, pd.CategoricalDtype)
+
+
+def test_analyser_dates_identique_a_extraire_jours(df_clean):
+    variantes = [f"{prefixe}{n} {unite}" for prefixe in ["il y a ", "Il y a ", "  IL Y A  "]
+                 for n in ["0", "1", "3", "18", "24", "1.5", "125"]
+                 for unite in ["heure", "heures", "jour", "jours", "jours ", "heures."]]
+    dates = pd.Series(variantes + df_clean["Date"].tolist()
+                      + ["Date inconnue", "", None, 4.0, "aujourd'hui", "il y a quelques jours"])
+    attendu = pd.to_numeric(dates.map(extraire_jours), errors="coerce")
+    obtenu = analyser_dates(dates)["jours_depuis"]
+    reconnues = attendu.notna()
+    assert reconnues.sum() == len(variantes) + len(df_clean)
+    assert obtenu[reconnues].tolist() == attendu[reconnues].tolist()
+    assert obtenu[dates.isin(["Date inconnue", "", None, 4.0, "il y a quelques jours"])].isna().all()
+
+
+def test_analyser_dates_unites_et_dates_absolues():
+    reference = pd.Timestamp("2025-12-17 16:52:00")
+    dates = pd.Series(["il y a 30 minutes", "il y a une heure", "il y a 2 semaines", "il y a 1 mois",
+                       "Publiée le 12/03/2025", "le 1er mars 2025", "2025-12-15", "hier", "Date inconnue"],
+                      index=range(10, 19))
+    resultat = analyser_dates(dates, reference)
+
+    assert resultat.index.tolist() == dates.index.tolist()
+    assert resultat["jours_depuis"].tolist()[:4] == [30 / 1440, 1 / 24, 14.0, 30.0]
+    assert resultat["date_publication"].tolist()[:8] == [
+        pd.Timestamp("2025-12-17 16:22:00"), pd.Timestamp("2025-12-17 15:52:00"),
+        pd.Timestamp("2025-12-03 16:52:00"), pd.Timestamp("2025-11-17 16:52:00"),
+        pd.Timestamp("2025-03-12"), pd.Timestamp("2025-03-01"), pd.Timestamp("2025-12-15"),
+        pd.Timestamp("2025-12-16 16:52:00"),
+    ]
+    assert resultat["jours_depuis"].iloc[6] == pytest.approx(2 + 16 / 24 + 52 / 1440)
+    assert pd.isna(resultat["jours_depuis"].iloc[8]) and pd.isna(resultat["date_publication"].iloc[8])
+
+
+def test_analyser_dates_reference_par_ligne():
+    dates = pd.Series(["il y a 2 jours", "il y a 2 jours", "hier", "il y a 2 jours"])
+    reference = pd.Series(pd.to_datetime(["2025-12-17 10:00", "2025-12-10 10:00", "2025-12-17 10:00", None]))
+    resultat = analyser_dates(dates, reference)
+
+    assert resultat["date_publication"].tolist()[:3] == [
+        pd.Timestamp("2025-12-15 10:00"), pd.Timestamp("2025-12-08 10:00"), pd.Timestamp("2025-12-16 10:00"),
+    ]
+    assert resultat["jours_depuis"].iloc[3] == 2.0 and pd.isna(resultat["date_publication"].iloc[3])
+
+
+def test_nettoyer_offres_date_extraction_par_ligne():
+    df = pd.DataFrame({
+        "Titre": ["Cuisinier H/F", "Serveur H/F"], "Entreprise": ["A", "B"], "Ville": ["Lyon - 69", "Paris - 75"],
+        "Contrat": ["CDI", "CDD"], "Date": ["il y a 3 jours", "il y a 3 jours"],
+        "Extraction": ["2025-12-17 16:52:00", None],
+    })
+    resultat = nettoyer_offres(df, verbeux=False, reference="2025-12-01 08:00")
+    assert resultat["date_publication"].tolist() == [pd.Timestamp("2025-12-14 16:52"), pd.Timestamp("2025-11-28 08:00")]
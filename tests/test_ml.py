@@ -0,0 +1,168 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.cluster import AgglomerativeClustering
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import (
+    adjusted_rand_score, calinski_harabasz_score, davies_bouldin_score, silhouette_score,
+)
+
+from src.ml.balayage import balayer, choisir, ecrire_rapport, k_du_rapport, nom_candidat
+from src.ml.clusters_incrementaux import ModeleClusters, cles_offres
+from src.ml.evaluation import evaluer
+from src.ml.features import elaguer_cache, features_tfidf, nettoyer_textes
+from src.ml.hierarchique import agglomeratif, agglomeratif_creux, ward_pondere
+
+
+def test_ward_pondere_identique_a_ward_sur_points_dupliques():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(80, 4))
+    poids = rng.integers(1, 4, len(points))
+    attendu = AgglomerativeClustering(n_clusters=5).fit_predict(np.repeat(points, poids, axis=0))
+    assert adjusted_rand_score(np.repeat(ward_pondere(points, poids, 5), poids), attendu) == 1.0
+    assert adjusted_rand_score(ward_pondere(points, np.ones(len(points)), 5),
+                               AgglomerativeClustering(n_clusters=5).fit_predict(points)) == 1.0
+
+
+def test_agglomeratif_creux_retrouve_les_groupes():
+    # 6 groupes bien séparés de 500 offres, chacun sur ses propres colonnes
+    rng = np.random.default_rng(1)
+    groupes = np.repeat(np.arange(6), 500)
+    X = rng.random((len(groupes), 60)) * 0.1
+    for g in range(6):
+        X[groupes == g, g * 10:(g + 1) * 10] += 1
+    X = csr_matrix(X)
+
+    labels = agglomeratif_creux(X, 6, micro_par_cluster=10)
+    assert adjusted_rand_score(groupes, labels) == 1.0
+    # Sous le seuil : ward exact sur la matrice densifiée
+    assert adjusted_rand_score(agglomeratif(X, 6, dense_max=len(groupes)), labels) == 1.0
+
+
+def offres_textes(n, domaines, rng, prefixe=""):
+    """Offres synthétiques : 5 mots du vocabulaire propre à leur domaine."""
+    tirees = rng.choice(domaines, n)
+    textes = [" ".join(f"{prefixe}{d[:4].lower()}{i}" for i in rng.integers(0, 30, 5)) for d in tirees]
+    return pd.DataFrame({"texte": textes, "Domaine_metier": tirees,
+                         "Titre": [f"offre {prefixe}{k}" for k in range(n)], "Entreprise": "E", "Ville": "V"})
+
+
+def test_clusters_incrementaux_numeros_stables_et_derive(tmp_path):
+    rng = np.random.default_rng(2)
+    domaines = ["Informatique", "Commerce", "Logistique", "BTP"]
+    anciennes = offres_textes(2000, domaines, rng)
+    modele = ModeleClusters(TfidfVectorizer(), 4)
+    labels = modele.ajuster(anciennes["texte"], anciennes["Domaine_metier"], cles_offres(anciennes))
+    modele.sauver(str(tmp_path / "modele.joblib"))
+    modele = ModeleClusters.charger(str(tmp_path / "modele.joblib"))
+    assert np.array_equal(modele.predire(anciennes["texte"], anciennes["Domaine_metier"])[0], labels)
+
+    # Nouvelles offres semblables : pas de dérive, affectation par predict
+    semblables = pd.concat([anciennes, offres_textes(300, domaines, rng)
+                            .assign(Titre=lambda d: d["Titre"] + " bis")], ignore_index=True)
+    derive = modele.derive(semblables["texte"], semblables["Domaine_metier"], cles_offres(semblables))
+    assert derive["nouvelles"] == 300 and not derive["refit"]
+
+    # Vocabulaire nouveau : dérive, réentraînement qui garde les numéros des clusters
+    nouvelles = pd.concat([anciennes, offres_textes(300, domaines, rng, prefixe="x")], ignore_index=True)
+    derive = modele.derive(nouvelles["texte"], nouvelles["Domaine_metier"], cles_offres(nouvelles))
+    assert derive["refit"] and derive["hors_vocabulaire"] > 0.15
+    refait = ModeleClusters(TfidfVectorizer(), 4).ajuster(nouvelles["texte"], nouvelles["Domaine_metier"],
+                                                          cles_offres(nouvelles), precedent=modele)
+    assert np.array_equal(refait[:len(anciennes)], labels)
+
+
+def test_evaluation_echantillonnee_et_centroides():
+    rng = np.random.default_rng(3)
+    labels = rng.integers(0, 5, 6000)
+    X = rng.random((len(labels), 40)) * 0.5
+    X[np.arange(len(labels)), labels * 8] += 1
+    mesures = evaluer(csr_matrix(X), labels, taille=1500)
+
+    exacte = silhouette_score(X, labels)
+    s = mesures["silhouette"]
+    assert s["echantillon"] < len(labels) and s["bas"] < s["haut"]
+    assert abs(s["score"] - exacte) < 0.01
+    assert np.isclose(mesures["calinski_harabasz"], calinski_harabasz_score(X, labels))
+    assert np.isclose(mesures["davies_bouldin"], davies_bouldin_score(X, labels))
+    assert set(mesures["durees"]) == {"silhouette", "centroides"}
+
+    # --silhouette-exacte, et DBSCAN sans cluster : pas de score
+    assert evaluer(X, labels, exacte=True)["silhouette"]["score"] == exacte
+    assert evaluer(X, np.full(len(labels), -1))["silhouette"] is None
+
+
+def test_balayage_parallele_choisit_et_rapporte(tmp_path):
+    # 4 groupes bien séparés ; DBSCAN à petit eps : une offre = un cluster (non éligible)
+    rng = np.random.default_rng(4)
+    groupes = np.repeat(np.arange(4), 150)
+    X = rng.random((len(groupes), 40)) * 0.1
+    X[np.arange(len(groupes)), groupes * 10] += 1
+    grille = {"KMeans": [{"n_clusters": k} for k in (3, 4, 5)], "Agglomerative": [{"n_clusters": 4}],
+              "DBSCAN": [{"eps": 0.01, "min_samples": 1}]}
+    resultats = balayer(csr_matrix(X), grille, n_workers=2)
+
+    assert [nom_candidat(r) for r in resultats][-1] == "DBSCAN eps=0.01, min_samples=1"
+    gagnant = choisir(resultats, "silhouette")
+    assert nom_candidat(resultats[gagnant]) == "KMeans n_clusters=4" and not resultats[-1]["eligible"]
+    assert adjusted_rand_score(groupes, resultats[gagnant]["labels"]) == 1.0
+    assert nom_candidat(resultats[choisir(resultats, "davies_bouldin")]).endswith("n_clusters=4")
+
+    ecrire_rapport(resultats, gagnant, str(tmp_path / "rapport.json"), critere="silhouette")
+    rapport = json.load(open(tmp_path / "rapport.json", encoding="utf-8"))
+    assert rapport["gagnant"] == "KMeans n_clusters=4" and len(rapport["candidats"]) == 5
+    assert all(c["ajustement_s"] > 0 and "labels" not in c for c in rapport["candidats"])
+    assert k_du_rapport(str(tmp_path / "rapport.json")) == 4
+    assert k_du_rapport(str(tmp_path / "absent.json")) is None
+
+
+def test_features_nettoyage_vectorise_et_cache(tmp_path):
+    # Nettoyage d'origine (clustering.py et classification.py), ligne à ligne
+    def nettoyer_texte(texte):
+        t = str(texte).lower()
+        for r in ["h/f", "h / f", "(h/f)", "(h / f)", " cdi ", " cdd ", " stage ", " alternance ",
+                  " france ", " hf ", " h f "]:
+            t = t.replace(r, " ")
+        return t
+
+    textes = pd.Series(["Développeur Python (H/F) CDI Paris", "Vendeur CDD stage H F Lyon", None,
+                        "Chauffeur cdd cdd alternance France", "Cariste H / F  hf  "] * 20)
+    propres = nettoyer_textes(textes)
+    assert propres.tolist() == textes.fillna("").apply(nettoyer_texte).tolist()
+
+    calculees = features_tfidf(propres, dossier=str(tmp_path))
+    relues = features_tfidf(nettoyer_textes(textes.copy()), dossier=str(tmp_path))
+    assert not calculees["depuis_cache"] and relues["depuis_cache"] and relues["cle"] == calculees["cle"]
+    assert (relues["matrice"] != calculees["matrice"]).nnz == 0
+    assert relues["vocabulaire"].tolist() == calculees["vocabulaire"].tolist()
+
+    # Texte ou paramètres modifiés : nouvelle clé, features recalculées
+    assert not features_tfidf(propres.iloc[::-1], dossier=str(tmp_path))["depuis_cache"]
+    assert not features_tfidf(propres, {"min_df": 1}, dossier=str(tmp_path))["depuis_cache"]
+
+    # Classification : vectoriseur ajusté sur les offres d'entraînement seulement
+    train = np.arange(0, len(propres), 2)
+    apprises = features_tfidf(propres, {"min_df": 2}, dossier=str(tmp_path), apprentissage=train)
+    attendu = TfidfVectorizer(min_df=2).fit(propres.iloc[train]).transform(propres)
+    assert (apprises["matrice"] != attendu).nnz == 0
+    assert features_tfidf(propres, {"min_df": 2}, dossier=str(tmp_path))["cle"] != apprises["cle"]
+
+
+def test_elaguer_cache_tolere_les_fichiers_deja_supprimes(tmp_path, monkeypatch):
+    for k in range(6):
+        (tmp_path / f"tfidf-{k}.npz").write_bytes(b"")
+    # Un autre processus supprime un fichier entre le listage et la suppression
+    supprimer = os.remove
+    monkeypatch.setattr(os, "remove", lambda p: (supprimer(p), supprimer(p)))
+    elaguer_cache(str(tmp_path), garder=2)
+    assert len(list(tmp_path.glob("tfidf-*.npz"))) == 2
+
+
+def test_import_clustering_ne_lance_pas_le_pipeline(capsys):
+    # Les workers du balayage réimportent le module en spawn
+    import src.ml.clustering as clustering
+    assert callable(clustering.main) and not hasattr(clustering, "df")
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,274 @@
+import csv
+import http.server
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.etl.cles import cle_offre
+from src.etl.prepare_data import nettoyer_offres
+from src.ml.clusters_incrementaux import cles_offres
+from src.scraping.driver_pool import PoolNavigateurs, pool_partage
+from src.scraping.fetch_pages import LimiteurDebit, recuperer_pages, telecharger_page
+from src.scraping.parse_cards import COLONNES, extraire_offres_html, offre_vers_ligne
+from src.scraping.raw_store import COLONNE_EXTRACTION, StockageBrut
+from src.scraping.scrape_hellowork import scraper
+from src.scraping.seen_index import IndexOffresVues
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_SOURCE = os.path.join(BASE_DIR, "page_source.txt")
+
+
+@pytest.fixture(scope="module")
+def page_html():
+    with open(PAGE_SOURCE, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def serveur(page_html):
+    """Serveur HTTP local qui renvoie page_source.txt pour toute URL."""
+    contenu = page_html.encode("utf-8")
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(contenu)))
+            self.end_headers()
+            self.wfile.write(contenu)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/recherche.html?page="
+    httpd.shutdown()
+
+
+def test_extraction_page_sauvegardee(page_html):
+    offres = extraire_offres_html(page_html)
+    assert len(offres) == 30
+    assert offres[0] == {
+        "titre": "Testeur Python H/F\nAirria",
+        "entreprise": "Airria",
+        "ville": "Grenoble - 38",
+        "contrat": "CDI",
+        "date": "il y a 6 jours",
+        "lien": "/fr-fr/emplois/73246041.html",
+    }
+
+
+def test_recuperer_pages_garde_l_ordre():
+    urls = [f"u{i}" for i in range(20)]
+    resultats = list(recuperer_pages(urls, lambda u: u.upper(), n_workers=4))
+    assert resultats == [(u, u.upper()) for u in urls]
+
+
+def test_scraper_http_csv(serveur, page_html, tmp_path):
+    csv_path = tmp_path / "offres.csv"
+    n_offres = scraper(mode="http", pages=3, url=serveur, workers=3,
+                       requetes_par_seconde=0, csv_path=str(csv_path))
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        lignes = list(csv.reader(f))
+    assert lignes[0] == ["Titre", "Entreprise", "Ville", "Contrat", "Date", "Lien", "Extraction"]
+    assert n_offres == 3 * 30
+    assert [l[:-1] for l in lignes[1:]] == [offre_vers_ligne(o) for o in extraire_offres_html(page_html)] * 3
+    assert lignes[1][:-1] == ["Testeur Python H/F\nAirria", "Airria", "Grenoble - 38", "CDI", "il y a 6 jours",
+                              "/fr-fr/emplois/73246041.html"]
+    assert abs(pd.Timestamp(lignes[1][-1]) - pd.Timestamp.now("UTC").tz_localize(None)) < pd.Timedelta(minutes=1)
+
+
+def test_limiteur_espace_les_requetes(serveur):
+    limiteur = LimiteurDebit(requetes_par_seconde=20)
+    debut = time.monotonic()
+    for _ in range(5):
+        assert telecharger_page(serveur + "1", limiteur) is not None
+    assert time.monotonic() - debut >= 4 / 20
+
+
+def test_extraction_cartes_incompletes():
+    html = """
+    <div data-cy="serpCard"><div data-cy="localisationCard">Lyon - 69</div></div>
+    <script>var x = '<div data-cy="offerTitle">faux</div>';</script>
+    <div data-cy="serpCard">
+      <a data-cy="offerTitle" href="/fr-fr/emplois/1.html"><h3>
+        <p class="tw-typo-l">Chef   de rang&nbsp;H/F</p><p class="tw-typo-s tw-inline">L&#39;Auberge</p>
+      </h3></a>
+      <div><div class="tw-typo-s tw-text-grey-500">il y a 2 jours</div></div>
+    </div>
+    """
+    assert extraire_offres_html(html) == [{
+        "titre": "Chef de rang H/F\nL'Auberge",
+        "entreprise": "L'Auberge",
+        "ville": "",
+        "contrat": "",
+        "date": "il y a 2 jours",
+        "lien": "/fr-fr/emplois/1.html",
+    }]
+
+
+def test_scraper_incremental(serveur, tmp_path):
+    csv_path = tmp_path / "offres.csv"
+    index_path = tmp_path / "vues.txt"
+    options = dict(mode="http", url=serveur, workers=2, requetes_par_seconde=0,
+                   csv_path=str(csv_path), incremental=True, index_path=str(index_path))
+
+    # Premier run : la page 1 est nouvelle, la page 2 (identique) arrête le scraping
+    assert scraper(pages=5, **options) == 30
+    assert len(IndexOffresVues(str(index_path))) == 30
+
+    # Second run : rien de nouveau, le CSV n'est pas modifié
+    assert scraper(pages=5, **options) == 0
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        assert len(list(csv.reader(f))) == 1 + 30
+
+
+def test_cle_offre():
+    assert cle_offre({"lien": "/fr-fr/emplois/73246041.html"}) == "id:73246041"
+    sans_lien = {"titre": "Cuisinier  H/F", "entreprise": "Vitalrest", "ville": "Lyon"}
+    assert cle_offre(sans_lien) == cle_offre({**sans_lien, "titre": "cuisinier h/f"})
+
+
+def test_cles_identiques_du_scraper_au_ml(serveur, page_html, tmp_path):
+    csv_path = str(tmp_path / "offres.csv")
+    index_path = str(tmp_path / "vues.txt")
+    scraper(mode="http", pages=1, url=serveur, workers=1, requetes_par_seconde=0,
+            csv_path=csv_path, incremental=True, index_path=index_path)
+
+    propres = nettoyer_offres(pd.read_csv(csv_path, encoding="utf-8"), verbeux=False)
+    cles = cles_offres(propres)
+    assert all(c.startswith("id:") for c in cles)
+    assert set(cles) == IndexOffresVues(index_path).cles
+
+
+def test_scraper_reprise_apres_crash(serveur, page_html, tmp_path):
+    csv_path = str(tmp_path / "offres.csv")
+    lignes_page = [offre_vers_ligne(o) for o in extraire_offres_html(page_html)]
+
+    # Run interrompu : page 1 validée, page 2 à moitié écrite
+    stockage = StockageBrut(csv_path, COLONNES)
+    stockage.ouvrir()
+    stockage.ecrire_page(serveur, 1, lignes_page)
+    stockage._f.write("Ligne,incompl")
+    stockage.fermer(termine=False)
+
+    n_offres = scraper(mode="http", pages=3, url=serveur, workers=2,
+                       requetes_par_seconde=0, csv_path=csv_path, reprendre=True)
+    assert n_offres == 2 * 30
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        lignes = list(csv.reader(f))
+    assert lignes[0] == COLONNES + [COLONNE_EXTRACTION]
+    assert [l[:-1] for l in lignes[1:]] == lignes_page * 3
+    assert not os.path.exists(stockage.checkpoint_path)
+
+
+def test_scraper_incremental_crash_avant_l_index(serveur, page_html, tmp_path):
+    csv_path = str(tmp_path / "offres.csv")
+    index_path = str(tmp_path / "vues.txt")
+    offres = extraire_offres_html(page_html)
+    lignes_page = [offre_vers_ligne(o) for o in offres]
+
+    # Run interrompu : page 1 validée mais index non sauvegardé, page 2 à moitié écrite
+    stockage = StockageBrut(csv_path, COLONNES)
+    stockage.ouvrir(ajout=True)
+    stockage.ecrire_page(serveur, 1, lignes_page, [cle_offre(o) for o in offres])
+    stockage._f.write("Ligne,incompl")
+    stockage.fermer(termine=False)
+
+    n_offres = scraper(mode="http", pages=3, url=serveur, workers=2, requetes_par_seconde=0,
+                       csv_path=csv_path, incremental=True, index_path=index_path)
+    assert n_offres == 0
+    assert len(IndexOffresVues(index_path)) == 30
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        lignes = list(csv.reader(f))
+    assert lignes[0] == COLONNES + [COLONNE_EXTRACTION]
+    assert [l[:-1] for l in lignes[1:]] == lignes_page
+    assert not os.path.exists(stockage.checkpoint_path)
+
+
+def test_stockage_ajout_migre_un_ancien_csv(tmp_path):
+    csv_path = tmp_path / "offres.csv"
+    csv_path.write_text("Titre,Entreprise,Ville,Contrat,Date\nA,B,Lyon,CDI,il y a 2 jours\n", encoding="utf-8")
+
+    stockage = StockageBrut(str(csv_path), COLONNES)
+    stockage.ouvrir(ajout=True)
+    stockage.ecrire_page("u", 1, [["C", "D", "Paris", "CDD", "hier", "/fr-fr/emplois/2.html"]])
+    stockage.fermer()
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        lignes = list(csv.reader(f))
+    assert lignes[0] == COLONNES + [COLONNE_EXTRACTION]
+    assert lignes[1] == ["A", "B", "Lyon", "CDI", "il y a 2 jours", "", ""]
+    assert lignes[2][:-1] == ["C", "D", "Paris", "CDD", "hier", "/fr-fr/emplois/2.html"] and lignes[2][-1]
+
+    csv_path.write_text("Titre,Inconnue\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Inconnue"):
+        StockageBrut(str(csv_path), COLONNES).ouvrir(ajout=True)
+
+
+class FauxDriver:
+    def __init__(self):
+        self.quitte = False
+
+    def quit(self):
+        self.quitte = True
+
+
+def test_pool_navigateurs_demarrage_paresseux_et_recyclage():
+    crees = []
+
+    def fabrique():
+        crees.append(FauxDriver())
+        return crees[-1]
+
+    pool = PoolNavigateurs(taille=2, pages_par_navigateur=3, fabrique=fabrique)
+    assert crees == []
+
+    for _ in range(3):
+        with pool.navigateur() as driver:
+            assert driver is crees[0]
+    assert crees[0].quitte and pool.recyclages == 1
+
+    with pool.navigateur():
+        pass
+    assert len(crees) == 2 and pool.demarrages == 2
+    assert len(pool.latences) == 4
+
+    pool.fermer()
+    assert crees[1].quitte
+
+
+def test_pool_navigateurs_borne_la_concurrence():
+    actifs, max_actifs = [0], [0]
+    verrou = threading.Lock()
+    pool = PoolNavigateurs(taille=2, fabrique=FauxDriver)
+
+    def job(_):
+        with pool.navigateur():
+            with verrou:
+                actifs[0] += 1
+                max_actifs[0] = max(max_actifs[0], actifs[0])
+            time.sleep(0.01)
+            with verrou:
+                actifs[0] -= 1
+
+    list(recuperer_pages(range(12), job, n_workers=6))
+    assert max_actifs[0] == 2 and pool.demarrages == 2
+
+
+def test_pool_partage_reconstruit_si_les_parametres_changent():
+    pool = pool_partage(taille=2, fabrique=FauxDriver)
+    assert pool_partage(taille=2, fabrique=FauxDriver) is pool
+
+    with pool.navigateur() as driver:
+        autre = pool_partage(taille=3, fabrique=FauxDriver)
+    assert autre is not pool and autre.taille == 3
+    assert driver.quitte
+    autre.fermer()